@@ -0,0 +1,302 @@
+"""Cache jawaban AI dengan backend yang bisa diganti (LRU di memori atau SQLite).
+
+Kunci cache dibentuk dari prompt yang dinormalisasi, konteks, dan nama model.
+`AICache.get_or_compute` (dan `stream_or_compute` untuk jawaban streaming)
+juga menggabungkan permintaan identik yang datang bersamaan, sehingga hanya
+satu panggilan ke OpenAI yang benar-benar dikirim.
+"""
+import hashlib
+import os
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_prompt(text):
+    """Samakan variasi penulisan yang tidak mengubah arti pertanyaan"""
+    return _WHITESPACE.sub(" ", text.strip().lower()).rstrip(" ?!.")
+
+
+def cache_key(prompt, context, model):
+    raw = "\x1f".join((model, context, normalize_prompt(prompt)))
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class MemoryCache:
+    """Cache LRU di memori proses dengan TTL per entri"""
+
+    def __init__(self, max_entries=1000, ttl=3600):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            value, expires_at = entry
+            if expires_at <= time.time():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            self._entries[key] = (value, time.time() + self.ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class SQLiteCache:
+    """Cache di file SQLite, bertahan saat proses Streamlit di-restart"""
+
+    def __init__(self, path="ai_cache.sqlite3", max_entries=10000, ttl=86400):
+        self.path = path
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS ai_cache (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL,
+                expires_at REAL NOT NULL,
+                last_used REAL NOT NULL
+            )
+            """
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_ai_cache_last_used ON ai_cache (last_used)"
+        )
+        self._conn.commit()
+
+    def get(self, key):
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, expires_at FROM ai_cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            if row[1] <= now:
+                self._conn.execute("DELETE FROM ai_cache WHERE key = ?", (key,))
+                self._conn.commit()
+                return None
+            self._conn.execute(
+                "UPDATE ai_cache SET last_used = ? WHERE key = ?", (now, key)
+            )
+            self._conn.commit()
+            return row[0]
+
+    def set(self, key, value):
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO ai_cache (key, value, expires_at, last_used)"
+                " VALUES (?, ?, ?, ?)",
+                (key, value, now + self.ttl, now),
+            )
+            self._conn.execute("DELETE FROM ai_cache WHERE expires_at <= ?", (now,))
+            self._conn.execute(
+                "DELETE FROM ai_cache WHERE key IN ("
+                " SELECT key FROM ai_cache ORDER BY last_used DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,),
+            )
+            self._conn.commit()
+
+    def delete(self, key):
+        with self._lock:
+            self._conn.execute("DELETE FROM ai_cache WHERE key = ?", (key,))
+            self._conn.commit()
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM ai_cache")
+            self._conn.commit()
+
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM ai_cache").fetchone()[0]
+
+
+class _InflightCall:
+    def __init__(self):
+        self.done = threading.Event()
+        self.value = None
+        self.error = None
+
+
+class AICache:
+    """Lapisan cache + penggabungan request di atas salah satu backend"""
+
+    def __init__(self, backend):
+        self.backend = backend
+        self._lock = threading.Lock()
+        self._inflight = {}
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+
+    def get(self, key):
+        """Ambil nilai cache sambil mencatat hit/miss (tanpa penggabungan)"""
+        value = self.backend.get(key)
+        self._count("hits" if value is not None else "misses")
+        return value
+
+    def set(self, key, value):
+        self.backend.set(key, value)
+
+    def invalidate(self, key):
+        """Buang satu entri, mis. setelah data sumbernya berubah"""
+        self.backend.delete(key)
+
+    def clear(self):
+        """Buang semua entri, mis. setelah seluruh data sumber dihapus"""
+        self.backend.clear()
+
+    def get_or_compute(self, key, compute):
+        """Kembalikan nilai cache untuk `key`, atau panggil `compute()` sekali.
+
+        Pemanggil lain dengan `key` yang sama selama `compute()` berjalan
+        menunggu hasil yang sama. Error tidak di-cache dan diteruskan ke semua
+        pemanggil yang menunggu.
+        """
+        value = self.backend.get(key)
+        if value is not None:
+            self._count("hits")
+            return value
+
+        call, leader = self._join(key)
+        if not leader:
+            return self._wait(call)
+
+        try:
+            # Pemimpin sebelumnya bisa saja baru selesai menyimpan hasilnya
+            value = self.backend.get(key)
+            if value is not None:
+                self._count("hits")
+            else:
+                self._count("misses")
+                value = compute()
+                self.backend.set(key, value)
+            call.value = value
+            return value
+        except Exception as e:
+            call.error = e
+            raise
+        finally:
+            self._leave(key, call)
+
+    def stream_or_compute(self, key, stream):
+        """Versi streaming `get_or_compute`: generator potongan teks.
+
+        Pemimpin meneruskan potongan dari `stream()` sambil mengumpulkannya,
+        lalu menyimpan teks lengkap ke cache. Pemanggil lain dengan `key` yang
+        sama menunggu, lalu menerima teks lengkap sebagai satu potongan.
+        """
+        value = self.backend.get(key)
+        if value is not None:
+            self._count("hits")
+            yield value
+            return
+
+        call, leader = self._join(key)
+        if not leader:
+            yield self._wait(call)
+            return
+
+        try:
+            value = self.backend.get(key)
+            if value is not None:
+                self._count("hits")
+                yield value
+            else:
+                self._count("misses")
+                parts = []
+                for text in stream():
+                    parts.append(text)
+                    yield text
+                value = "".join(parts)
+                self.backend.set(key, value)
+            call.value = value
+        except Exception as e:
+            call.error = e
+            raise
+        except BaseException:
+            # Pembaca berhenti di tengah stream: yang menunggu tidak dapat jawaban utuh
+            call.error = RuntimeError("Streaming jawaban dihentikan")
+            raise
+        finally:
+            self._leave(key, call)
+
+    def _join(self, key):
+        """Daftarkan pemanggil untuk `key`; (call, True) kalau dia pemimpinnya"""
+        with self._lock:
+            call = self._inflight.get(key)
+            if call is not None:
+                return call, False
+            call = self._inflight[key] = _InflightCall()
+            return call, True
+
+    def _wait(self, call):
+        self._count("coalesced")
+        call.done.wait()
+        if call.error is not None:
+            raise call.error
+        return call.value
+
+    def _leave(self, key, call):
+        with self._lock:
+            self._inflight.pop(key, None)
+        call.done.set()
+
+    def _count(self, name):
+        with self._lock:
+            setattr(self, name, getattr(self, name) + 1)
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses + self.coalesced
+            return {
+                "backend": type(self.backend).__name__,
+                "entries": len(self.backend),
+                "hits": self.hits,
+                "misses": self.misses,
+                "coalesced": self.coalesced,
+                "hit_rate": round((self.hits + self.coalesced) / lookups, 3)
+                if lookups
+                else 0.0,
+            }
+
+
+def create_ai_cache(backend=None, ttl=None, path=None):
+    """Buat cache dari argumen atau env `AI_CACHE_BACKEND`/`AI_CACHE_TTL`/`AI_CACHE_PATH`"""
+    backend = backend or os.getenv("AI_CACHE_BACKEND", "memory")
+    ttl = ttl if ttl is not None else int(os.getenv("AI_CACHE_TTL", 3600))
+    if backend == "sqlite":
+        path = path or os.getenv("AI_CACHE_PATH", "ai_cache.sqlite3")
+        return AICache(SQLiteCache(path, ttl=ttl))
+    if backend == "memory":
+        return AICache(MemoryCache(ttl=ttl))
+    raise ValueError(f"AI_CACHE_BACKEND tidak dikenal: {backend}")
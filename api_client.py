@@ -0,0 +1,169 @@
+"""Klien HTTP bersama untuk frontend Streamlit ke backend FastAPI.
+
+Satu `requests.Session` dengan pool koneksi keep-alive dipakai ulang oleh
+semua sesi, jadi setiap rerun tidak membuka koneksi TCP baru. Circuit breaker
+melewati backend yang sedang gagal selama masa cooldown: panggilan langsung
+gagal dengan `BackendUnavailable` (turunan `ConnectionError`) sehingga jalur
+fallback yang sudah ada langsung dipakai tanpa menunggu timeout.
+"""
+import os
+import threading
+import time
+from collections import defaultdict
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from metrics import REGISTRY
+
+API_BASE_URL = os.getenv("API_BASE_URL", "http://127.0.0.1:8000").rstrip("/")
+CONNECT_TIMEOUT = float(os.getenv("API_CONNECT_TIMEOUT", 2))
+READ_TIMEOUT = float(os.getenv("API_READ_TIMEOUT", 5))
+POOL_SIZE = int(os.getenv("API_POOL_SIZE", 20))
+FAILURE_THRESHOLD = int(os.getenv("API_BREAKER_FAILURES", 3))
+COOLDOWN = float(os.getenv("API_BREAKER_COOLDOWN", 30))
+
+# Status yang berarti backend (atau proxy di depannya) sedang tidak sehat
+UNHEALTHY_STATUS = {502, 503, 504}
+
+BACKEND_SECONDS = REGISTRY.histogram(
+    "backend_request_seconds", "Latensi panggilan frontend ke backend", ("path", "outcome")
+)
+FALLBACKS = REGISTRY.counter(
+    "backend_fallbacks_total", "Panggilan yang memakai jalur cadangan", ("name",)
+)
+
+
+class BackendUnavailable(requests.exceptions.ConnectionError):
+    """Circuit breaker terbuka; backend dilewati sampai cooldown selesai"""
+
+
+class CircuitBreaker:
+    def __init__(self, failure_threshold=FAILURE_THRESHOLD, cooldown=COOLDOWN):
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self._lock = threading.Lock()
+        self._failures = 0
+        self._opened_at = None
+        self._trial_in_flight = False
+        self.opened = 0
+
+    @property
+    def state(self):
+        if self._opened_at is None:
+            return "closed"
+        if time.monotonic() - self._opened_at >= self.cooldown:
+            return "half-open"
+        return "open"
+
+    def allow(self):
+        """Boleh memanggil backend? Saat half-open hanya satu percobaan"""
+        with self._lock:
+            state = self.state
+            if state == "closed":
+                return True
+            if state == "half-open" and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return True
+            return False
+
+    def success(self):
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._trial_in_flight = False
+
+    def failure(self):
+        with self._lock:
+            self._failures += 1
+            if self._trial_in_flight or self._failures >= self.failure_threshold:
+                if self._opened_at is None or self._trial_in_flight:
+                    self.opened += 1
+                self._opened_at = time.monotonic()
+            self._trial_in_flight = False
+
+
+class BackendClient:
+    def __init__(self, base_url=API_BASE_URL, timeout=(CONNECT_TIMEOUT, READ_TIMEOUT),
+                 pool_size=POOL_SIZE, breaker=None):
+        self.base_url = base_url
+        self.timeout = timeout
+        self.breaker = breaker or CircuitBreaker()
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self._lock = threading.Lock()
+        self._latency = defaultdict(lambda: {"count": 0, "errors": 0, "total_ms": 0.0, "max_ms": 0.0})
+        self._fallbacks = defaultdict(int)
+        self.short_circuited = 0
+
+    def url(self, path):
+        return f"{self.base_url}/{path.lstrip('/')}"
+
+    def request(self, method, path, timeout=None, **kwargs):
+        """Panggil backend; `BackendUnavailable` kalau circuit breaker terbuka"""
+        if not self.breaker.allow():
+            with self._lock:
+                self.short_circuited += 1
+            raise BackendUnavailable(f"Backend dilewati (circuit {self.breaker.state})")
+
+        start = time.perf_counter()
+        try:
+            response = self.session.request(
+                method, self.url(path), timeout=timeout or self.timeout, **kwargs
+            )
+        except requests.exceptions.RequestException:
+            self._record(path, start, error=True)
+            self.breaker.failure()
+            raise
+        unhealthy = response.status_code in UNHEALTHY_STATUS
+        self._record(path, start, error=unhealthy)
+        if unhealthy:
+            self.breaker.failure()
+        else:
+            self.breaker.success()
+        return response
+
+    def get(self, path, **kwargs):
+        return self.request("GET", path, **kwargs)
+
+    def post(self, path, **kwargs):
+        return self.request("POST", path, **kwargs)
+
+    def record_fallback(self, name):
+        """Catat saat frontend terpaksa memakai jalur cadangan (DB/OpenAI langsung)"""
+        with self._lock:
+            self._fallbacks[name] += 1
+        FALLBACKS.inc(name=name)
+
+    def _record(self, path, start, error):
+        elapsed = (time.perf_counter() - start) * 1000
+        key = path.split("?", 1)[0]
+        BACKEND_SECONDS.observe(elapsed / 1000, path=key, outcome="error" if error else "ok")
+        with self._lock:
+            stats = self._latency[key]
+            stats["count"] += 1
+            stats["errors"] += int(error)
+            stats["total_ms"] += elapsed
+            stats["max_ms"] = max(stats["max_ms"], elapsed)
+
+    def stats(self):
+        with self._lock:
+            endpoints = {
+                path: {
+                    "count": s["count"],
+                    "errors": s["errors"],
+                    "avg_ms": round(s["total_ms"] / s["count"], 1) if s["count"] else 0.0,
+                    "max_ms": round(s["max_ms"], 1),
+                }
+                for path, s in self._latency.items()
+            }
+            return {
+                "base_url": self.base_url,
+                "circuit": self.breaker.state,
+                "circuit_opened": self.breaker.opened,
+                "short_circuited": self.short_circuited,
+                "fallbacks": dict(self._fallbacks),
+                "endpoints": endpoints,
+            }
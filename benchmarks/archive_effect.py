@@ -0,0 +1,132 @@
+"""Ukur efek arsip pada query list dan statistik dengan data seeded.
+
+Skrip mengisi tabel lewat `/customers/bulk` dengan booking yang tanggal
+kirimnya tersebar `--history-days` hari ke belakang, mengukur latensi query
+dashboard, menjalankan satu putaran arsip (`POST /customers/archive/run`),
+lalu mengukur lagi (data aktif saja dan dengan `include_archived=true`):
+
+    python benchmarks/archive_effect.py --seed-rows 200000 --history-days 730 --output archive.json
+
+Jalankan backend dengan `ARCHIVE_AFTER_DAYS` > 0 pada database kosong
+(lihat `benchmarks/docker-compose.yml`).
+"""
+import argparse
+import json
+import random
+import time
+from datetime import datetime, timedelta
+
+import requests
+
+from load_test import SEED_BATCH, git_commit, percentile
+
+
+def make_customer(rnd, i, history_days):
+    # Sebagian kecil booking ada di 30 hari ke depan, sisanya riwayat
+    offset = rnd.randrange(-history_days * 24, 30 * 24)
+    delivery = datetime.now().replace(minute=0, second=0, microsecond=0) + timedelta(hours=offset)
+    return {
+        "name": f"Archive Customer {i}",
+        "phone": f"0813{rnd.randrange(10**8):08d}",
+        "address": f"Jl. Arsip No. {i}, Surabaya",
+        "delivery_date": delivery.strftime("%Y-%m-%d %H:%M"),
+    }
+
+
+def seed(session, base_url, rows, history_days, seed_value):
+    rnd = random.Random(seed_value)
+    phones = []
+    for offset in range(0, rows, SEED_BATCH):
+        batch = [
+            make_customer(rnd, i, history_days)
+            for i in range(offset, min(offset + SEED_BATCH, rows))
+        ]
+        phones.extend(c["phone"] for c in batch)
+        response = session.post(f"{base_url}/customers/bulk", json=batch, timeout=300)
+        response.raise_for_status()
+    return phones
+
+
+def queries(phones, rnd):
+    recent = (datetime.now() - timedelta(days=7)).strftime("%Y-%m-%dT%H:%M:%S")
+    return {
+        "customers_page": lambda: ("/customers/", {"limit": 100}),
+        "customers_recent": lambda: ("/customers/", {"limit": 100, "delivery_from": recent}),
+        "stats_summary": lambda: ("/stats", {}),
+        "stats_live": lambda: ("/stats", {"source": "live"}),
+        "by_phone": lambda: (f"/customers/by_phone/{rnd.choice(phones)}", {}),
+    }
+
+
+def measure(session, base_url, phones, repeat, seed_value, include_archived=False):
+    rnd = random.Random(seed_value)
+    report = {}
+    for name, build in queries(phones, rnd).items():
+        latencies = []
+        for _ in range(repeat):
+            path, params = build()
+            if include_archived and not path.startswith("/customers/by_phone"):
+                params = {**params, "include_archived": "true"}
+            start = time.perf_counter()
+            response = session.get(f"{base_url}{path}", params=params, timeout=120)
+            latencies.append((time.perf_counter() - start) * 1000)
+            if response.status_code >= 500:
+                raise RuntimeError(f"{path}: {response.status_code} {response.text}")
+        latencies.sort()
+        report[name] = {
+            "p50_ms": round(percentile(latencies, 50), 2),
+            "p95_ms": round(percentile(latencies, 95), 2),
+        }
+    return report
+
+
+def change(before, after):
+    return {
+        name: round((after[name]["p50_ms"] / before[name]["p50_ms"] - 1) * 100, 1)
+        for name in before
+        if before[name]["p50_ms"]
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark efek arsip customer")
+    parser.add_argument("--base-url", default="http://127.0.0.1:8000")
+    parser.add_argument("--seed-rows", type=int, default=100000)
+    parser.add_argument("--history-days", type=int, default=730)
+    parser.add_argument("--repeat", type=int, default=50)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="Simpan laporan JSON ke file ini")
+    args = parser.parse_args()
+
+    session = requests.Session()
+    phones = seed(session, args.base_url, args.seed_rows, args.history_days, args.seed)
+
+    before = measure(session, args.base_url, phones, args.repeat, args.seed)
+    start = time.perf_counter()
+    response = session.post(f"{args.base_url}/customers/archive/run", timeout=3600)
+    response.raise_for_status()
+    archive_seconds = time.perf_counter() - start
+    after = measure(session, args.base_url, phones, args.repeat, args.seed)
+    with_archive = measure(
+        session, args.base_url, phones, args.repeat, args.seed, include_archived=True
+    )
+
+    report = {
+        "commit": git_commit(),
+        "seed_rows": args.seed_rows,
+        "history_days": args.history_days,
+        "archive": {**response.json(), "seconds": round(archive_seconds, 2)},
+        "before": before,
+        "after_hot_only": after,
+        "after_include_archived": with_archive,
+        "hot_only_p50_change_pct": change(before, after),
+    }
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(output + "\n")
+    print(output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""Bandingkan kecepatan /save_customer/ (satu baris per request) dengan /customers/bulk.
+
+Jalankan backend terlebih dahulu (`uvicorn main:app`), lalu:
+
+    python benchmarks/bulk_insert.py --rows 2000 --batch-size 500
+
+Skrip ini menulis data dummy ke tabel `customers` pada database yang
+dikonfigurasi di `.env`; jalankan pada database lokal/pengujian.
+"""
+import argparse
+import json
+import random
+import time
+from datetime import datetime, timedelta
+
+import requests
+
+
+def make_rows(count, seed=42):
+    rnd = random.Random(seed)
+    start = datetime(2025, 1, 1, 8, 0)
+    return [
+        {
+            "name": f"Bench Customer {i}",
+            "phone": f"08{rnd.randrange(10**9, 10**10)}",
+            "address": f"Jl. Benchmark No. {i}, Jakarta",
+            "delivery_date": (start + timedelta(hours=rnd.randrange(24 * 365))).strftime(
+                "%Y-%m-%d %H:%M"
+            ),
+        }
+        for i in range(count)
+    ]
+
+
+def bench_single(session, base_url, rows):
+    start = time.perf_counter()
+    failed = 0
+    for row in rows:
+        response = session.post(f"{base_url}/save_customer/", json=row, timeout=30)
+        if response.status_code not in (200, 202):
+            failed += 1
+    elapsed = time.perf_counter() - start
+    return {"seconds": round(elapsed, 3), "rows_per_sec": round(len(rows) / elapsed, 1), "failed": failed}
+
+
+def bench_bulk(session, base_url, rows, batch_size, ndjson=False):
+    if ndjson:
+        body = "".join(json.dumps(row) + "\n" for row in rows)
+        kwargs = {"data": body.encode(), "headers": {"Content-Type": "application/x-ndjson"}}
+    else:
+        kwargs = {"json": rows}
+    start = time.perf_counter()
+    response = session.post(
+        f"{base_url}/customers/bulk", params={"batch_size": batch_size}, timeout=300, **kwargs
+    )
+    elapsed = time.perf_counter() - start
+    response.raise_for_status()
+    result = response.json()
+    return {
+        "seconds": round(elapsed, 3),
+        "rows_per_sec": round(len(rows) / elapsed, 1),
+        "failed": result["failed"],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--base-url", default="http://127.0.0.1:8000")
+    parser.add_argument("--rows", type=int, default=2000)
+    parser.add_argument("--batch-size", type=int, default=500)
+    parser.add_argument("--skip-single", action="store_true", help="Lewati jalur satu-per-satu")
+    args = parser.parse_args()
+
+    rows = make_rows(args.rows)
+    session = requests.Session()
+    report = {"rows": args.rows, "batch_size": args.batch_size}
+    if not args.skip_single:
+        report["single"] = bench_single(session, args.base_url, rows)
+    report["bulk_json"] = bench_bulk(session, args.base_url, rows, args.batch_size)
+    report["bulk_ndjson"] = bench_bulk(session, args.base_url, rows, args.batch_size, ndjson=True)
+    if "single" in report:
+        report["speedup"] = round(report["single"]["seconds"] / report["bulk_json"]["seconds"], 1)
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""Ukur time-to-first-token endpoint SSE `/chat/stream` dari sisi klien.
+
+    python benchmarks/fake_openai.py --port 9000 &
+    OPENAI_BASE_URL=http://127.0.0.1:9000/v1 OPENAI_API_KEY=fake uvicorn main:app &
+    python benchmarks/chat_stream_ttft.py --requests 20
+"""
+import argparse
+import json
+import statistics
+import time
+
+import requests
+
+
+def measure(session, url, prompt):
+    start = time.perf_counter()
+    ttft = None
+    server_metrics = None
+    with session.post(url, json={"prompt": prompt}, stream=True, timeout=60) as response:
+        response.raise_for_status()
+        event = None
+        for line in response.iter_lines(decode_unicode=True):
+            if line.startswith("event: "):
+                event = line[len("event: "):]
+            elif line.startswith("data: "):
+                if ttft is None and event is None:
+                    ttft = time.perf_counter() - start
+                if event == "done":
+                    server_metrics = json.loads(line[len("data: "):])
+            elif not line:
+                event = None
+    return ttft, time.perf_counter() - start, server_metrics
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark TTFT /chat/stream")
+    parser.add_argument("--base-url", default="http://127.0.0.1:8000")
+    parser.add_argument("--requests", type=int, default=10)
+    args = parser.parse_args()
+
+    session = requests.Session()
+    ttfts, totals = [], []
+    for i in range(args.requests):
+        ttft, total, _ = measure(
+            session, f"{args.base_url}/chat/stream", f"Kapan paket nomor {i} dikirim?"
+        )
+        if ttft is not None:
+            ttfts.append(ttft * 1000)
+        totals.append(total * 1000)
+
+    print(json.dumps({
+        "requests": args.requests,
+        "ttft_ms_p50": round(statistics.median(ttfts), 1) if ttfts else None,
+        "ttft_ms_max": round(max(ttfts), 1) if ttfts else None,
+        "total_ms_p50": round(statistics.median(totals), 1),
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
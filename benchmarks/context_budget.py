@@ -0,0 +1,105 @@
+"""Bandingkan ukuran prompt dan latensi: seluruh riwayat vs konteks berbatas token.
+
+    python benchmarks/context_budget.py --turns 10 50 200 1000
+    python benchmarks/context_budget.py --llm   # ikut ukur latensi ke OPENAI_BASE_URL
+
+Gunakan `--llm` bersama `benchmarks/fake_openai.py` supaya tidak memakai kuota.
+"""
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from context_builder import (  # noqa: E402
+    DEFAULT_TOKEN_BUDGET,
+    build_context_messages,
+    count_message_tokens,
+)
+from llm import build_messages  # noqa: E402
+
+BOOKING = {
+    "name": "Budi Santoso",
+    "phone": "+6281234567890",
+    "address": "Jl. Merdeka No. 10, Bandung",
+    "delivery_date": "2025-09-27 17:00",
+}
+
+
+def make_history(turns):
+    history = []
+    for i in range(turns):
+        history.append(
+            {"role": "user", "content": f"Pertanyaan ke-{i}: apakah jadwal kirim bisa dimajukan sedikit?"}
+        )
+        history.append(
+            {
+                "role": "assistant",
+                "content": f"Jawaban ke-{i}: bisa, silakan konfirmasi jam baru dan kurir kami akan menyesuaikan.",
+            }
+        )
+    return history
+
+
+def naive_messages(prompt, history):
+    messages = build_messages(prompt, "layanan pelanggan")
+    return messages[:1] + history + messages[1:]
+
+
+def time_call(fn, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = fn()
+    return result, (time.perf_counter() - start) / repeat * 1000
+
+
+def llm_latency(client, messages):
+    start = time.perf_counter()
+    client.chat.completions.create(model="gpt-4o-mini", messages=messages)
+    return round((time.perf_counter() - start) * 1000, 1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark context builder")
+    parser.add_argument("--turns", type=int, nargs="+", default=[10, 50, 200, 1000])
+    parser.add_argument("--budget", type=int, default=DEFAULT_TOKEN_BUDGET)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--llm", action="store_true", help="Ukur latensi completion")
+    args = parser.parse_args()
+
+    client = None
+    if args.llm:
+        from openai import OpenAI
+
+        client = OpenAI()
+
+    prompt = "Kapan paket saya sampai?"
+    report = []
+    for turns in args.turns:
+        history = make_history(turns)
+        naive, naive_ms = time_call(lambda: naive_messages(prompt, history), args.repeat)
+        bounded, bounded_ms = time_call(
+            lambda: build_context_messages(
+                prompt, "layanan pelanggan", history, BOOKING, budget=args.budget
+            ),
+            args.repeat,
+        )
+        row = {
+            "turns": turns,
+            "naive_tokens": count_message_tokens(naive),
+            "bounded_tokens": count_message_tokens(bounded),
+            "naive_build_ms": round(naive_ms, 3),
+            "bounded_build_ms": round(bounded_ms, 3),
+        }
+        if client is not None:
+            row["naive_latency_ms"] = llm_latency(client, naive)
+            row["bounded_latency_ms"] = llm_latency(client, bounded)
+        report.append(row)
+
+    print(json.dumps({"budget": args.budget, "sessions": report}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
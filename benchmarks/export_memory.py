@@ -0,0 +1,132 @@
+"""Bandingkan memori export customer: DataFrame utuh vs `/customers/export`.
+
+Skrip membuat database terpisah (default `cs_chatbot_bench`) berisi data dummy
+seperti `schema_indexes.py`, lalu menjalankan setiap mode di subprocess sendiri
+supaya puncak RSS-nya tidak saling tercampur:
+
+- `dataframe`: cara lama dashboard, `fetchall` -> DataFrame -> `to_csv().encode()`
+- `stream`: generator yang dipakai endpoint export (cursor server-side per chunk)
+- `stream_gzip`: sama, ditambah kompresi gzip
+
+    python benchmarks/export_memory.py --rows 1000000
+
+Hasil dicetak sebagai JSON (detik, ukuran file, puncak RSS dalam MB).
+"""
+import argparse
+import json
+import resource
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import mysql.connector
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from db import DB_CONFIG  # noqa: E402
+from schema_indexes import create_bench_database, seed  # noqa: E402
+
+MODES = ("dataframe", "stream", "stream_gzip")
+
+
+def peak_rss_mb():
+    # ru_maxrss dalam KB di Linux
+    return round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1)
+
+
+def export_dataframe(config):
+    import pandas as pd
+
+    conn = mysql.connector.connect(**config)
+    try:
+        cursor = conn.cursor(dictionary=True)
+        cursor.execute("SELECT * FROM customers ORDER BY id DESC")
+        df = pd.DataFrame(cursor.fetchall())
+        cursor.close()
+    finally:
+        conn.close()
+    return len(df.to_csv(index=False).encode("utf-8"))
+
+
+def export_stream(config, gzip):
+    from db import ConnectionPool
+    from main import (
+        CUSTOMER_COLUMNS,
+        _gzip_stream,
+        _iter_customer_rows,
+        _stream_csv,
+    )
+
+    pool = ConnectionPool(config, size=1, name="export_bench")
+    pool.open()
+    try:
+        columns = list(CUSTOMER_COLUMNS)
+        body = _stream_csv(_iter_customer_rows(pool, columns, {}), columns)
+        if gzip:
+            body = _gzip_stream(body)
+        size = 0
+        for chunk in body:
+            size += len(chunk.encode("utf-8") if isinstance(chunk, str) else chunk)
+        return size
+    finally:
+        pool.close()
+
+
+def run_mode(mode, database):
+    config = dict(DB_CONFIG, database=database)
+    start = time.perf_counter()
+    if mode == "dataframe":
+        size = export_dataframe(config)
+    else:
+        size = export_stream(config, gzip=mode == "stream_gzip")
+    print(
+        json.dumps(
+            {
+                "seconds": round(time.perf_counter() - start, 2),
+                "bytes": size,
+                "peak_rss_mb": peak_rss_mb(),
+            }
+        )
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark memori export customer")
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--database", default="cs_chatbot_bench")
+    parser.add_argument("--keep", action="store_true", help="Jangan hapus database benchmark")
+    parser.add_argument("--mode", choices=MODES, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.mode:
+        run_mode(args.mode, args.database)
+        return
+
+    config = {k: v for k, v in DB_CONFIG.items() if k != "database"}
+    conn = mysql.connector.connect(**config)
+    try:
+        create_bench_database(conn, args.database)
+        seed(conn, args.rows)
+
+        results = {}
+        for mode in MODES:
+            output = subprocess.run(
+                [sys.executable, __file__, "--mode", mode, "--database", args.database],
+                check=True,
+                capture_output=True,
+                text=True,
+            ).stdout
+            results[mode] = json.loads(output.strip().splitlines()[-1])
+        print(json.dumps({"rows": args.rows, "modes": results}, indent=2))
+    finally:
+        if not args.keep:
+            cursor = conn.cursor()
+            cursor.execute(f"DROP DATABASE IF EXISTS `{args.database}`")
+            cursor.close()
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
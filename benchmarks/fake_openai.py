@@ -0,0 +1,126 @@
+"""Server palsu yang meniru endpoint `/v1/chat/completions` OpenAI.
+
+Dipakai untuk menguji dan mengukur jalur AI tanpa memanggil OpenAI:
+
+    python benchmarks/fake_openai.py --port 9000 --ttft 0.4 --token-delay 0.03
+    OPENAI_BASE_URL=http://127.0.0.1:9000/v1 OPENAI_API_KEY=fake uvicorn main:app
+
+Mendukung respons biasa maupun `stream=True` (SSE dengan `data: [DONE]`), dan
+bisa disetel untuk sesekali membalas 429 supaya logika retry ikut teruji.
+"""
+import argparse
+import asyncio
+import itertools
+import json
+import time
+import uuid
+
+import uvicorn
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+CONFIG = {
+    "ttft": 0.3,  # detik sebelum token pertama
+    "token_delay": 0.02,  # detik antar token
+    "rate_limit_every": 0,  # balas 429 setiap N request (0 = tidak pernah)
+}
+
+app = FastAPI()
+_request_counter = itertools.count(1)
+
+
+def _answer_tokens(messages):
+    prompt = next(
+        (m["content"] for m in reversed(messages) if m.get("role") == "user"), ""
+    )
+    words = f"Ini jawaban dari server palsu untuk pertanyaan: {prompt}".split(" ")
+    return [w if i == 0 else " " + w for i, w in enumerate(words)]
+
+
+def _usage(messages, tokens):
+    prompt_tokens = sum(len(m.get("content", "").split()) for m in messages)
+    return {
+        "prompt_tokens": prompt_tokens,
+        "completion_tokens": len(tokens),
+        "total_tokens": prompt_tokens + len(tokens),
+    }
+
+
+def _chunk(completion_id, model, delta, finish_reason=None):
+    return {
+        "id": completion_id,
+        "object": "chat.completion.chunk",
+        "created": int(time.time()),
+        "model": model,
+        "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}],
+    }
+
+
+@app.post("/v1/chat/completions")
+async def chat_completions(request: Request):
+    body = await request.json()
+    every = CONFIG["rate_limit_every"]
+    if every and next(_request_counter) % every == 0:
+        return JSONResponse(
+            status_code=429,
+            headers={"retry-after": "0.1"},
+            content={"error": {"message": "Rate limit (fake)", "type": "rate_limit"}},
+        )
+
+    model = body.get("model", "fake-model")
+    messages = body.get("messages", [])
+    tokens = _answer_tokens(messages)
+    completion_id = f"chatcmpl-{uuid.uuid4().hex[:12]}"
+
+    if not body.get("stream"):
+        await asyncio.sleep(CONFIG["ttft"] + CONFIG["token_delay"] * len(tokens))
+        return {
+            "id": completion_id,
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": model,
+            "choices": [
+                {
+                    "index": 0,
+                    "message": {"role": "assistant", "content": "".join(tokens)},
+                    "finish_reason": "stop",
+                }
+            ],
+            "usage": _usage(messages, tokens),
+        }
+
+    async def events():
+        await asyncio.sleep(CONFIG["ttft"])
+        yield f"data: {json.dumps(_chunk(completion_id, model, {'role': 'assistant'}))}\n\n"
+        for token in tokens:
+            yield f"data: {json.dumps(_chunk(completion_id, model, {'content': token}))}\n\n"
+            await asyncio.sleep(CONFIG["token_delay"])
+        yield f"data: {json.dumps(_chunk(completion_id, model, {}, 'stop'))}\n\n"
+        if (body.get("stream_options") or {}).get("include_usage"):
+            usage = dict(_chunk(completion_id, model, {}), choices=[])
+            usage["usage"] = _usage(messages, tokens)
+            yield f"data: {json.dumps(usage)}\n\n"
+        yield "data: [DONE]\n\n"
+
+    return StreamingResponse(events(), media_type="text/event-stream")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Server OpenAI palsu untuk pengujian")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9000)
+    parser.add_argument("--ttft", type=float, default=CONFIG["ttft"])
+    parser.add_argument("--token-delay", type=float, default=CONFIG["token_delay"])
+    parser.add_argument("--rate-limit-every", type=int, default=CONFIG["rate_limit_every"])
+    args = parser.parse_args()
+
+    CONFIG.update(
+        ttft=args.ttft,
+        token_delay=args.token_delay,
+        rate_limit_every=args.rate_limit_every,
+    )
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""Ukur FAQ lokal: latensi pencarian dan berapa pertanyaan yang tidak perlu ke AI.
+
+    python benchmarks/faq_retrieval.py
+    python benchmarks/faq_retrieval.py --threshold 0.5 0.6 0.7
+    python benchmarks/faq_retrieval.py --llm   # bandingkan dengan latensi OPENAI_BASE_URL
+
+Pertanyaan berlabel ada di `corpus/faq_questions.tsv`. `deflection_rate` adalah
+porsi pertanyaan yang dijawab lokal; `wrong_answers` menghitung jawaban FAQ
+yang salah entry atau seharusnya diteruskan ke AI. Pakai `--llm` bersama
+`benchmarks/fake_openai.py` supaya tidak memakai kuota.
+"""
+import argparse
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from faq import FAQ_PATH, FAQIndex, build_index  # noqa: E402
+
+ROOT = Path(__file__).resolve().parent.parent
+CORPUS = Path(__file__).resolve().parent / "corpus" / "faq_questions.tsv"
+
+
+def load_corpus(path=CORPUS):
+    cases = []
+    for line in path.read_text(encoding="utf-8").splitlines():
+        if not line or line.startswith("#"):
+            continue
+        question, _, expected = line.partition("\t")
+        cases.append((question, expected or None))
+    return cases
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+def evaluate(index, cases, threshold, repeat):
+    hits = wrong = 0
+    timings = []
+    for question, expected in cases:
+        for _ in range(repeat):
+            start = time.perf_counter()
+            entry, score = index.search(question)
+            timings.append((time.perf_counter() - start) * 1000)
+        if entry is not None and score >= threshold:
+            hits += 1
+            wrong += entry["question"] != expected
+    return {
+        "threshold": threshold,
+        "deflection_rate": round(hits / len(cases), 3),
+        "answered_locally": hits,
+        "wrong_answers": wrong,
+        "expected_local": sum(1 for _, expected in cases if expected),
+        "lookup_ms": {
+            "p50": round(percentile(timings, 50), 4),
+            "p95": round(percentile(timings, 95), 4),
+            "p99": round(percentile(timings, 99), 4),
+        },
+    }
+
+
+def llm_latency(client, questions):
+    timings = []
+    for question in questions:
+        start = time.perf_counter()
+        client.chat.completions.create(
+            model="gpt-4o-mini", messages=[{"role": "user", "content": question}]
+        )
+        timings.append((time.perf_counter() - start) * 1000)
+    return {"p50": round(percentile(timings, 50), 1), "p95": round(percentile(timings, 95), 1)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark FAQ lokal")
+    parser.add_argument("--faq", default=str(ROOT / FAQ_PATH))
+    parser.add_argument("--threshold", type=float, nargs="+", default=[0.5, 0.6, 0.7])
+    parser.add_argument("--repeat", type=int, default=100)
+    parser.add_argument("--llm", action="store_true", help="Ukur latensi completion")
+    args = parser.parse_args()
+
+    cases = load_corpus()
+    with tempfile.TemporaryDirectory() as index_dir:
+        start = time.perf_counter()
+        entries, questions = build_index(args.faq, index_dir)
+        build_ms = (time.perf_counter() - start) * 1000
+        start = time.perf_counter()
+        index = FAQIndex(index_dir)
+        load_ms = (time.perf_counter() - start) * 1000
+
+        report = {
+            "entries": entries,
+            "questions": questions,
+            "cases": len(cases),
+            "build_ms": round(build_ms, 2),
+            "load_ms": round(load_ms, 2),
+            "thresholds": [evaluate(index, cases, t, args.repeat) for t in args.threshold],
+        }
+
+    if args.llm:
+        from openai import OpenAI
+
+        report["llm_ms"] = llm_latency(OpenAI(), [q for q, _ in cases])
+
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""Fuzz parser tanggal/telepon dengan korpus di `benchmarks/corpus/`.
+
+Tahap 1 memeriksa setiap baris korpus terhadap hasil yang diharapkan. Tahap 2
+memutasi korpus secara acak dan memastikan parser tidak pernah error dan
+hasilnya selalu None atau berformat benar:
+
+    python benchmarks/fuzz_parsing.py --iterations 200000 --seed 1
+"""
+import argparse
+import random
+import re
+import sys
+from datetime import datetime
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from parsing import DATE_FORMAT, extract_date, extract_phone  # noqa: E402
+
+CORPUS = Path(__file__).resolve().parent / "corpus"
+NOW = datetime(2025, 9, 20, 9, 0)
+E164 = re.compile(r"\+\d{8,15}")
+ALPHABET = "0123456789 ./:-+()abcdefghijklmnopqrstuvwxyz,WIBTA"
+
+
+def load_corpus(name):
+    cases = []
+    for line in (CORPUS / name).read_text(encoding="utf-8").splitlines():
+        if line.startswith("#"):
+            continue
+        text, _, expected = line.partition("\t")
+        cases.append((text, expected or None))
+    return cases
+
+
+def mutate(rnd, text):
+    chars = list(text)
+    for _ in range(rnd.randint(1, 4)):
+        op = rnd.random()
+        pos = rnd.randint(0, len(chars))
+        if op < 0.4:
+            chars.insert(pos, rnd.choice(ALPHABET))
+        elif op < 0.7 and chars:
+            del chars[min(pos, len(chars) - 1)]
+        elif chars:
+            chars[min(pos, len(chars) - 1)] = rnd.choice(ALPHABET)
+    return "".join(chars)
+
+
+def check_date(text):
+    result = extract_date(text, NOW)
+    if result is not None:
+        datetime.strptime(result, DATE_FORMAT)
+
+
+def check_phone(text):
+    result = extract_phone(text)
+    if result is not None and not E164.fullmatch(result):
+        raise AssertionError(f"bukan E.164: {result!r}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fuzz parsing.py")
+    parser.add_argument("--iterations", type=int, default=50000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    failures = []
+    for text, expected in load_corpus("dates.tsv"):
+        if extract_date(text, NOW) != expected:
+            failures.append(("date", text, expected, extract_date(text, NOW)))
+    for text, expected in load_corpus("phones.tsv"):
+        if extract_phone(text) != expected:
+            failures.append(("phone", text, expected, extract_phone(text)))
+
+    rnd = random.Random(args.seed)
+    seeds = [("date", t) for t, _ in load_corpus("dates.tsv")]
+    seeds += [("phone", t) for t, _ in load_corpus("phones.tsv")]
+    for _ in range(args.iterations):
+        kind, text = rnd.choice(seeds)
+        text = mutate(rnd, text)
+        try:
+            (check_date if kind == "date" else check_phone)(text)
+        except Exception as e:  # noqa: BLE001 - setiap error adalah temuan fuzz
+            failures.append((kind, text, "no error", repr(e)))
+
+    for failure in failures[:50]:
+        print("❌ %s %r: diharapkan %r, didapat %r" % failure)
+    print(f"{'❌' if failures else '✅'} {len(failures)} kegagalan dari {args.iterations} mutasi")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,228 @@
+"""Load test API booking, listing, dan chat dengan laporan JSON per skenario.
+
+Jalankan backend dengan MySQL lokal (lihat `benchmarks/docker-compose.yml`)
+dan server OpenAI palsu, lalu:
+
+    python benchmarks/fake_openai.py --port 9000 &
+    OPENAI_BASE_URL=http://127.0.0.1:9000/v1 OPENAI_API_KEY=fake uvicorn main:app &
+    python benchmarks/load_test.py --concurrency 32 --requests 2000 --seed-rows 50000 \\
+        --output results/$(git rev-parse --short HEAD).json
+
+Setiap skenario melaporkan jumlah request, throughput, error rate, jumlah per
+status, dan latensi p50/p95/p99/max (ms). Simpan hasil per commit lalu
+bandingkan dengan `--compare hasil_lama.json`.
+"""
+import argparse
+import json
+import random
+import subprocess
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+import requests
+
+SEED_BATCH = 1000
+
+
+def make_customer(rnd, i):
+    delivery = datetime(2025, 1, 1, 8, 0) + timedelta(hours=rnd.randrange(24 * 365))
+    return {
+        "name": f"Load Customer {i}",
+        "phone": f"0812{rnd.randrange(10**8):08d}",
+        "address": f"Jl. Load Test No. {i}, Jakarta",
+        "delivery_date": delivery.strftime("%Y-%m-%d %H:%M"),
+    }
+
+
+def save_customer(session, base_url, rnd, i):
+    return session.post(f"{base_url}/save_customer/", json=make_customer(rnd, i), timeout=30)
+
+
+def customers_page(session, base_url, rnd, i):
+    return session.get(f"{base_url}/customers/", params={"limit": 100}, timeout=30)
+
+
+def customers_filtered(session, base_url, rnd, i):
+    start = datetime(2025, 1, 1) + timedelta(days=rnd.randrange(358))
+    params = {
+        "limit": 100,
+        "delivery_from": start.isoformat(),
+        "delivery_to": (start + timedelta(days=7)).isoformat(),
+    }
+    return session.get(f"{base_url}/customers/", params=params, timeout=30)
+
+
+def chat(session, base_url, rnd, i):
+    payload = {"prompt": f"Kapan paket nomor {i} dikirim?", "session_id": f"load-{i % 50}"}
+    return session.post(f"{base_url}/chat", json=payload, timeout=120)
+
+
+def chat_stream(session, base_url, rnd, i):
+    payload = {"prompt": f"Kapan paket nomor {i} dikirim?", "session_id": f"load-{i % 50}"}
+    with session.post(f"{base_url}/chat/stream", json=payload, stream=True, timeout=120) as response:
+        for line in response.iter_lines(decode_unicode=True):
+            if line == "event: error":
+                response.status_code = 599  # error di tengah stream
+        return response
+
+
+SCENARIOS = {
+    "save_customer": save_customer,
+    "customers_page": customers_page,
+    "customers_filtered": customers_filtered,
+    "chat": chat,
+    "chat_stream": chat_stream,
+}
+
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile dari list yang sudah terurut"""
+    if not sorted_values:
+        return None
+    rank = max(1, round(pct / 100 * len(sorted_values)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+def seed(base_url, rows, seed_value=42):
+    rnd = random.Random(seed_value)
+    session = requests.Session()
+    for offset in range(0, rows, SEED_BATCH):
+        batch = [make_customer(rnd, i) for i in range(offset, min(offset + SEED_BATCH, rows))]
+        response = session.post(f"{base_url}/customers/bulk", json=batch, timeout=300)
+        response.raise_for_status()
+
+
+def run_scenario(name, base_url, concurrency, total, duration, seed_value):
+    call = SCENARIOS[name]
+    lock = threading.Lock()
+    latencies = []
+    statuses = {}
+    errors = 0
+    counter = iter(range(10**12))
+    deadline = time.perf_counter() + duration if duration else None
+
+    def worker(worker_id):
+        nonlocal errors
+        session = requests.Session()
+        rnd = random.Random(seed_value + worker_id)
+        while True:
+            with lock:
+                i = next(counter)
+            if (total and i >= total) or (deadline and time.perf_counter() >= deadline):
+                return
+            start = time.perf_counter()
+            try:
+                status = call(session, base_url, rnd, i).status_code
+            except requests.exceptions.RequestException as e:
+                status = type(e).__name__
+            elapsed = (time.perf_counter() - start) * 1000
+            with lock:
+                latencies.append(elapsed)
+                statuses[str(status)] = statuses.get(str(status), 0) + 1
+                if not isinstance(status, int) or status >= 400:
+                    errors += 1
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(worker, range(concurrency)))
+    wall = time.perf_counter() - start
+
+    latencies.sort()
+    count = len(latencies)
+    return {
+        "requests": count,
+        "seconds": round(wall, 3),
+        "throughput_rps": round(count / wall, 1) if wall else None,
+        "error_rate": round(errors / count, 4) if count else None,
+        "statuses": statuses,
+        "latency_ms": {
+            "p50": _round(percentile(latencies, 50)),
+            "p95": _round(percentile(latencies, 95)),
+            "p99": _round(percentile(latencies, 99)),
+            "max": _round(latencies[-1] if latencies else None),
+        },
+    }
+
+
+def _round(value):
+    return round(value, 1) if value is not None else None
+
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(report, baseline):
+    """Selisih p95 dan throughput terhadap hasil run sebelumnya (persen)"""
+    diff = {}
+    for name, result in report["scenarios"].items():
+        old = baseline.get("scenarios", {}).get(name)
+        if not old:
+            continue
+        entry = {}
+        if old["latency_ms"]["p95"] and result["latency_ms"]["p95"]:
+            entry["p95_change_pct"] = round(
+                (result["latency_ms"]["p95"] / old["latency_ms"]["p95"] - 1) * 100, 1
+            )
+        if old["throughput_rps"] and result["throughput_rps"]:
+            entry["throughput_change_pct"] = round(
+                (result["throughput_rps"] / old["throughput_rps"] - 1) * 100, 1
+            )
+        diff[name] = entry
+    return diff
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test API chatbot")
+    parser.add_argument("--base-url", default="http://127.0.0.1:8000")
+    parser.add_argument(
+        "--scenario", nargs="+", choices=sorted(SCENARIOS),
+        default=["save_customer", "customers_page", "customers_filtered"],
+    )
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--requests", type=int, default=1000, help="Per skenario")
+    parser.add_argument("--duration", type=float, default=0, help="Detik per skenario (ganti --requests)")
+    parser.add_argument("--seed-rows", type=int, default=0, help="Isi tabel lewat /customers/bulk dulu")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--label", help="Nama run, mis. 'workers=4'")
+    parser.add_argument("--output", help="Simpan laporan JSON ke file ini")
+    parser.add_argument("--compare", help="Laporan JSON sebelumnya untuk dibandingkan")
+    args = parser.parse_args()
+
+    if args.seed_rows:
+        seed(args.base_url, args.seed_rows, args.seed)
+
+    report = {
+        "commit": git_commit(),
+        "label": args.label,
+        "started_at": datetime.now().isoformat(timespec="seconds"),
+        "base_url": args.base_url,
+        "concurrency": args.concurrency,
+        "seed_rows": args.seed_rows,
+        "scenarios": {},
+    }
+    total = 0 if args.duration else args.requests
+    for name in args.scenario:
+        report["scenarios"][name] = run_scenario(
+            name, args.base_url, args.concurrency, total, args.duration, args.seed
+        )
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            report["compare"] = compare(report, json.load(f))
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(output + "\n")
+    print(output)
+
+
+if __name__ == "__main__":
+    main()
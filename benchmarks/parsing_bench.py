@@ -0,0 +1,97 @@
+"""Microbenchmark parser tanggal/telepon: implementasi lama vs `parsing.py`.
+
+    python benchmarks/parsing_bench.py --number 20000
+"""
+import argparse
+import json
+import random
+import re
+import sys
+import timeit
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from parsing import extract_date, extract_phone, normalize_phones, parse_dates  # noqa: E402
+
+
+def legacy_extract_date(text):
+    """Salinan `extract_date` lama dari chatbot_app.py sebagai pembanding"""
+    pattern = r"(\d{1,2}) (\w+) (\d{4})(?: (?:jam )?(\d{1,2})[.:](\d{2}))?"
+    match = re.search(pattern, text.lower())
+    if match:
+        day, month_name, year, hour, minute = match.groups()
+        months = {
+            "januari": 1, "februari": 2, "maret": 3, "april": 4, "mei": 5,
+            "juni": 6, "juli": 7, "agustus": 8, "september": 9, "oktober": 10,
+            "november": 11, "desember": 12,
+        }
+        month = months.get(month_name, 0)
+        hour = int(hour) if hour else 10
+        minute = int(minute) if minute else 0
+        try:
+            return datetime(int(year), month, int(day), hour, minute).strftime(
+                "%Y-%m-%d %H:%M"
+            )
+        except ValueError:
+            return None
+    try:
+        return datetime.strptime(text.strip(), "%Y-%m-%d %H:%M").strftime(
+            "%Y-%m-%d %H:%M"
+        )
+    except ValueError:
+        return None
+
+
+def legacy_extract_phone(text):
+    match = re.search(r"(\+?\d{8,15})", text)
+    return match.group(1) if match else None
+
+
+SAMPLES = {
+    "iso": "2025-09-27 17:00",
+    "month_name": "27 September 2025 jam 17.00",
+    "invalid": "kapan-kapan saja",
+}
+
+
+def bench(fn, arg, number):
+    return round(timeit.timeit(lambda: fn(arg), number=number) / number * 1e6, 3)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Microbenchmark parsing.py")
+    parser.add_argument("--number", type=int, default=20000)
+    parser.add_argument("--batch-rows", type=int, default=100000)
+    args = parser.parse_args()
+
+    report = {"us_per_call": {}}
+    for name, text in SAMPLES.items():
+        report["us_per_call"][f"date_{name}"] = {
+            "legacy": bench(legacy_extract_date, text, args.number),
+            "new": bench(extract_date, text, args.number),
+        }
+    report["us_per_call"]["phone"] = {
+        "legacy": bench(legacy_extract_phone, "0812-3456-7890", args.number),
+        "new": bench(extract_phone, "0812-3456-7890", args.number),
+    }
+
+    rnd = random.Random(0)
+    dates = [f"2025-{rnd.randint(1, 12):02d}-{rnd.randint(1, 28):02d} {rnd.randint(8, 20):02d}:00"
+             for _ in range(args.batch_rows)]
+    phones = [f"0812{rnd.randrange(10**7, 10**8)}" for _ in range(args.batch_rows)]
+    report["batch_rows_per_sec"] = {
+        "parse_dates": round(args.batch_rows / timeit.timeit(lambda: parse_dates(dates), number=1)),
+        "normalize_phones": round(
+            args.batch_rows / timeit.timeit(lambda: normalize_phones(phones), number=1)
+        ),
+        "legacy_loop_dates": round(
+            args.batch_rows / timeit.timeit(lambda: [legacy_extract_date(d) for d in dates], number=1)
+        ),
+    }
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
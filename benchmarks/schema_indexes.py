@@ -0,0 +1,168 @@
+"""Ukur waktu query dashboard sebelum dan sesudah migrasi di folder `migrations/`.
+
+Skrip membuat database terpisah (default `cs_chatbot_bench`) di server MySQL
+dari `.env`, membuat tabel `customers` dari `schema.sql`, mengisinya dengan
+data dummy, lalu menjalankan setiap query sebelum dan sesudah migrasi:
+
+    python benchmarks/schema_indexes.py --rows 2000000
+
+Hasil dicetak sebagai JSON (median detik per query).
+"""
+import argparse
+import json
+import random
+import statistics
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import mysql.connector
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from db import DB_CONFIG  # noqa: E402
+from migrate import apply_migrations, split_statements  # noqa: E402
+
+SEED_BATCH = 5000
+
+# nama -> (query sebelum migrasi, query sesudah migrasi, parameter)
+QUERIES = {
+    "upcoming_count": (
+        "SELECT COUNT(*) FROM customers WHERE delivery_date >= CURDATE()",
+        None,
+        None,
+    ),
+    "delivery_range_page": (
+        "SELECT id, name, phone FROM customers"
+        " WHERE delivery_date BETWEEN %s AND %s ORDER BY id DESC LIMIT 100",
+        None,
+        ("2025-03-01", "2025-03-07"),
+    ),
+    "unique_phones": ("SELECT COUNT(DISTINCT phone) FROM customers", None, None),
+    "phone_lookup": (
+        "SELECT id, name, address FROM customers WHERE phone = %s",
+        None,
+        ("081200000042",),
+    ),
+    "monthly_counts": (
+        "SELECT DATE_FORMAT(delivery_date, '%Y-%m') AS month, COUNT(*)"
+        " FROM customers GROUP BY month ORDER BY month",
+        "SELECT delivery_month AS month, COUNT(*)"
+        " FROM customers GROUP BY delivery_month ORDER BY delivery_month",
+        None,
+    ),
+    "created_at_page": (
+        "SELECT id, name, created_at FROM customers"
+        " ORDER BY created_at DESC, id DESC LIMIT 100",
+        None,
+        None,
+    ),
+}
+
+
+def create_bench_database(conn, database):
+    cursor = conn.cursor()
+    cursor.execute(f"DROP DATABASE IF EXISTS `{database}`")
+    cursor.execute(f"CREATE DATABASE `{database}`")
+    cursor.execute(f"USE `{database}`")
+    for statement in split_statements((ROOT / "schema.sql").read_text()):
+        upper = statement.lstrip().upper()
+        if upper.startswith("CREATE DATABASE") or upper.startswith("USE "):
+            continue
+        cursor.execute(statement)
+    cursor.close()
+
+
+def seed(conn, rows, seed_value=42):
+    rnd = random.Random(seed_value)
+    start = datetime(2024, 1, 1, 8, 0)
+    cursor = conn.cursor()
+    query = (
+        "INSERT INTO customers (name, phone, address, delivery_date, created_at)"
+        " VALUES (%s, %s, %s, %s, %s)"
+    )
+    for offset in range(0, rows, SEED_BATCH):
+        batch = []
+        for i in range(offset, min(offset + SEED_BATCH, rows)):
+            delivery = start + timedelta(hours=rnd.randrange(24 * 730))
+            batch.append(
+                (
+                    f"Customer {i}",
+                    # ~1/3 nomor berulang seperti pelanggan langganan
+                    f"0812{rnd.randrange(rows // 3 + 1):08d}",
+                    f"Jl. Benchmark No. {i}",
+                    delivery,
+                    delivery - timedelta(days=rnd.randrange(1, 30)),
+                )
+            )
+        cursor.executemany(query, batch)
+        conn.commit()
+    cursor.close()
+
+
+def time_queries(conn, phase, repeat):
+    cursor = conn.cursor()
+    results = {}
+    for name, (before, after, params) in QUERIES.items():
+        query = after if phase == "after" and after else before
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            cursor.execute(query, params) if params else cursor.execute(query)
+            cursor.fetchall()
+            timings.append(time.perf_counter() - start)
+        results[name] = round(statistics.median(timings), 4)
+    cursor.close()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark index schema customers")
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--database", default="cs_chatbot_bench")
+    parser.add_argument("--keep", action="store_true", help="Jangan hapus database benchmark")
+    args = parser.parse_args()
+
+    config = {k: v for k, v in DB_CONFIG.items() if k != "database"}
+    conn = mysql.connector.connect(**config)
+    try:
+        create_bench_database(conn, args.database)
+
+        start = time.perf_counter()
+        seed(conn, args.rows)
+        seed_seconds = time.perf_counter() - start
+
+        before = time_queries(conn, "before", args.repeat)
+        start = time.perf_counter()
+        applied = apply_migrations(conn)
+        migrate_seconds = time.perf_counter() - start
+        after = time_queries(conn, "after", args.repeat)
+
+        report = {
+            "rows": args.rows,
+            "seed_seconds": round(seed_seconds, 2),
+            "migrations": applied,
+            "migrate_seconds": round(migrate_seconds, 2),
+            "queries": {
+                name: {
+                    "before": before[name],
+                    "after": after[name],
+                    "speedup": round(before[name] / after[name], 1) if after[name] else None,
+                }
+                for name in QUERIES
+            },
+        }
+        print(json.dumps(report, indent=2))
+    finally:
+        if not args.keep:
+            cursor = conn.cursor()
+            cursor.execute(f"DROP DATABASE IF EXISTS `{args.database}`")
+            cursor.close()
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
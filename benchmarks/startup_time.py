@@ -0,0 +1,123 @@
+"""Ukur biaya impor saat start `chatbot_app.py` dengan `python -X importtime`.
+
+Setiap jalur diimpor di interpreter baru beberapa kali (median diambil):
+
+* `user`: impor di bagian atas chatbot_app.py (yang dibayar setiap proses)
+* `admin`: + pandas, mysql.connector dan repository storage (dashboard admin)
+* `ai_fallback`: + openai (backend AI tidak bisa dihubungi)
+* `faq`: + index FAQ (numpy)
+* `eager`: semua di atas sekaligus, seperti sebelum impor dibuat lazy
+
+    python benchmarks/startup_time.py --output results/startup-$(git rev-parse --short HEAD).json
+    python benchmarks/startup_time.py --compare results/startup-abc1234.json
+
+Simpan hasil per commit supaya regresi waktu start terlihat dari waktu ke waktu.
+"""
+import argparse
+import ast
+import json
+import statistics
+import subprocess
+import sys
+from datetime import datetime
+from pathlib import Path
+
+from load_test import git_commit
+
+ROOT = Path(__file__).resolve().parent.parent
+APP = ROOT / "chatbot_app.py"
+
+EXTRA_IMPORTS = {
+    "user": [],
+    "admin": ["import pandas", "import mysql.connector", "import storage"],
+    "ai_fallback": ["import openai"],
+    "faq": ["import faq"],
+}
+EXTRA_IMPORTS["eager"] = [line for extra in EXTRA_IMPORTS.values() for line in extra]
+
+
+def app_imports(path=APP):
+    """Statement import di level modul chatbot_app.py (tanpa menjalankan app)"""
+    tree = ast.parse(path.read_text(encoding="utf-8"))
+    return [
+        ast.unparse(node) for node in tree.body if isinstance(node, (ast.Import, ast.ImportFrom))
+    ]
+
+
+def parse_importtime(stderr):
+    """Total waktu impor (ms) dan modul level atas terberat dari output -X importtime"""
+    total_us = 0
+    top_level = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        total_us += int(self_us)
+        if not name.startswith("  "):  # indentasi = diimpor oleh modul lain
+            top_level[name.strip()] = int(cumulative_us)
+    return total_us / 1000, top_level
+
+
+def measure(statements, repeat):
+    code = "\n".join(statements)
+    totals, modules = [], {}
+    for _ in range(repeat):
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", code],
+            cwd=ROOT, capture_output=True, text=True,
+        )
+        if result.returncode != 0:
+            raise RuntimeError(result.stderr.strip().splitlines()[-1])
+        total_ms, top_level = parse_importtime(result.stderr)
+        totals.append(total_ms)
+        for name, us in top_level.items():
+            modules.setdefault(name, []).append(us / 1000)
+    heaviest = sorted(modules.items(), key=lambda item: -statistics.median(item[1]))[:10]
+    return {
+        "import_ms": round(statistics.median(totals), 1),
+        "min_ms": round(min(totals), 1),
+        "heaviest_ms": {name: round(statistics.median(ms), 1) for name, ms in heaviest},
+    }
+
+
+def compare(report, baseline):
+    """Selisih median waktu impor per jalur terhadap run sebelumnya (persen)"""
+    diff = {}
+    for name, result in report["paths"].items():
+        old = baseline.get("paths", {}).get(name)
+        if old and old["import_ms"]:
+            diff[name] = round((result["import_ms"] / old["import_ms"] - 1) * 100, 1)
+    return diff
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark waktu impor chatbot_app.py")
+    parser.add_argument("--path", nargs="+", choices=sorted(EXTRA_IMPORTS), default=sorted(EXTRA_IMPORTS))
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--output", help="Simpan laporan JSON ke file ini")
+    parser.add_argument("--compare", help="Laporan JSON sebelumnya untuk dibandingkan")
+    args = parser.parse_args()
+
+    base = app_imports()
+    report = {
+        "commit": git_commit(),
+        "started_at": datetime.now().isoformat(timespec="seconds"),
+        "python": sys.version.split()[0],
+        "repeat": args.repeat,
+        "paths": {},
+    }
+    for name in args.path:
+        report["paths"][name] = measure(base + EXTRA_IMPORTS[name], args.repeat)
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            report["compare_pct"] = compare(report, json.load(f))
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(output + "\n")
+    print(output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,322 @@
+"""Bandingkan backend storage (MySQL vs SQLite WAL) lewat repository yang sama.
+
+Setiap backend diisi data dummy yang sama lalu menjalankan operasi yang
+dipakai main.py dan chatbot_app.py langsung di `storage.py` (tanpa HTTP):
+insert batch, halaman list, filter tanggal, lookup telepon, statistik,
+reservasi slot, export penuh, soft delete, purge, arsip, dan campuran
+baca/tulis paralel di `--concurrency` thread.
+
+    python benchmarks/storage_backends.py --rows 100000 --output storage.json
+    python benchmarks/storage_backends.py --backend sqlite --rows 20000
+
+MySQL memakai database terpisah (default `cs_chatbot_bench`, dibuat dari
+schema.sql + migrasi lalu dihapus) di server dari `.env`; SQLite memakai file
+sementara. Untuk menguji seluruh stack, jalankan `load_test.py` terhadap
+backend FastAPI dengan `STORAGE_BACKEND=sqlite`.
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from load_test import git_commit, percentile  # noqa: E402
+from storage import CUSTOMER_COLUMNS, create_repository  # noqa: E402
+
+SEED_BATCH = 1000
+INSERT_BATCH = 100
+DELETE_BATCH = 100
+JOB_CHUNK = 1000
+BIG_CAPACITY = 10**6  # reservasi benchmark tidak boleh gagal karena slot penuh
+
+
+def make_values(rnd, i, history_days, phone_pool):
+    # Sebagian kecil booking ada di 30 hari ke depan, sisanya riwayat
+    offset = rnd.randrange(-history_days * 24, 30 * 24)
+    delivery = datetime.now().replace(minute=0, second=0, microsecond=0) + timedelta(hours=offset)
+    return (
+        f"Storage Customer {i}",
+        # ~1/3 nomor berulang seperti pelanggan langganan
+        f"+62812{rnd.randrange(phone_pool):08d}",
+        f"Jl. Storage No. {i}, Bandung",
+        delivery.strftime("%Y-%m-%d %H:%M"),
+    )
+
+
+def slot_of(values):
+    return datetime.strptime(values[3], "%Y-%m-%d %H:%M")
+
+
+def seed(repo, rows, history_days, rnd):
+    phone_pool = rows // 3 + 1
+    start = time.perf_counter()
+    for offset in range(0, rows, SEED_BATCH):
+        batch = []
+        for i in range(offset, min(offset + SEED_BATCH, rows)):
+            values = make_values(rnd, i, history_days, phone_pool)
+            batch.append((i, values, slot_of(values)))
+        repo.insert_customers(batch)
+    elapsed = time.perf_counter() - start
+    return {"seconds": round(elapsed, 2), "rows_per_second": round(rows / elapsed)}
+
+
+def summarize(latencies):
+    latencies.sort()
+    return {
+        "count": len(latencies),
+        "p50_ms": round(percentile(latencies, 50), 3),
+        "p95_ms": round(percentile(latencies, 95), 3),
+        "max_ms": round(latencies[-1], 3),
+    }
+
+
+def timed_runs(func, repeat):
+    latencies = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        latencies.append((time.perf_counter() - start) * 1000)
+    return summarize(latencies)
+
+
+def single_operations(repo, rnd, rows, history_days):
+    phone_pool = rows // 3 + 1
+    columns = list(CUSTOMER_COLUMNS)
+    counter = iter(range(rows, rows * 100))
+
+    def insert_batch():
+        batch = []
+        for _ in range(INSERT_BATCH):
+            values = make_values(rnd, next(counter), history_days, phone_pool)
+            batch.append((0, values, slot_of(values)))
+        repo.insert_customers(batch)
+
+    def customers_filtered():
+        start = datetime.now() - timedelta(days=rnd.randrange(history_days))
+        filters = {"delivery_from": start, "delivery_to": start + timedelta(days=7)}
+        repo.customers_page(columns, filters, None, 100)
+
+    def reserve():
+        slot = datetime.now().replace(minute=0, second=0, microsecond=0)
+        repo.reserve_slot(slot + timedelta(hours=rnd.randrange(24 * 30)), BIG_CAPACITY)
+
+    return {
+        "insert_batch": insert_batch,
+        "customers_page": lambda: repo.customers_page(columns, {}, None, 100),
+        "customers_deep_page": lambda: repo.customers_page(
+            columns, {}, rnd.randrange(rows // 2, rows), 100
+        ),
+        "customers_filtered": customers_filtered,
+        "customers_page_archived": lambda: repo.customers_page(
+            columns, {"include_archived": True}, None, 100
+        ),
+        "by_phone": lambda: repo.customer_by_phone([f"+62812{rnd.randrange(phone_pool):08d}"]),
+        "stats_summary": lambda: repo.customer_stats("summary"),
+        "stats_live": lambda: repo.customer_stats("live"),
+        "stats_archived": lambda: repo.customer_stats("summary", include_archived=True),
+        "reserve_slot": reserve,
+    }
+
+
+def export_all(repo, repeat):
+    """Waktu membaca seluruh baris aktif lewat iterator chunk (export/stream)"""
+    latencies = []
+    count = 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        count = sum(len(rows) for rows in repo.iter_customers(list(CUSTOMER_COLUMNS), {}))
+        latencies.append((time.perf_counter() - start) * 1000)
+    return {**summarize(latencies), "rows": count}
+
+
+def chunked_jobs(repo, rnd, repeat, after_days):
+    """Soft delete per chunk id, lalu purge dan arsip per chunk seperti job background"""
+    max_id = repo.max_customer_id()
+    latencies = []
+    for _ in range(repeat):
+        first = rnd.randrange(1, max(max_id - DELETE_BATCH, 2))
+        ids = list(range(first, first + DELETE_BATCH))
+        start = time.perf_counter()
+        repo.soft_delete_chunk(ids)
+        latencies.append((time.perf_counter() - start) * 1000)
+    report = {"soft_delete_chunk": summarize(latencies)}
+
+    for name, run in (
+        ("purge_chunk", lambda: repo.purge_deleted(datetime.now(), JOB_CHUNK)),
+        (
+            "archive_chunk",
+            lambda: repo.archive_chunk(datetime.now() - timedelta(days=after_days), JOB_CHUNK),
+        ),
+    ):
+        latencies = []
+        total = 0
+        while len(latencies) < repeat:
+            start = time.perf_counter()
+            processed = run()
+            latencies.append((time.perf_counter() - start) * 1000)
+            total += processed
+            if processed < JOB_CHUNK:
+                break
+        report[name] = {**summarize(latencies), "rows": total}
+    return report
+
+
+def concurrent_mix(repo, rnd, rows, history_days, concurrency, operations):
+    """Campuran 70% baca / 30% tulis dari banyak thread (kontensi penulis)"""
+    phone_pool = rows // 3 + 1
+    columns = list(CUSTOMER_COLUMNS)
+    lock = threading.Lock()
+    latencies = []
+    errors = 0
+    plan = [rnd.random() for _ in range(operations)]
+
+    def one(i):
+        nonlocal errors
+        local = random.Random(i)
+        start = time.perf_counter()
+        try:
+            if plan[i] < 0.4:
+                repo.customers_page(columns, {}, None, 100)
+            elif plan[i] < 0.7:
+                repo.customer_by_phone([f"+62812{local.randrange(phone_pool):08d}"])
+            elif plan[i] < 0.85:
+                slot = datetime.now().replace(minute=0, second=0, microsecond=0)
+                repo.reserve_slot(slot + timedelta(hours=local.randrange(24 * 30)), BIG_CAPACITY)
+            else:
+                values = make_values(local, rows * 200 + i, history_days, phone_pool)
+                repo.insert_customers([(0, values, slot_of(values))])
+        except Exception:
+            with lock:
+                errors += 1
+            return
+        elapsed = (time.perf_counter() - start) * 1000
+        with lock:
+            latencies.append(elapsed)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        list(executor.map(one, range(operations)))
+    elapsed = time.perf_counter() - start
+    return {
+        **summarize(latencies),
+        "concurrency": concurrency,
+        "errors": errors,
+        "ops_per_second": round(operations / elapsed, 1),
+    }
+
+
+def run_backend(repo, args):
+    rnd = random.Random(args.seed)
+    repo.open()
+    report = {"seed": seed(repo, args.rows, args.history_days, rnd)}
+    report["operations"] = {
+        name: timed_runs(func, args.repeat)
+        for name, func in single_operations(repo, rnd, args.rows, args.history_days).items()
+    }
+    report["operations"]["export_all"] = export_all(repo, 3)
+    report["operations"].update(chunked_jobs(repo, rnd, args.repeat, args.archive_after_days))
+    report["concurrent_mix"] = concurrent_mix(
+        repo, rnd, args.rows, args.history_days, args.concurrency, args.concurrent_ops
+    )
+    report["pool"] = repo.pool.stats()
+    return report
+
+
+def mysql_repository(args):
+    import mysql.connector
+
+    from db import DB_CONFIG
+    from migrate import apply_migrations
+    from schema_indexes import create_bench_database
+
+    conn = mysql.connector.connect(**{k: v for k, v in DB_CONFIG.items() if k != "database"})
+    create_bench_database(conn, args.database)
+    apply_migrations(conn)
+    conn.close()
+    return create_repository(
+        "mysql", config={**DB_CONFIG, "database": args.database}, size=args.concurrency
+    )
+
+
+def drop_mysql_database(database):
+    import mysql.connector
+
+    from db import DB_CONFIG
+
+    conn = mysql.connector.connect(**{k: v for k, v in DB_CONFIG.items() if k != "database"})
+    cursor = conn.cursor()
+    cursor.execute(f"DROP DATABASE IF EXISTS `{database}`")
+    cursor.close()
+    conn.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark backend storage MySQL vs SQLite")
+    parser.add_argument("--backend", nargs="+", choices=["mysql", "sqlite"], default=["mysql", "sqlite"])
+    parser.add_argument("--rows", type=int, default=100000)
+    parser.add_argument("--history-days", type=int, default=365)
+    parser.add_argument("--archive-after-days", type=int, default=90)
+    parser.add_argument("--repeat", type=int, default=50)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--concurrent-ops", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--database", default="cs_chatbot_bench", help="Database MySQL sementara")
+    parser.add_argument("--sqlite-path", help="File SQLite (default: file sementara)")
+    parser.add_argument("--keep", action="store_true", help="Jangan hapus database/file benchmark")
+    parser.add_argument("--output", help="Simpan laporan JSON ke file ini")
+    args = parser.parse_args()
+
+    report = {
+        "commit": git_commit(),
+        "started_at": datetime.now().isoformat(timespec="seconds"),
+        "rows": args.rows,
+        "repeat": args.repeat,
+        "backends": {},
+    }
+    for backend in args.backend:
+        if backend == "mysql":
+            repo = mysql_repository(args)
+            cleanup = lambda: drop_mysql_database(args.database)  # noqa: E731
+        else:
+            path = args.sqlite_path or os.path.join(tempfile.mkdtemp(), "storage_bench.sqlite3")
+            repo = create_repository("sqlite", path=path, size=args.concurrency)
+            cleanup = lambda: [  # noqa: E731
+                os.remove(path + suffix)
+                for suffix in ("", "-wal", "-shm")
+                if os.path.exists(path + suffix)
+            ]
+        try:
+            report["backends"][backend] = run_backend(repo, args)
+        finally:
+            repo.close()
+            if not args.keep:
+                cleanup()
+
+    if len(report["backends"]) == 2:
+        # > 1 berarti SQLite lebih cepat untuk operasi itu
+        mysql_ops = report["backends"]["mysql"]["operations"]
+        sqlite_ops = report["backends"]["sqlite"]["operations"]
+        report["sqlite_speedup_p50"] = {
+            name: round(mysql_ops[name]["p50_ms"] / sqlite_ops[name]["p50_ms"], 2)
+            for name in mysql_ops
+            if sqlite_ops[name]["p50_ms"]
+        }
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(output + "\n")
+    print(output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""Ukur skala throughput backend dari 1 sampai N worker (`serve.py`).
+
+Untuk setiap jumlah worker, skrip menjalankan `python serve.py --workers N`,
+menunggu `/ready`, menjalankan skenario dari `load_test.py`, lalu menghentikan
+server dengan SIGTERM (shutdown graceful):
+
+    python benchmarks/worker_scaling.py --workers 1 2 4 8 --concurrency 64 --requests 5000
+
+Database dan OpenAI mengikuti `.env` / env seperti saat menjalankan backend
+biasa; pakai MySQL lokal dan `fake_openai.py`.
+"""
+import argparse
+import json
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import requests
+
+ROOT = Path(__file__).resolve().parent.parent
+
+from load_test import SCENARIOS, run_scenario  # noqa: E402
+
+
+def wait_ready(base_url, timeout=60):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if requests.get(f"{base_url}/ready", timeout=2).status_code == 200:
+                return
+        except requests.exceptions.RequestException:
+            pass
+        time.sleep(0.5)
+    raise RuntimeError(f"Backend tidak siap dalam {timeout} detik")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark skala worker backend")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--port", type=int, default=8100)
+    parser.add_argument(
+        "--scenario", nargs="+", choices=sorted(SCENARIOS),
+        default=["customers_page", "save_customer"],
+    )
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--requests", type=int, default=3000)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    base_url = f"http://127.0.0.1:{args.port}"
+    results = {}
+    for workers in args.workers:
+        server = subprocess.Popen(
+            [sys.executable, "serve.py", "--workers", str(workers), "--port", str(args.port)],
+            cwd=ROOT,
+        )
+        try:
+            wait_ready(base_url)
+            results[workers] = {
+                name: run_scenario(
+                    name, base_url, args.concurrency, args.requests, 0, args.seed
+                )
+                for name in args.scenario
+            }
+        finally:
+            server.terminate()
+            server.wait(timeout=60)
+
+    baseline = results.get(args.workers[0], {})
+    report = {"concurrency": args.concurrency, "requests": args.requests, "workers": {}}
+    for workers, scenarios in results.items():
+        report["workers"][workers] = {
+            name: {
+                "throughput_rps": r["throughput_rps"],
+                "p95_ms": r["latency_ms"]["p95"],
+                "error_rate": r["error_rate"],
+                "speedup": round(r["throughput_rps"] / baseline[name]["throughput_rps"], 2)
+                if baseline.get(name, {}).get("throughput_rps")
+                else None,
+            }
+            for name, r in scenarios.items()
+        }
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
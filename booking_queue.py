@@ -0,0 +1,248 @@
+"""Antrean booking write-behind yang tahan restart (SQLite, mode WAL).
+
+`/save_customer/` cukup mencatat booking ke antrean lokal lalu membalas 202;
+`drain_forever` di background memindahkan isi antrean ke MySQL per batch.
+Pengiriman bersifat at-least-once: kalau proses mati setelah INSERT ke MySQL
+tetapi sebelum antrean ditandai selesai, batch itu akan dikirim ulang.
+"""
+import asyncio
+import json
+import logging
+import os
+import random
+import sqlite3
+import threading
+import time
+
+from fastapi.concurrency import run_in_threadpool
+from mysql.connector import Error
+
+QUEUE_PATH = os.getenv("BOOKING_QUEUE_PATH", "booking_queue.sqlite3")
+BATCH_SIZE = int(os.getenv("BOOKING_BATCH_SIZE", 200))
+MAX_ATTEMPTS = int(os.getenv("BOOKING_MAX_ATTEMPTS", 10))
+POLL_INTERVAL = 0.5  # detik saat antrean kosong
+CLAIM_TIMEOUT = 300  # klaim proses lain yang lebih lama dari ini dianggap mati
+DONE_RETENTION = 86400  # detik riwayat booking selesai disimpan untuk /bookings/{id}
+
+logger = logging.getLogger(__name__)
+
+
+class BookingQueue:
+    def __init__(self, path=QUEUE_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        # Booking sudah dijawab 202, jadi harus benar-benar tersimpan di disk
+        self._conn.execute("PRAGMA synchronous=FULL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS booking_queue (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                payload TEXT NOT NULL,
+                status TEXT NOT NULL DEFAULT 'pending',
+                attempts INTEGER NOT NULL DEFAULT 0,
+                last_error TEXT,
+                enqueued_at REAL NOT NULL,
+                available_at REAL NOT NULL,
+                claimed_at REAL,
+                processed_at REAL
+            )
+            """
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_booking_queue_status"
+            " ON booking_queue (status, available_at)"
+        )
+        self.drained = 0
+        self.last_batch_ms = None
+
+    def enqueue(self, payload):
+        now = time.time()
+        with self._lock:
+            cursor = self._conn.execute(
+                "INSERT INTO booking_queue (payload, enqueued_at, available_at)"
+                " VALUES (?, ?, ?)",
+                (json.dumps(payload, ensure_ascii=False), now, now),
+            )
+            return cursor.lastrowid
+
+    def claim(self, limit=BATCH_SIZE):
+        """Ambil sampai `limit` booking siap kirim dan tandai sedang diproses"""
+        now = time.time()
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                rows = self._conn.execute(
+                    """
+                    SELECT id, payload FROM booking_queue
+                    WHERE (status = 'pending' AND available_at <= ?)
+                       OR (status = 'processing' AND claimed_at < ?)
+                    ORDER BY id LIMIT ?
+                    """,
+                    (now, now - CLAIM_TIMEOUT, limit),
+                ).fetchall()
+                if rows:
+                    self._conn.executemany(
+                        "UPDATE booking_queue SET status = 'processing', claimed_at = ?,"
+                        " attempts = attempts + 1 WHERE id = ?",
+                        [(now, row[0]) for row in rows],
+                    )
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+        return [(row[0], json.loads(row[1])) for row in rows]
+
+    def mark_done(self, ids):
+        if not ids:
+            return
+        now = time.time()
+        with self._lock:
+            self._conn.executemany(
+                "UPDATE booking_queue SET status = 'done', processed_at = ?,"
+                " last_error = NULL WHERE id = ?",
+                [(now, i) for i in ids],
+            )
+            self.drained += len(ids)
+
+    def mark_failed(self, id_errors):
+        """Tandai booking yang ditolak MySQL (error data, tidak akan di-retry)"""
+        now = time.time()
+        with self._lock:
+            self._conn.executemany(
+                "UPDATE booking_queue SET status = 'failed', processed_at = ?,"
+                " last_error = ? WHERE id = ?",
+                [(now, error, i) for i, error in id_errors],
+            )
+
+    def retry_later(self, ids, error):
+        """Kembalikan batch ke antrean dengan backoff eksponensial ber-jitter.
+
+        Mengembalikan id booking yang sudah `MAX_ATTEMPTS` kali gagal dan kini
+        ditandai failed.
+        """
+        now = time.time()
+        given_up = []
+        with self._lock:
+            for booking_id in ids:
+                attempts = self._conn.execute(
+                    "SELECT attempts FROM booking_queue WHERE id = ?", (booking_id,)
+                ).fetchone()[0]
+                if attempts >= MAX_ATTEMPTS:
+                    self._conn.execute(
+                        "UPDATE booking_queue SET status = 'failed', processed_at = ?,"
+                        " last_error = ? WHERE id = ?",
+                        (now, error, booking_id),
+                    )
+                    given_up.append(booking_id)
+                    continue
+                delay = random.uniform(0, min(60, 2 ** attempts))
+                self._conn.execute(
+                    "UPDATE booking_queue SET status = 'pending', available_at = ?,"
+                    " last_error = ? WHERE id = ?",
+                    (now + delay, error, booking_id),
+                )
+        return given_up
+
+    def purge_done(self, older_than=DONE_RETENTION):
+        with self._lock:
+            self._conn.execute(
+                "DELETE FROM booking_queue WHERE status = 'done' AND processed_at < ?",
+                (time.time() - older_than,),
+            )
+
+    def status(self, booking_id):
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT id, status, attempts, last_error, enqueued_at, processed_at"
+                " FROM booking_queue WHERE id = ?",
+                (booking_id,),
+            ).fetchone()
+        if row is None:
+            return None
+        keys = ("id", "status", "attempts", "last_error", "enqueued_at", "processed_at")
+        return dict(zip(keys, row))
+
+    def stats(self):
+        now = time.time()
+        with self._lock:
+            counts = dict(
+                self._conn.execute(
+                    "SELECT status, COUNT(*) FROM booking_queue GROUP BY status"
+                ).fetchall()
+            )
+            oldest = self._conn.execute(
+                "SELECT MIN(enqueued_at) FROM booking_queue"
+                " WHERE status IN ('pending', 'processing')"
+            ).fetchone()[0]
+        return {
+            "pending": counts.get("pending", 0),
+            "processing": counts.get("processing", 0),
+            "failed": counts.get("failed", 0),
+            "done_retained": counts.get("done", 0),
+            "drained_total": self.drained,
+            "lag_seconds": round(now - oldest, 3) if oldest else 0.0,
+            "last_batch_ms": self.last_batch_ms,
+        }
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+async def drain_once(queue, insert_batch, to_record, on_given_up=None):
+    """Kirim satu batch ke MySQL. Mengembalikan jumlah booking yang diproses.
+
+    `insert_batch(batch)` menerima [(index, record)] dan mengembalikan
+    (jumlah tersimpan, error per index) seperti `_insert_customer_batch`.
+    `on_given_up(batch)` dipanggil untuk booking yang gagal `MAX_ATTEMPTS` kali,
+    mis. untuk mengembalikan kursi slot yang sudah dipesan.
+    """
+    claimed = await run_in_threadpool(queue.claim)
+    if not claimed:
+        return 0
+
+    start = time.perf_counter()
+    batch = [(booking_id, to_record(payload)) for booking_id, payload in claimed]
+    ids = [booking_id for booking_id, _ in claimed]
+    try:
+        _, errors = await run_in_threadpool(insert_batch, batch)
+    except Error as e:
+        # Koneksi/pool bermasalah: seluruh batch dicoba lagi nanti
+        logger.warning("Gagal mengirim %d booking ke MySQL: %s", len(ids), e)
+        given_up = await run_in_threadpool(queue.retry_later, ids, f"MySQL Error: {e}")
+        if given_up and on_given_up is not None:
+            given_up = set(given_up)
+            try:
+                await run_in_threadpool(
+                    on_given_up, [item for item in batch if item[0] in given_up]
+                )
+            except Error as e:
+                logger.error("Gagal membereskan %d booking yang gagal: %s", len(given_up), e)
+        return len(ids)
+
+    failed = {e["index"]: e["error"] for e in errors}
+    await run_in_threadpool(queue.mark_done, [i for i in ids if i not in failed])
+    if failed:
+        await run_in_threadpool(queue.mark_failed, list(failed.items()))
+    queue.last_batch_ms = round((time.perf_counter() - start) * 1000, 1)
+    return len(ids)
+
+
+async def drain_forever(queue, insert_batch, to_record, on_given_up=None):
+    """Loop worker background; berhenti saat task di-cancel (shutdown)"""
+    last_purge = 0.0
+    while True:
+        try:
+            processed = await drain_once(queue, insert_batch, to_record, on_given_up)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            logger.exception("Worker antrean booking error")
+            processed = 0
+        if not processed:
+            if time.time() - last_purge > 3600:
+                await run_in_threadpool(queue.purge_done)
+                last_purge = time.time()
+            await asyncio.sleep(POLL_INTERVAL)
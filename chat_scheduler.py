@@ -0,0 +1,218 @@
+"""Penjadwal panggilan LLM di backend: batas in-flight, antrean adil per sesi,
+retry dengan backoff ber-jitter, dan timeout per request (termasuk streaming).
+
+Setiap request mengambil satu dari `max_in_flight` slot. Kalau semua slot
+terpakai, request menunggu di antrean milik sesinya; slot yang dilepas
+diberikan bergiliran (round-robin) antar sesi, sehingga satu sesi yang
+mengirim banyak pertanyaan tidak membuat sesi lain kelaparan.
+"""
+import asyncio
+import random
+import time
+from collections import OrderedDict, deque
+from contextlib import asynccontextmanager
+
+
+class QueueFullError(Exception):
+    """Antrean penuh; request ditolak tanpa menunggu"""
+
+
+class Ticket:
+    """Info antrean satu request untuk dilaporkan ke klien"""
+
+    def __init__(self, session_id, queue_depth):
+        self.session_id = session_id
+        self.queue_depth = queue_depth
+        self.enqueued_at = time.perf_counter()
+        self.wait = 0.0
+        self.attempts = 0
+
+    def as_dict(self):
+        return {
+            "queue_depth": self.queue_depth,
+            "wait_ms": round(self.wait * 1000, 1),
+            "attempts": self.attempts,
+        }
+
+
+class ChatScheduler:
+    def __init__(self, max_in_flight=4, max_queue=100, timeout=30.0,
+                 max_retries=3, backoff_base=0.5, backoff_max=8.0, retry_on=()):
+        self.max_in_flight = max_in_flight
+        self.max_queue = max_queue
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.retry_on = tuple(retry_on)
+        self._queues = OrderedDict()  # session_id -> deque[Future]
+        self._in_flight = 0
+        self._queued = 0
+        self.completed = 0
+        self.rejected = 0
+        self.timeouts = 0
+        self.retries = 0
+        self.wait_total = 0.0
+
+    @asynccontextmanager
+    async def slot(self, session_id, timeout=None):
+        """Tahan satu slot selama blok `async with` berjalan"""
+        timeout = self.timeout if timeout is None else timeout
+        ticket = Ticket(session_id, self._queued)
+
+        if self._in_flight < self.max_in_flight and not self._queued:
+            self._in_flight += 1
+        else:
+            if self._queued >= self.max_queue:
+                self.rejected += 1
+                raise QueueFullError(f"Antrean AI penuh ({self._queued} request)")
+            waiter = asyncio.get_running_loop().create_future()
+            self._queues.setdefault(session_id, deque()).append(waiter)
+            self._queued += 1
+            try:
+                await asyncio.wait_for(waiter, timeout)
+            except asyncio.TimeoutError:
+                self._abandon(session_id, waiter)
+                self.timeouts += 1
+                raise
+            except BaseException:
+                self._abandon(session_id, waiter)
+                raise
+
+        ticket.wait = time.perf_counter() - ticket.enqueued_at
+        self.wait_total += ticket.wait
+        try:
+            yield ticket
+        finally:
+            self.completed += 1
+            self._release()
+
+    def _abandon(self, session_id, waiter):
+        if waiter.done() and not waiter.cancelled():
+            # Slot sudah diberikan tepat sebelum request ini dibatalkan
+            self._release()
+            return
+        queue = self._queues.get(session_id)
+        if queue is not None and waiter in queue:
+            queue.remove(waiter)
+            self._queued -= 1
+            if not queue:
+                del self._queues[session_id]
+
+    def _release(self):
+        while self._queues:
+            session_id, queue = next(iter(self._queues.items()))
+            waiter = queue.popleft()
+            self._queued -= 1
+            if queue:
+                self._queues.move_to_end(session_id)
+            else:
+                del self._queues[session_id]
+            if not waiter.done():
+                # Slot langsung berpindah tangan; jumlah in-flight tetap
+                waiter.set_result(None)
+                return
+        self._in_flight -= 1
+
+    def _backoff(self, attempt):
+        # "Full jitter": acak antara 0 dan batas eksponensial
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+
+    async def _retry(self, ticket, deadline):
+        """Tunggu backoff sebelum percobaan berikutnya; False kalau harus menyerah"""
+        if ticket.attempts > self.max_retries:
+            return False
+        delay = self._backoff(ticket.attempts - 1)
+        if time.perf_counter() + delay >= deadline:
+            return False
+        self.retries += 1
+        await asyncio.sleep(delay)
+        return True
+
+    async def run(self, session_id, call, timeout=None):
+        """Jalankan `await call()` di dalam slot dengan retry dan timeout total.
+
+        Mengembalikan (hasil, ticket).
+        """
+        timeout = self.timeout if timeout is None else timeout
+        deadline = time.perf_counter() + timeout
+        async with self.slot(session_id, timeout) as ticket:
+            while True:
+                ticket.attempts += 1
+                remaining = deadline - time.perf_counter()
+                try:
+                    result = await asyncio.wait_for(call(), remaining)
+                    return result, ticket
+                except asyncio.TimeoutError:
+                    self.timeouts += 1
+                    raise
+                except self.retry_on:
+                    if not await self._retry(ticket, deadline):
+                        raise
+
+    async def stream(self, ticket, start, deadline):
+        """Async generator item dari `start()` (dijalankan di dalam `slot()`).
+
+        Sampai item pertama tiba, error `retry_on` di-retry dengan backoff
+        seperti `run()` dengan membuat stream baru; setelah itu item diteruskan
+        apa adanya. Seluruhnya dibatasi `deadline` (`time.perf_counter`).
+        """
+        while True:
+            ticket.attempts += 1
+            items = start()
+            try:
+                first = await asyncio.wait_for(
+                    items.__anext__(), deadline - time.perf_counter()
+                )
+                break
+            except StopAsyncIteration:
+                return
+            except asyncio.TimeoutError:
+                self.timeouts += 1
+                await items.aclose()
+                raise
+            except self.retry_on:
+                await items.aclose()
+                if not await self._retry(ticket, deadline):
+                    raise
+        try:
+            yield first
+            async for item in self.iterate(items, deadline):
+                yield item
+        finally:
+            await items.aclose()
+
+    async def iterate(self, items, deadline):
+        """Teruskan item dari async iterator `items` sampai `deadline`
+        (`time.perf_counter`) lewat; batasnya untuk seluruh stream, bukan per item.
+
+        Dipakai di dalam `slot()` supaya upstream yang macet tidak menahan slot.
+        """
+        try:
+            while True:
+                remaining = deadline - time.perf_counter()
+                try:
+                    item = await asyncio.wait_for(items.__anext__(), remaining)
+                except StopAsyncIteration:
+                    return
+                except asyncio.TimeoutError:
+                    self.timeouts += 1
+                    raise
+                yield item
+        finally:
+            await items.aclose()
+
+    def stats(self):
+        return {
+            "max_in_flight": self.max_in_flight,
+            "in_flight": self._in_flight,
+            "queued": self._queued,
+            "sessions_waiting": len(self._queues),
+            "completed": self.completed,
+            "rejected": self.rejected,
+            "timeouts": self.timeouts,
+            "retries": self.retries,
+            "wait_avg_ms": round(self.wait_total / self.completed * 1000, 1)
+            if self.completed
+            else 0.0,
+        }
@@ -1,37 +1,53 @@
 import streamlit as st
 import requests
-from datetime import datetime
-import re
-import openai
-from openai import OpenAI
 import os
+import time
+import uuid
+from urllib.parse import quote, urlencode
 from dotenv import load_dotenv
-import pandas as pd
-import mysql.connector
-from mysql.connector import Error
+
+# pandas, openai, mysql.connector dan numpy (faq) sengaja diimpor di dalam
+# fungsi/blok yang memakainya: sesi user biasa tidak perlu memuatnya sama sekali
+# (ukur dengan `python benchmarks/startup_time.py`).
+from ai_cache import cache_key, create_ai_cache
+from api_client import BackendClient
+from context_builder import build_context_messages
+from llm import AI_MODEL, iter_sse_events, stream_complete
+from metrics import export_to_file, record_stage, timed
+from parsing import extract_date, extract_phone, phone_variants
+from session_store import create_session_store, trim_messages
 
 load_dotenv()
 
 # CONFIG
 st.set_page_config(page_title="💬 Chatbot Customer Service")
-
-API_URL = "http://127.0.0.1:8000/save_customer/"
-GET_ALL_URL = "http://127.0.0.1:8000/customers/"
-
-# MySQL Config
-DB_CONFIG = {
-    "host": os.getenv("DB_HOST"),
-    "user": os.getenv("DB_USER"),
-    "password": os.getenv("DB_PASSWORD"),
-    "database": os.getenv("DB_NAME"),
-    "port": int(os.getenv("DB_PORT", 3306)),
-}
-
-client = OpenAI()
+RENDER_START = time.perf_counter()
+
+# Metrik frontend (durasi tahap, backend, OpenAI) ditulis ke file format Prometheus
+export_to_file(os.getenv("METRICS_FILE", "streamlit_metrics.prom"))
+
+# Path endpoint backend; base URL & timeout diatur lewat env (lihat api_client.py)
+SAVE_CUSTOMER_PATH = "/save_customer/"
+CUSTOMERS_PATH = "/customers/"
+CUSTOMERS_EXPORT_PATH = "/customers/export"
+CUSTOMER_BY_PHONE_PATH = "/customers/by_phone/"
+DELETE_CUSTOMERS_PATH = "/customers/delete"
+PURGE_STATS_PATH = "/customers/purge"
+ARCHIVE_STATS_PATH = "/customers/archive"
+STATS_PATH = "/stats"
+CHAT_STREAM_PATH = "/chat/stream"
+AI_TIMEOUT = 60  # detik, termasuk waktu antre di backend
 
 # Admin credentials
 ADMIN_PASSWORD = "admin123"
 
+# Admin dashboard
+CUSTOMER_CACHE_TTL = 60  # detik
+ADMIN_PAGE_SIZE = 50
+DELETE_CHUNK_SIZE = 1000  # baris per transaksi saat soft delete langsung ke DB
+DELETE_TIMEOUT = 300  # detik; hapus semua data berjalan per chunk di backend
+DB_POOL_SIZE = 2  # koneksi langsung per proses Streamlit (fallback dan dashboard)
+
 # STATE
 if "authenticated" not in st.session_state:
     st.session_state.authenticated = False
@@ -59,64 +75,191 @@ if "step" not in st.session_state:
 if "show_post_submit_options" not in st.session_state:
     st.session_state.show_post_submit_options = False
 
+# Sesi chat disimpan di session store (SESSION_STORE_BACKEND) dengan kunci `?sid=`
+# di URL, jadi reconnect atau pindah replika Streamlit tidak menghapus percakapan.
+# Role admin sengaja tidak dipulihkan: admin harus login ulang.
+SESSION_FIELDS = (
+    "mode",
+    "step",
+    "user_data",
+    "messages",
+    "show_post_submit_options",
+    "known_customer",
+)
+
+
+@st.cache_resource
+def get_session_store():
+    """Session store bersama untuk semua sesi di proses ini"""
+    return create_session_store()
+
+
+def current_session_id():
+    sid = st.query_params.get("sid", "")
+    if len(sid) != 32 or any(c not in "0123456789abcdef" for c in sid):
+        sid = uuid.uuid4().hex
+        st.query_params["sid"] = sid
+    return sid
+
+
+def restore_session(sid):
+    """Muat state dari store sekali per sesi Streamlit (rerun berikutnya dari memori)"""
+    saved = get_session_store().load(sid)
+    if saved:
+        for field in SESSION_FIELDS:
+            if field in saved:
+                st.session_state[field] = saved[field]
+        if saved.get("role") == "user":
+            st.session_state.authenticated = True
+            st.session_state.role = "user"
+    st.session_state.hydrated_sid = sid
+
+
+def persist_session():
+    """Simpan state ke store; tidak menulis apa-apa kalau tidak ada perubahan"""
+    st.session_state.messages = trim_messages(st.session_state.messages)
+    state = {field: st.session_state.get(field) for field in SESSION_FIELDS}
+    state["role"] = "user" if st.session_state.role == "user" else None
+    get_session_store().save(st.session_state.session_id, state)
+
+
+st.session_state.session_id = current_session_id()
+if st.session_state.get("hydrated_sid") != st.session_state.session_id:
+    restore_session(st.session_state.session_id)
+# Rerun yang berakhir lewat st.rerun() tidak sampai ke akhir skrip, jadi
+# perubahannya disimpan di awal rerun berikutnya
+persist_session()
+
 
 # UTILS
-def extract_phone(text):
-    match = re.search(r"(\+?\d{8,15})", text)
-    return match.group(1) if match else None
-
-
-def extract_date(text):
-    pattern = r"(\d{1,2}) (\w+) (\d{4})(?: (?:jam )?(\d{1,2})[.:](\d{2}))?"
-    match = re.search(pattern, text.lower())
-    if match:
-        day, month_name, year, hour, minute = match.groups()
-        months = {
-            "januari": 1,
-            "februari": 2,
-            "maret": 3,
-            "april": 4,
-            "mei": 5,
-            "juni": 6,
-            "juli": 7,
-            "agustus": 8,
-            "september": 9,
-            "oktober": 10,
-            "november": 11,
-            "desember": 12,
-        }
-        month = months.get(month_name, 0)
-        hour = int(hour) if hour else 10
-        minute = int(minute) if minute else 0
-        try:
-            return datetime(int(year), month, int(day), hour, minute).strftime(
-                "%Y-%m-%d %H:%M"
-            )
-        except ValueError:
-            return None
+@st.cache_resource
+def get_ai_cache():
+    """Cache jawaban AI bersama untuk semua sesi (backend dari AI_CACHE_BACKEND)"""
+    return create_ai_cache()
+
+
+@st.cache_resource
+def get_backend():
+    """Klien HTTP ke backend (keep-alive + circuit breaker) dipakai semua sesi"""
+    return BackendClient()
+
+
+@st.cache_resource
+def get_openai_client():
+    """Klien OpenAI untuk fallback saat backend mati, dibuat sekali per proses"""
+    from openai import OpenAI
+
+    return OpenAI()
+
+
+@st.cache_resource
+def get_repository():
+    """Repository database untuk akses langsung (fallback dan dashboard admin).
+
+    Backend mengikuti `STORAGE_BACKEND` seperti backend FastAPI; pool kecil
+    dipakai bersama semua sesi di proses ini.
+    """
+    from storage import create_repository
+
+    return create_repository(size=DB_POOL_SIZE)
+
+
+@st.cache_resource
+def get_faq_index():
+    """Index FAQ lokal (memory-mapped) dipakai semua sesi; None kalau faq.json tidak ada"""
+    from faq import load_faq_index
+
     try:
-        return datetime.strptime(text.strip(), "%Y-%m-%d %H:%M").strftime(
-            "%Y-%m-%d %H:%M"
-        )
-    except:
+        return load_faq_index()
+    except (OSError, ValueError, KeyError):
         return None
 
 
-def ai_assist(prompt, context="customer support"):
+def faq_answer(prompt):
+    """Jawaban FAQ lokal untuk pertanyaan umum, atau None supaya diteruskan ke AI"""
+    index = get_faq_index()
+    return index.answer(prompt) if index is not None else None
+
+
+def ai_context(prompt, context, history=None, booking=None):
+    """Pesan untuk model + kunci cache yang ikut memperhitungkan isi konteks"""
+    messages = build_context_messages(prompt, context, history or (), booking)
+    # Jawaban bergantung pada riwayat dan data pesanan, jadi keduanya ikut
+    # menentukan kunci cache (pertanyaan pertama tanpa konteks tetap berbagi cache)
+    context_text = "\n".join(m["content"] for m in messages[:-1])
+    return messages, cache_key(prompt, context_text, AI_MODEL)
+
+
+def ai_payload(prompt, context, history=None, booking=None):
+    return {
+        "prompt": prompt,
+        "context": context,
+        "history": list(history or []),
+        "booking": booking,
+        "session_id": st.session_state.session_id,
+    }
+
+
+def ai_backend_error(response):
     try:
-        response = client.chat.completions.create(
-            model="gpt-4o-mini",
-            messages=[
-                {
-                    "role": "system",
-                    "content": f"Kamu adalah asisten {context}. Balas singkat dan jelas.",
-                },
-                {"role": "user", "content": prompt},
-            ],
-        )
-        return response.choices[0].message.content
+        detail = response.json().get("detail")
+    except ValueError:
+        detail = response.text
+    return RuntimeError(f"{response.status_code} {detail}")
+
+
+def ai_stream_from_backend(payload):
+    backend = get_backend()
+    with backend.post(
+        CHAT_STREAM_PATH, json=payload, stream=True,
+        timeout=(backend.timeout[0], AI_TIMEOUT),
+    ) as response:
+        if response.status_code != 200:
+            raise ai_backend_error(response)
+        for event, data in iter_sse_events(response.iter_lines(decode_unicode=True)):
+            if event == "error":
+                raise RuntimeError(data["error"])
+            if event == "message":
+                yield data["delta"]
+
+
+def ai_assist_stream(prompt, context="customer support", history=None, booking=None):
+    """Jawaban AI lewat backend `/chat/stream` sebagai potongan untuk `st.write_stream`;
+    OpenAI dipanggil langsung kalau backend mati.
+
+    Jawaban dari cache langsung dikirim utuh. Pertanyaan identik yang datang
+    bersamaan hanya di-stream sekali; sesi lain menunggu lalu menerima jawaban
+    utuh yang sama (lihat `AICache.stream_or_compute`).
+    """
+    messages, key = ai_context(prompt, context, history, booking)
+
+    def answer():
+        try:
+            stream = ai_stream_from_backend(ai_payload(prompt, context, history, booking))
+            first = next(stream, None)
+        except requests.exceptions.ConnectionError:
+            get_backend().record_fallback("chat_stream")
+            stream = stream_complete(get_openai_client(), prompt, context, messages=messages)
+            first = next(stream, None)
+        if first is not None:
+            yield first
+        yield from stream
+
+    try:
+        yield from get_ai_cache().stream_or_compute(key, answer)
     except Exception as e:
-        return f"(AI Error: {e})"
+        yield f"(AI Error: {e})"
+
+
+def slot_full_message(response):
+    """Pesan untuk 409 (slot penuh) berikut saran jadwal lain dari backend"""
+    detail = response.json().get("detail") or {}
+    lines = [detail.get("message", "❌ Slot pengiriman sudah penuh.")]
+    alternatives = detail.get("alternatives") or []
+    if alternatives:
+        lines.append("\nSlot terdekat yang masih tersedia:")
+        lines += [f"- {a['start']} WIB (sisa {a['available']})" for a in alternatives]
+    return "\n".join(lines)
 
 
 def reset_to_main_menu():
@@ -130,6 +273,7 @@ def reset_to_main_menu():
         "delivery_date": None,
     }
     st.session_state.show_post_submit_options = False
+    st.session_state.known_customer = None
 
 
 def logout():
@@ -138,65 +282,144 @@ def logout():
     reset_to_main_menu()
 
 
-def get_customers_from_db():
-    """Ambil data customer langsung dari MySQL database"""
-    conn = None
+def get_customer_by_phone_from_db(phone):
+    """Data terakhir customer dengan nomor ini langsung dari database"""
+    from mysql.connector import Error
+
     try:
-        conn = mysql.connector.connect(**DB_CONFIG)
-        cursor = conn.cursor(dictionary=True)
-        cursor.execute("SELECT * FROM customers ORDER BY id DESC")
-        rows = cursor.fetchall()
-        return rows
-    except Error as err:
-        st.error(f"❌ Database Error: {err}")
-        return []
-    finally:
-        if conn and conn.is_connected():
-            cursor.close()
-            conn.close()
+        # Arsip hanya dibaca kalau nomor ini tidak punya booking aktif
+        return get_repository().customer_by_phone(phone_variants(phone))
+    except Error:
+        # Isi otomatis hanya pelengkap; chat tetap jalan tanpa data lama
+        return None
 
 
-def get_all_customers():
-    """Fallback: coba API dulu, kalau gagal pakai database langsung"""
+@timed("customer_lookup")
+def find_customer_by_phone(phone):
+    """Customer lama untuk isi otomatis chat: API (ber-cache) dulu, fallback DB"""
     try:
-        response = requests.get(GET_ALL_URL, timeout=5)
+        response = get_backend().get(CUSTOMER_BY_PHONE_PATH + quote(phone, safe=""))
         if response.status_code == 200:
             return response.json()
-        else:
-            return get_customers_from_db()
-    except:
-        return get_customers_from_db()
+        if response.status_code == 404:
+            return None
+    except requests.exceptions.RequestException:
+        pass
+    get_backend().record_fallback("customer_lookup")
+    return get_customer_by_phone_from_db(phone)
+
+
+@timed("customers_page_db")
+def get_customers_page_from_db(cursor, limit, include_archived=False):
+    """Ambil satu halaman customer (keyset pada id) langsung dari database"""
+    from storage import CUSTOMER_COLUMNS
+
+    rows = get_repository().customers_page(
+        CUSTOMER_COLUMNS, {"include_archived": include_archived}, cursor, limit
+    )
+    next_cursor = rows[-1]["id"] if len(rows) == limit else None
+    return rows, next_cursor
+
+
+@st.cache_data(ttl=CUSTOMER_CACHE_TTL, show_spinner=False)
+@timed("customers_page")
+def get_customers_page(cursor=None, limit=ADMIN_PAGE_SIZE, include_archived=False):
+    """Satu halaman customer dari API, fallback ke database langsung.
+
+    Hasil di-cache antar rerun; panggil `invalidate_customer_cache()` setelah
+    data customer ditambah atau dihapus.
+    """
+    params = {"limit": limit, "include_archived": str(include_archived).lower()}
+    if cursor is not None:
+        params["cursor"] = cursor
+    try:
+        response = get_backend().get(CUSTOMERS_PATH, params=params)
+        if response.status_code == 200:
+            next_cursor = response.headers.get("X-Next-Cursor")
+            return response.json(), int(next_cursor) if next_cursor else None
+    except requests.exceptions.RequestException:
+        pass
+    get_backend().record_fallback("customers_page")
+    return get_customers_page_from_db(cursor, limit, include_archived)
+
+
+@st.cache_data(ttl=CUSTOMER_CACHE_TTL, show_spinner=False)
+@timed("customer_stats")
+def fetch_customer_stats(include_archived=False):
+    response = get_backend().get(
+        STATS_PATH, params={"include_archived": str(include_archived).lower()}
+    )
+    response.raise_for_status()
+    return response.json()
+
+
+def get_customer_stats(include_archived=False):
+    """Ambil statistik agregat dari API (hanya hasil ringkas, bukan seluruh tabel)"""
+    try:
+        return fetch_customer_stats(include_archived)
+    except requests.exceptions.HTTPError as e:
+        st.error(f"❌ Gagal mengambil statistik. Status: {e.response.status_code}")
+    except requests.exceptions.RequestException as e:
+        st.error(f"❌ Gagal menghubungi server: {e}")
+    return None
+
+
+def invalidate_customer_cache():
+    """Buang cache halaman customer dan statistik setelah data berubah"""
+    get_customers_page.clear()
+    fetch_customer_stats.clear()
 
 
-def delete_customer_by_id(customer_id):
-    """Hapus 1 data customer berdasarkan ID"""
+def soft_delete_from_db(customer_ids=None):
+    """Fallback tanpa backend: tandai `deleted_at` per chunk (purge tetap oleh backend)"""
+    from mysql.connector import Error
+    from customer_purge import soft_delete_all, soft_delete_ids
+
     try:
-        conn = mysql.connector.connect(**DB_CONFIG)
-        cursor = conn.cursor()
-        cursor.execute("DELETE FROM customers WHERE id = %s", (customer_id,))
-        conn.commit()
-        st.success(f"✅ Data dengan ID {customer_id} berhasil dihapus.")
+        if customer_ids is None:
+            # Booking yang masuk selama penghapusan (id lebih besar) tidak ikut
+            return soft_delete_all(get_repository(), DELETE_CHUNK_SIZE)
+        return len(soft_delete_ids(get_repository(), customer_ids, DELETE_CHUNK_SIZE))
     except Error as err:
-        st.error(f"❌ Gagal menghapus data ID {customer_id}: {err}")
-    finally:
-        if conn and conn.is_connected():
-            cursor.close()
-            conn.close()
+        st.error(f"❌ Gagal menghapus data: {err}")
+        return None
+
+
+@timed("delete_customers")
+def delete_customers(customer_ids=None):
+    """Soft delete lewat backend `/customers/delete` (semua data kalau `customer_ids`
+    None); baris dihapus fisik oleh job purge backend.
+
+    Mengembalikan jumlah baris yang dihapus, atau None kalau gagal.
+    """
+    body = {"all": True} if customer_ids is None else {"ids": list(customer_ids)}
+    try:
+        response = get_backend().post(
+            DELETE_CUSTOMERS_PATH, json=body,
+            timeout=(get_backend().timeout[0], DELETE_TIMEOUT),
+        )
+        if response.status_code == 200:
+            deleted = response.json()["deleted"]
+        else:
+            st.error(f"❌ Gagal menghapus data. Status: {response.status_code}")
+            return None
+    except requests.exceptions.RequestException:
+        get_backend().record_fallback("delete_customers")
+        deleted = soft_delete_from_db(customer_ids)
+    invalidate_customer_cache()
+    return deleted
+
+
+def delete_customers_by_ids(customer_ids):
+    """Hapus beberapa customer sekaligus"""
+    if not customer_ids:
+        return 0
+    return delete_customers(customer_ids) or 0
 
 
 def delete_all_customers():
     """Hapus semua data di tabel customers"""
-    try:
-        conn = mysql.connector.connect(**DB_CONFIG)
-        cursor = conn.cursor()
-        cursor.execute("DELETE FROM customers")
-        conn.commit()
-        cursor.close()
-        conn.close()
-        return True
-    except Error as err:
-        st.error(f"❌ Gagal menghapus semua data: {err}")
-        return False
+    return delete_customers() is not None
 
 
 if not st.session_state.authenticated:
@@ -248,7 +471,15 @@ st.markdown("---")
 
 
 if st.session_state.role == "admin":
+    import pandas as pd
+    from mysql.connector import Error
+
     st.subheader("📊 Admin Dashboard")
+    include_archived = st.checkbox(
+        "🗄️ Sertakan data arsip",
+        key="include_archived",
+        help="Booking yang pengirimannya sudah lama lewat dipindahkan ke arsip (hanya baca)",
+    )
 
     tab1, tab2 = st.tabs(["📋 Database Customer", "📈 Statistik"])
 
@@ -259,6 +490,7 @@ if st.session_state.role == "admin":
 
         with col1:
             if st.button("🔄 Refresh Data"):
+                invalidate_customer_cache()
                 st.rerun()
 
         with col2:
@@ -279,6 +511,7 @@ if st.session_state.role == "admin":
                     if st.button("✅ YA, Hapus Semua Data"):
                         if delete_all_customers():
                             st.session_state.confirm_delete_all = False
+                            st.session_state.customer_page_cursors = [None]
                             st.success("🧹 Semua data berhasil dihapus!")
                             st.rerun()
                 with col_confirm2:
@@ -286,38 +519,83 @@ if st.session_state.role == "admin":
                         st.session_state.confirm_delete_all = False
                         st.rerun()
 
-        with st.spinner("Mengambil data dari database..."):
-            customers = get_customers_from_db()
+        if "customer_page_cursors" not in st.session_state:
+            st.session_state.customer_page_cursors = [None]
+
+        page_cursors = st.session_state.customer_page_cursors
+        try:
+            with st.spinner("Mengambil data dari database..."):
+                customers, next_cursor = get_customers_page(
+                    page_cursors[-1], include_archived=include_archived
+                )
+        except Error as err:
+            st.error(f"❌ Database Error: {err}")
+            customers, next_cursor = [], None
 
         if customers:
             df = pd.DataFrame(customers)
-            st.success(f"✅ Data berhasil diambil dari MySQL Database")
-
-            st.write(f"Total data: **{len(df)}** customer")
-
-            for i, row in df.iterrows():
-                col1, col2, col3, col4 = st.columns([1, 2, 3, 1])
-                with col1:
-                    st.write(f"**ID:** {row['id']}")
-                with col2:
-                    st.write(row["name"])
-                with col3:
-                    st.write(row["phone"])
-                with col4:
-                    if st.button("🗑 Delete", key=f"delete_{row['id']}"):
-                        delete_customer_by_id(row["id"])
+            stats = get_customer_stats(include_archived)
+            if stats:
+                st.write(f"Total data: **{stats['total_customers']}** customer")
+            st.caption(
+                f"Halaman {len(page_cursors)} · {len(df)} baris · pilih baris untuk dihapus"
+            )
+
+            selection = st.dataframe(
+                df,
+                hide_index=True,
+                on_select="rerun",
+                selection_mode="multi-row",
+                key=f"customer_table_{len(page_cursors)}",
+            )
+            selected_ids = [int(df.iloc[i]["id"]) for i in selection.selection.rows]
+
+            col1, col2, col3 = st.columns([2, 1, 1])
+            with col1:
+                if st.button(
+                    f"🗑 Hapus {len(selected_ids)} data terpilih",
+                    disabled=not selected_ids,
+                ):
+                    deleted = delete_customers_by_ids(selected_ids)
+                    if deleted:
+                        st.success(f"✅ {deleted} data berhasil dihapus.")
                         st.rerun()
+            with col2:
+                if st.button("⬅️ Sebelumnya", disabled=len(page_cursors) == 1):
+                    page_cursors.pop()
+                    st.rerun()
+            with col3:
+                if st.button("Berikutnya ➡️", disabled=next_cursor is None):
+                    page_cursors.append(next_cursor)
+                    st.rerun()
 
-            # === Tombol download CSV ===
+            # === Export data (dialirkan oleh backend, bukan dibangun di sini) ===
             st.markdown("---")
-            csv = df.to_csv(index=False).encode("utf-8")
-            st.download_button(
-                label="📥 Download Data (CSV)",
-                data=csv,
-                file_name=f'customers_{datetime.now().strftime("%Y%m%d_%H%M%S")}.csv',
-                mime="text/csv",
+            col1, col2 = st.columns(2)
+            with col1:
+                export_format = st.selectbox(
+                    "Format export", ["csv", "parquet", "ndjson"], key="export_format"
+                )
+            with col2:
+                export_gzip = st.checkbox("Kompres (gzip)", key="export_gzip")
+            export_query = urlencode(
+                {
+                    "format": export_format,
+                    "gzip": str(export_gzip).lower(),
+                    "include_archived": str(include_archived).lower(),
+                }
+            )
+            st.link_button(
+                "📥 Download Semua Data",
+                get_backend().url(f"{CUSTOMERS_EXPORT_PATH}?{export_query}"),
             )
 
+        elif len(page_cursors) > 1:
+            st.info("Tidak ada data lagi di halaman ini.")
+            if st.button("⬅️ Kembali ke halaman pertama"):
+                st.session_state.customer_page_cursors = [None]
+                st.rerun()
+
         else:
             st.warning(
                 "⚠️ Belum ada data customer atau gagal mengambil data dari database."
@@ -327,41 +605,60 @@ if st.session_state.role == "admin":
     with tab2:
         st.write("### Statistik Customer")
 
-        if customers:
-            df = pd.DataFrame(customers)
+        stats = get_customer_stats(include_archived)
 
+        if stats and stats["total_customers"]:
             col1, col2, col3 = st.columns(3)
 
             with col1:
-                st.metric("Total Customer", len(customers))
+                st.metric("Total Customer", stats["total_customers"])
 
             with col2:
-                if "delivery_date" in df.columns:
-                    today = datetime.now().date()
-                    df["delivery_date_parsed"] = pd.to_datetime(
-                        df["delivery_date"], errors="coerce"
-                    )
-                    upcoming = len(df[df["delivery_date_parsed"].dt.date >= today])
-                    st.metric("Pengiriman Mendatang", upcoming)
-                else:
-                    st.metric("Pengiriman Mendatang", "-")
+                st.metric("Pengiriman Mendatang", stats["upcoming_deliveries"])
 
             with col3:
-                if "phone" in df.columns:
-                    unique_phones = df["phone"].nunique()
-                    st.metric("Nomor Unik", unique_phones)
-                else:
-                    st.metric("Nomor Unik", "-")
+                st.metric("Nomor Unik", stats["unique_phones"])
 
-            if "delivery_date" in df.columns:
+            if stats["monthly"]:
                 st.markdown("---")
                 st.write("#### 📅 Pengiriman per Bulan")
-                df["month"] = df["delivery_date_parsed"].dt.to_period("M").astype(str)
-                monthly_count = df.groupby("month").size().reset_index(name="count")
+                monthly_count = pd.DataFrame(stats["monthly"])
                 st.bar_chart(monthly_count.set_index("month"))
         else:
             st.info("Belum ada data untuk ditampilkan")
 
+        with st.expander("🤖 Cache Jawaban AI"):
+            st.json(get_ai_cache().stats())
+
+        with st.expander("🌐 Koneksi Backend"):
+            st.json(get_backend().stats())
+
+        with st.expander("🗄️ Arsip Booking Lama"):
+            try:
+                response = get_backend().get(ARCHIVE_STATS_PATH)
+                response.raise_for_status()
+                st.json(response.json())
+            except requests.exceptions.RequestException as e:
+                st.error(f"❌ Gagal mengambil progres arsip: {e}")
+
+        with st.expander("🧹 Purge Data Terhapus"):
+            try:
+                response = get_backend().get(PURGE_STATS_PATH)
+                response.raise_for_status()
+                st.json(response.json())
+            except requests.exceptions.RequestException as e:
+                st.error(f"❌ Gagal mengambil progres purge: {e}")
+
+        with st.expander("📚 FAQ Lokal"):
+            faq_index = get_faq_index()
+            if faq_index is None:
+                st.info("Index FAQ tidak aktif (faq.json tidak ditemukan)")
+            else:
+                st.json(faq_index.stats())
+
+        with st.expander("💾 Session Store"):
+            st.json(get_session_store().stats())
+
 
 if st.session_state.role == "user":
     if st.session_state.mode not in ["form", "chat"]:
@@ -375,7 +672,7 @@ if st.session_state.role == "user":
         with col2:
             if st.button("💭 Ngobrol dengan Asisten"):
                 st.session_state.mode = "chat"
-                st.session_state.step = "name"
+                st.session_state.step = "phone"
                 st.rerun()
 
     if st.session_state.mode == "form":
@@ -435,10 +732,13 @@ if st.session_state.role == "user":
                         }
 
                         try:
-                            response = requests.post(API_URL, json=user_data, timeout=5)
-                            if response.status_code == 200:
+                            response = get_backend().post(SAVE_CUSTOMER_PATH, json=user_data)
+                            if response.status_code in (200, 202):
+                                invalidate_customer_cache()
                                 st.session_state.show_post_submit_options = True
                                 st.rerun()
+                            elif response.status_code == 409:
+                                st.warning(slot_full_message(response))
                             else:
                                 st.error(
                                     f"⚠️ Gagal menyimpan data. Status: {response.status_code}"
@@ -453,31 +753,56 @@ if st.session_state.role == "user":
         step = st.session_state.step
         user_data = st.session_state.user_data
 
-        if step == "name" and len(st.session_state.messages) == 0:
+        if step == "phone" and len(st.session_state.messages) == 0:
             st.session_state.messages.append(
-                {"role": "assistant", "content": "Siapa nama kamu?"}
+                {"role": "assistant", "content": "Halo! Nomor telepon yang bisa kami hubungi berapa ya?"}
             )
             st.rerun()
 
         if prompt := st.chat_input("Ketik di sini..."):
             st.session_state.messages.append({"role": "user", "content": prompt})
 
-            if step == "name":
-                user_data["name"] = prompt.strip()
-                reply = f"Baik, {user_data['name']}. Nomor telepon yang bisa kami hubungi berapa ya?"
-                st.session_state.step = "phone"
-
-            elif step == "phone":
+            if step == "phone":
                 phone = extract_phone(prompt)
                 if phone:
                     user_data["phone"] = phone
-                    reply = (
-                        "Terima kasih! Sekarang mohon alamat lengkap tujuan pengiriman."
-                    )
-                    st.session_state.step = "address"
+                    # Customer lama: nama dan alamat diisi otomatis, cukup satu konfirmasi
+                    known = find_customer_by_phone(phone)
+                    if known and known.get("name") and known.get("address"):
+                        st.session_state.known_customer = {
+                            "name": known["name"],
+                            "address": known["address"],
+                        }
+                        reply = (
+                            f"Selamat datang kembali, {known['name']}! Alamat pengiriman terakhir kamu:\n\n"
+                            f"{known['address']}\n\n"
+                            "Ketik **ya** untuk memakai nama dan alamat ini, atau **tidak** untuk mengisi ulang."
+                        )
+                        st.session_state.step = "known_customer"
+                    else:
+                        st.session_state.known_customer = None
+                        reply = "Terima kasih! Siapa nama kamu?"
+                        st.session_state.step = "name"
                 else:
                     reply = "Nomor telepon tidak terbaca. Coba lagi dengan format yang benar (contoh: 08123456789)"
 
+            elif step == "known_customer":
+                known = st.session_state.get("known_customer")
+                if known and prompt.strip().lower() in ("ya", "iya", "y", "ok", "oke"):
+                    user_data["name"] = known["name"]
+                    user_data["address"] = known["address"]
+                    reply = "Siap! Kapan dan jam berapa pengiriman diinginkan? (contoh: 27 September 2025 jam 17.00 WIB)"
+                    st.session_state.step = "delivery_date"
+                else:
+                    st.session_state.known_customer = None
+                    reply = "Baik, kita isi ulang. Siapa nama kamu?"
+                    st.session_state.step = "name"
+
+            elif step == "name":
+                user_data["name"] = prompt.strip()
+                reply = f"Baik, {user_data['name']}. Sekarang mohon alamat lengkap tujuan pengiriman."
+                st.session_state.step = "address"
+
             elif step == "address":
                 user_data["address"] = prompt.strip()
                 reply = "Alamat sudah dicatat. Kapan dan jam berapa pengiriman diinginkan? (contoh: 27 September 2025 jam 17.00 WIB)"
@@ -492,8 +817,20 @@ if st.session_state.role == "user":
                     reply = "Format tanggal/jam belum saya pahami. Coba lagi (contoh: 27 September 2025 jam 17.00)"
 
             elif step == "done":
-                with st.spinner("Asisten sedang mengetik..."):
-                    reply = ai_assist(prompt, "layanan pelanggan")
+                st.chat_message("user").write(prompt)
+                reply = faq_answer(prompt)
+                if reply:
+                    st.chat_message("assistant").write(reply)
+                else:
+                    with st.chat_message("assistant"):
+                        reply = st.write_stream(
+                            ai_assist_stream(
+                                prompt,
+                                "layanan pelanggan",
+                                history=st.session_state.messages[:-1],
+                                booking=user_data,
+                            )
+                        )
                 st.session_state.messages.append(
                     {"role": "assistant", "content": reply}
                 )
@@ -519,8 +856,9 @@ if st.session_state.role == "user":
             with col1:
                 if st.button("✅ Konfirmasi"):
                     try:
-                        response = requests.post(API_URL, json=user_data, timeout=5)
-                        if response.status_code == 200:
+                        response = get_backend().post(SAVE_CUSTOMER_PATH, json=user_data)
+                        if response.status_code in (200, 202):
+                            invalidate_customer_cache()
                             st.session_state.messages.append(
                                 {
                                     "role": "assistant",
@@ -529,6 +867,16 @@ if st.session_state.role == "user":
                             )
                             st.session_state.step = "done"
                             st.rerun()
+                        elif response.status_code == 409:
+                            st.session_state.messages.append(
+                                {
+                                    "role": "assistant",
+                                    "content": slot_full_message(response)
+                                    + "\n\nKapan jadwal pengganti yang kamu inginkan?",
+                                }
+                            )
+                            st.session_state.step = "delivery_date"
+                            st.rerun()
                         else:
                             st.chat_message("assistant").write(
                                 f"⚠️ Terjadi kesalahan saat menyimpan data.\nStatus: {response.status_code}\nDetail: {response.text}"
@@ -540,7 +888,7 @@ if st.session_state.role == "user":
 
             with col2:
                 if st.button("❌ Edit Data"):
-                    st.session_state.step = "name"
+                    st.session_state.step = "phone"
                     st.session_state.messages = []
                     st.session_state.user_data = {
                         "name": None,
@@ -563,3 +911,7 @@ if st.session_state.role == "user":
                     st.success("🎉 Terima kasih telah menggunakan layanan kami!")
                     st.info("Silakan logout atau refresh halaman untuk memulai lagi.")
                     st.stop()
+
+# Rerun yang berakhir lewat st.rerun()/st.stop() tidak sampai ke baris ini
+persist_session()
+record_stage("render", time.perf_counter() - RENDER_START)
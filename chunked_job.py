@@ -0,0 +1,131 @@
+"""Kerangka job background yang memproses baris database per chunk kecil.
+
+Dipakai purge customer terhapus (customer_purge.py) dan pemindahan arsip
+(customer_archive.py). Setiap chunk adalah satu transaksi pendek yang
+dijalankan di threadpool, diikuti jeda supaya query lain (terutama INSERT
+booking) tetap mendapat giliran. Progres bisa dibaca lewat `stats()`.
+"""
+import asyncio
+import logging
+import threading
+import time
+
+from fastapi.concurrency import run_in_threadpool
+from mysql.connector import Error
+
+logger = logging.getLogger(__name__)
+
+
+class ChunkedJob:
+    """Subclass mengisi `name`, `count_pending(cutoff)` dan `process_chunk(cutoff)`"""
+
+    name = "job"
+
+    def __init__(self, repo, chunk_size, pause, interval, rows_counter=None, chunk_seconds=None):
+        self.repo = repo
+        self.chunk_size = chunk_size
+        self.pause = pause
+        self.interval = interval
+        self.rows_counter = rows_counter
+        self.chunk_seconds = chunk_seconds
+        self._lock = threading.Lock()
+        self._wake = asyncio.Event()
+        self.running = False
+        self.pending = None  # baris yang siap diproses saat putaran terakhir dimulai
+        self.processed_this_run = 0
+        self.processed_total = 0
+        self.chunks = 0
+        self.last_chunk_ms = None
+        self.last_run_at = None
+        self.last_error = None
+
+    def cutoff(self):
+        """Batas baris yang boleh diproses pada putaran ini"""
+        raise NotImplementedError
+
+    def count_pending(self, cutoff):
+        raise NotImplementedError
+
+    def process_chunk(self, cutoff):
+        """Proses paling banyak `chunk_size` baris dalam satu transaksi; kembalikan jumlahnya"""
+        raise NotImplementedError
+
+    def wake(self):
+        """Jalankan putaran berikutnya sekarang, tanpa menunggu `interval`"""
+        self._wake.set()
+
+    def _run_chunk(self, cutoff):
+        start = time.perf_counter()
+        processed = self.process_chunk(cutoff)
+        elapsed = time.perf_counter() - start
+        if self.chunk_seconds is not None:
+            self.chunk_seconds.observe(elapsed)
+        if self.rows_counter is not None:
+            self.rows_counter.inc(processed)
+        with self._lock:
+            self.chunks += 1
+            self.processed_this_run += processed
+            self.processed_total += processed
+            self.last_chunk_ms = round(elapsed * 1000, 1)
+        return processed
+
+    async def run_once(self):
+        """Satu putaran sampai tidak ada lagi baris yang lewat batas"""
+        cutoff = self.cutoff()
+        pending = await run_in_threadpool(self.count_pending, cutoff)
+        with self._lock:
+            self.running = True
+            self.pending = pending
+            self.processed_this_run = 0
+            self.last_run_at = time.time()
+        try:
+            while pending:
+                processed = await run_in_threadpool(self._run_chunk, cutoff)
+                if processed < self.chunk_size:
+                    break
+                await asyncio.sleep(self.pause)
+        finally:
+            with self._lock:
+                self.running = False
+
+    async def run_forever(self):
+        """Loop background; berhenti saat task di-cancel (shutdown)"""
+        while True:
+            try:
+                await self.run_once()
+                self.last_error = None
+            except asyncio.CancelledError:
+                raise
+            except Error as e:
+                logger.warning("Job %s gagal: %s", self.name, e)
+                self.last_error = str(e)
+            except Exception:
+                logger.exception("Job %s error", self.name)
+            self._wake.clear()
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=self.interval)
+            except asyncio.TimeoutError:
+                pass
+
+    def settings(self):
+        """Pengaturan yang ikut ditampilkan di `stats()`"""
+        return {"chunk_size": self.chunk_size}
+
+    def stats(self):
+        with self._lock:
+            remaining = (
+                max(self.pending - self.processed_this_run, 0)
+                if self.pending is not None
+                else None
+            )
+            return {
+                "running": self.running,
+                **self.settings(),
+                "pending": remaining,
+                "processed_this_run": self.processed_this_run,
+                "processed_total": self.processed_total,
+                "chunks": self.chunks,
+                "last_chunk_ms": self.last_chunk_ms,
+                "last_run_at": self.last_run_at,
+                "last_error": self.last_error,
+            }
@@ -0,0 +1,137 @@
+"""Susun konteks percakapan untuk AI dengan batas token.
+
+Isi prompt yang dikirim ke model:
+
+1. System prompt + fakta pesanan customer dalam satu baris ringkas.
+2. Ringkasan bergulir dari giliran lama yang tidak muat (dipotong per giliran,
+   tanpa panggilan LLM tambahan).
+3. Giliran terbaru sebanyak `max_turns`, selama masih muat di anggaran token.
+4. Pertanyaan terbaru.
+
+Token dihitung lokal memakai `tiktoken` jika terpasang, selain itu memakai
+perkiraan ~4 karakter per token.
+"""
+import os
+
+DEFAULT_TOKEN_BUDGET = int(os.getenv("AI_CONTEXT_TOKENS", 1500))
+DEFAULT_MAX_TURNS = int(os.getenv("AI_CONTEXT_TURNS", 6))
+SUMMARY_SHARE = 0.25  # porsi anggaran untuk ringkasan giliran lama
+SUMMARY_LINE_CHARS = 120
+MESSAGE_OVERHEAD_TOKENS = 4  # kira-kira biaya role/pemisah per pesan
+
+_encoding = None
+_encoding_loaded = False
+
+
+def _get_encoding():
+    global _encoding, _encoding_loaded
+    if not _encoding_loaded:
+        _encoding_loaded = True
+        try:
+            import tiktoken
+
+            _encoding = tiktoken.get_encoding("o200k_base")
+        except Exception:
+            # tiktoken tidak terpasang atau file encoding tidak bisa diunduh
+            _encoding = None
+    return _encoding
+
+
+def count_tokens(text):
+    encoding = _get_encoding()
+    if encoding is not None:
+        return len(encoding.encode(text))
+    return max(1, (len(text) + 3) // 4)
+
+
+def count_message_tokens(messages):
+    return sum(count_tokens(m["content"]) + MESSAGE_OVERHEAD_TOKENS for m in messages)
+
+
+def booking_facts(booking):
+    """Fakta pesanan dalam satu baris, mis. 'nama=Budi; telp=0812...'"""
+    if not booking:
+        return ""
+    labels = (
+        ("name", "nama"),
+        ("phone", "telp"),
+        ("address", "alamat"),
+        ("delivery_date", "jadwal kirim"),
+    )
+    parts = [f"{label}={booking[key]}" for key, label in labels if booking.get(key)]
+    return "; ".join(parts)
+
+
+def _summary_line(message):
+    who = "User" if message["role"] == "user" else "Asisten"
+    text = " ".join(message["content"].split())
+    if len(text) > SUMMARY_LINE_CHARS:
+        text = text[: SUMMARY_LINE_CHARS - 1] + "…"
+    return f"{who}: {text}"
+
+
+def summarize_turns(messages, budget):
+    """Ringkas giliran lama dari yang paling baru sampai anggaran habis.
+
+    Hanya membaca giliran secukupnya, jadi biayanya tidak ikut membesar
+    seiring panjang percakapan.
+    """
+    lines = []
+    used = 0
+    for message in reversed(messages):
+        line = _summary_line(message)
+        cost = count_tokens(line) + 1
+        if used + cost > budget:
+            break
+        lines.append(line)
+        used += cost
+    return "\n".join(reversed(lines))
+
+
+def build_context_messages(prompt, context="customer support", history=(),
+                           booking=None, budget=DEFAULT_TOKEN_BUDGET,
+                           max_turns=DEFAULT_MAX_TURNS):
+    """Daftar pesan OpenAI yang muat dalam `budget` token.
+
+    `history` adalah `st.session_state.messages` tanpa pertanyaan terbaru.
+    """
+    system = f"Kamu adalah asisten {context}. Balas singkat dan jelas."
+    facts = booking_facts(booking)
+    if facts:
+        system += f"\nData pesanan customer: {facts}."
+
+    head = [{"role": "system", "content": system}]
+    tail = [{"role": "user", "content": prompt}]
+    remaining = budget - count_message_tokens(head + tail)
+
+    turns = [m for m in history if m.get("role") in ("user", "assistant")]
+    recent_count = min(len(turns), max_turns * 2)
+    older = turns[: len(turns) - recent_count]
+    recent = turns[len(turns) - recent_count:]
+
+    # Giliran terbaru diambil dari belakang selama masih muat, dengan sisa
+    # ruang untuk ringkasan kalau ada giliran lama
+    reserve = int(budget * SUMMARY_SHARE) if older else 0
+    kept = []
+    for message in reversed(recent):
+        cost = count_tokens(message["content"]) + MESSAGE_OVERHEAD_TOKENS
+        if cost > remaining - reserve:
+            break
+        kept.append(message)
+        remaining -= cost
+    kept.reverse()
+    dropped = older + recent[: len(recent) - len(kept)]
+
+    if dropped and remaining > MESSAGE_OVERHEAD_TOKENS:
+        summary = summarize_turns(
+            dropped, min(int(budget * SUMMARY_SHARE), remaining - MESSAGE_OVERHEAD_TOKENS)
+        )
+        if summary:
+            head.append(
+                {
+                    "role": "system",
+                    "content": f"Ringkasan percakapan sebelumnya:\n{summary}",
+                }
+            )
+
+    return head + [{"role": m["role"], "content": m["content"]} for m in kept] + tail
@@ -0,0 +1,57 @@
+"""Pemindahan booking lama dari `customers` ke `customers_archive` (migrasi 006).
+
+Booking yang pengirimannya lewat lebih dari `ARCHIVE_AFTER_DAYS` hari
+dipindahkan per chunk: id dikunci, disalin ke arsip, lalu dihapus dari
+`customers` dalam satu transaksi pendek. Trigger DELETE ikut mengurangi
+`customer_monthly_stats`, jadi statistik default hanya menghitung data aktif;
+arsip punya ringkasan sendiri di `customer_archive_monthly_stats`.
+Baris yang sudah di-soft delete dibiarkan untuk job purge.
+"""
+import os
+from datetime import datetime, timedelta
+
+from chunked_job import ChunkedJob
+from metrics import REGISTRY
+
+ARCHIVE_AFTER_DAYS = int(os.getenv("ARCHIVE_AFTER_DAYS", 90))  # 0 = arsip nonaktif
+ARCHIVE_CHUNK_SIZE = int(os.getenv("ARCHIVE_CHUNK_SIZE", 1000))
+ARCHIVE_PAUSE = float(os.getenv("ARCHIVE_PAUSE", 0.05))  # detik antar chunk
+ARCHIVE_INTERVAL = float(os.getenv("ARCHIVE_INTERVAL", 3600))  # detik antar putaran
+
+ARCHIVED_ROWS = REGISTRY.counter(
+    "customer_archived_rows_total", "Baris customer yang dipindahkan ke arsip"
+)
+ARCHIVE_CHUNK_SECONDS = REGISTRY.histogram(
+    "customer_archive_chunk_seconds", "Durasi satu chunk pemindahan arsip"
+)
+
+
+class ArchiveMover(ChunkedJob):
+    """Job background yang memindahkan booking lama ke tabel arsip per chunk"""
+
+    name = "arsip customer"
+
+    def __init__(
+        self,
+        repo,
+        after_days=ARCHIVE_AFTER_DAYS,
+        chunk_size=ARCHIVE_CHUNK_SIZE,
+        pause=ARCHIVE_PAUSE,
+        interval=ARCHIVE_INTERVAL,
+    ):
+        super().__init__(repo, chunk_size, pause, interval, ARCHIVED_ROWS, ARCHIVE_CHUNK_SECONDS)
+        self.after_days = after_days
+
+    def cutoff(self):
+        today = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+        return today - timedelta(days=self.after_days)
+
+    def count_pending(self, cutoff):
+        return self.repo.count_archivable(cutoff)
+
+    def process_chunk(self, cutoff):
+        # Id dikunci, disalin ke arsip, lalu dihapus dalam satu transaksi
+        return self.repo.archive_chunk(cutoff, self.chunk_size)
+
+    def settings(self):
+        return {"after_days": self.after_days, "chunk_size": self.chunk_size}
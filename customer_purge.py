@@ -0,0 +1,84 @@
+"""Penghapusan customer: soft delete per chunk dan purge fisik di background.
+
+`/customers/delete` hanya mengisi `deleted_at` (migrasi 005) dalam transaksi
+kecil per `PURGE_CHUNK_SIZE` baris, jadi tidak ada satu statement besar yang
+mengunci tabel atau membengkakkan undo log. Baris bertanda dihapus fisik oleh
+`CustomerPurger` setelah `SOFT_DELETE_RETENTION` detik, juga per chunk dengan
+jeda di antaranya supaya INSERT booking tetap mendapat giliran. Selama masa
+retensi, baris bisa dipulihkan dengan mengosongkan `deleted_at` (trigger
+menghitung ulang statistik dan slot).
+"""
+import os
+from datetime import datetime, timedelta
+
+from chunked_job import ChunkedJob
+from metrics import REGISTRY
+
+PURGE_CHUNK_SIZE = int(os.getenv("PURGE_CHUNK_SIZE", 1000))
+PURGE_PAUSE = float(os.getenv("PURGE_PAUSE", 0.05))  # detik antar chunk
+PURGE_INTERVAL = float(os.getenv("PURGE_INTERVAL", 60))  # detik antar putaran
+SOFT_DELETE_RETENTION = int(os.getenv("SOFT_DELETE_RETENTION", 3600))
+
+PURGED_ROWS = REGISTRY.counter("customer_purged_rows_total", "Baris customer yang dihapus fisik")
+PURGE_CHUNK_SECONDS = REGISTRY.histogram(
+    "customer_purge_chunk_seconds", "Durasi satu chunk DELETE job purge"
+)
+
+
+def _chunks(items, size):
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def soft_delete_ids(repo, ids, chunk_size=PURGE_CHUNK_SIZE):
+    """Soft delete customer berdasarkan id. Mengembalikan nomor telepon yang terdampak."""
+    phones = []
+    for chunk in _chunks(sorted(set(ids)), chunk_size):
+        phones.extend(repo.soft_delete_chunk(chunk))
+    return phones
+
+
+def soft_delete_all(repo, chunk_size=PURGE_CHUNK_SIZE):
+    """Soft delete semua customer yang ada saat ini, berjalan per rentang id.
+
+    Booking yang masuk selama proses berjalan (id di atas MAX(id) awal) tidak ikut
+    terhapus. Mengembalikan jumlah baris yang ditandai.
+    """
+    max_id = repo.max_customer_id()
+    deleted = 0
+    after_id = 0
+    while True:
+        ids = repo.live_ids(after_id, max_id, chunk_size)
+        if not ids:
+            return deleted
+        deleted += len(repo.soft_delete_chunk(ids))
+        after_id = ids[-1]
+
+
+class CustomerPurger(ChunkedJob):
+    """Job background yang menghapus fisik baris bertanda per chunk"""
+
+    name = "purge customer"
+
+    def __init__(
+        self,
+        repo,
+        chunk_size=PURGE_CHUNK_SIZE,
+        retention=SOFT_DELETE_RETENTION,
+        pause=PURGE_PAUSE,
+        interval=PURGE_INTERVAL,
+    ):
+        super().__init__(repo, chunk_size, pause, interval, PURGED_ROWS, PURGE_CHUNK_SECONDS)
+        self.retention = retention
+
+    def cutoff(self):
+        return datetime.now() - timedelta(seconds=self.retention)
+
+    def count_pending(self, cutoff):
+        return self.repo.count_deleted(cutoff)
+
+    def process_chunk(self, cutoff):
+        return self.repo.purge_deleted(cutoff, self.chunk_size)
+
+    def settings(self):
+        return {"retention_seconds": self.retention, "chunk_size": self.chunk_size}
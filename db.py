@@ -0,0 +1,128 @@
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+from mysql.connector import pooling
+from mysql.connector.errors import Error, PoolError
+from dotenv import load_dotenv
+
+from metrics import REGISTRY
+
+load_dotenv()
+
+DB_CONFIG = {
+    "host": os.getenv("DB_HOST"),
+    "user": os.getenv("DB_USER"),
+    "password": os.getenv("DB_PASSWORD"),
+    "database": os.getenv("DB_NAME"),
+    "port": int(os.getenv("DB_PORT", 3306)),
+}
+
+# mysql-connector membatasi ukuran pool maksimal 32 koneksi
+POOL_SIZE = min(int(os.getenv("DB_POOL_SIZE", 5)), 32)
+POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", 5))
+
+DB_CONNECT_SECONDS = REGISTRY.histogram(
+    "db_pool_connect_seconds", "Waktu membuka semua koneksi pool MySQL"
+)
+DB_CHECKOUT_SECONDS = REGISTRY.histogram(
+    "db_checkout_seconds", "Waktu menunggu + mengambil koneksi dari pool"
+)
+
+
+class ConnectionPool:
+    """Pool koneksi MySQL bersama untuk backend FastAPI.
+
+    `MySQLConnectionPool` langsung gagal kalau semua koneksi sedang dipakai,
+    jadi checkout dijaga dengan semaphore supaya request menunggu sampai
+    `timeout` detik sebelum menyerah.
+    """
+
+    def __init__(self, config=None, size=POOL_SIZE, timeout=POOL_TIMEOUT,
+                 name="cs_chatbot_pool"):
+        self.config = dict(config or DB_CONFIG)
+        self.size = size
+        self.timeout = timeout
+        self.name = name
+        self._pool = None
+        self._pool_lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(size)
+        self._stats_lock = threading.Lock()
+        self.in_use = 0
+        self.checkouts = 0
+        self.checkout_failures = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+
+    def open(self):
+        """Buat koneksi-koneksi pool. Aman dipanggil berulang kali."""
+        with self._pool_lock:
+            if self._pool is None:
+                with DB_CONNECT_SECONDS.time():
+                    self._pool = pooling.MySQLConnectionPool(
+                        pool_name=self.name,
+                        pool_size=self.size,
+                        pool_reset_session=True,
+                        **self.config,
+                    )
+        return self._pool
+
+    def close(self):
+        """Tutup semua koneksi yang sedang menganggur di pool."""
+        with self._pool_lock:
+            if self._pool is not None:
+                self._pool._remove_connections()
+                self._pool = None
+
+    @contextmanager
+    def connection(self):
+        """Pinjam satu koneksi dari pool dan kembalikan setelah selesai."""
+        start = time.perf_counter()
+        if not self._slots.acquire(timeout=self.timeout):
+            self._record_failure()
+            raise PoolError(
+                f"Tidak ada koneksi database yang tersedia dalam {self.timeout} detik"
+            )
+        try:
+            conn = self.open().get_connection()
+        except Error:
+            self._slots.release()
+            self._record_failure()
+            raise
+        self._record_checkout(time.perf_counter() - start)
+        try:
+            yield conn
+        finally:
+            try:
+                conn.close()
+            finally:
+                with self._stats_lock:
+                    self.in_use -= 1
+                self._slots.release()
+
+    def _record_checkout(self, waited):
+        with self._stats_lock:
+            self.in_use += 1
+            self.checkouts += 1
+            self.wait_total += waited
+            self.wait_max = max(self.wait_max, waited)
+        DB_CHECKOUT_SECONDS.observe(waited)
+
+    def _record_failure(self):
+        with self._stats_lock:
+            self.checkout_failures += 1
+
+    def stats(self):
+        with self._stats_lock:
+            return {
+                "pool_size": self.size,
+                "in_use": self.in_use,
+                "available": self.size - self.in_use,
+                "checkouts": self.checkouts,
+                "checkout_failures": self.checkout_failures,
+                "wait_avg_ms": round(
+                    self.wait_total / self.checkouts * 1000, 3
+                ) if self.checkouts else 0.0,
+                "wait_max_ms": round(self.wait_max * 1000, 3),
+            }
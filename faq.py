@@ -0,0 +1,211 @@
+"""Jawaban FAQ lokal (TF-IDF + cosine NumPy) sebelum bertanya ke OpenAI.
+
+Pertanyaan contoh di `faq.json` diubah menjadi vektor TF-IDF (kata + trigram
+karakter, jadi salah ketik ringan tetap cocok) dan disimpan sebagai file
+`.npy` di `FAQ_INDEX_DIR`. Index hanya dibangun ulang kalau isi `faq.json`
+berubah; saat dipakai, matriksnya di-memory-map sehingga beberapa proses
+Streamlit berbagi halaman memori yang sama.
+
+    python faq.py build            # bangun index secara eksplisit
+    python faq.py ask "kapan pesanan saya sampai?"
+
+Kalau skor tertinggi di bawah `FAQ_THRESHOLD`, pertanyaan diteruskan ke AI.
+"""
+import hashlib
+import json
+import math
+import os
+import re
+import sys
+import threading
+import time
+from collections import Counter as TermCounter
+
+import numpy as np
+
+from metrics import REGISTRY
+
+FAQ_PATH = os.getenv("FAQ_PATH", "faq.json")
+FAQ_INDEX_DIR = os.getenv("FAQ_INDEX_DIR", "faq_index")
+FAQ_THRESHOLD = float(os.getenv("FAQ_THRESHOLD", 0.6))
+
+_WORD = re.compile(r"[a-z0-9]+")
+# Kata yang muncul di hampir semua pertanyaan dan tidak membedakan maksud
+STOPWORDS = frozenset(
+    "saya aku kamu anda apa apakah yang di ke dari dan atau ini itu ya kak min"
+    " dong sih nih tolong mau bisa bagaimana gimana cara untuk dengan sudah".split()
+)
+
+FAQ_LOOKUPS = REGISTRY.counter(
+    "faq_lookups_total", "Pertanyaan yang dicek ke index FAQ", ("outcome",)
+)
+FAQ_SECONDS = REGISTRY.histogram(
+    "faq_lookup_seconds",
+    "Durasi pencarian FAQ lokal",
+    buckets=(0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05),
+)
+
+
+def features(text):
+    """Token kata (tanpa stopword) dan trigram karakter per kata"""
+    grams = []
+    for word in _WORD.findall(text.lower()):
+        if word in STOPWORDS:
+            continue
+        grams.append(word)
+        padded = f"<{word}>"
+        grams.extend(f"#{padded[i:i + 3]}" for i in range(len(padded) - 2))
+    return grams
+
+
+def _tfidf(text, vocabulary, idf):
+    vector = np.zeros(len(vocabulary), dtype=np.float32)
+    for term, count in TermCounter(features(text)).items():
+        column = vocabulary.get(term)
+        if column is not None:
+            vector[column] = (1.0 + math.log(count)) * idf[column]
+    norm = float(np.linalg.norm(vector))
+    return vector / norm if norm else vector
+
+
+def _source_hash(data):
+    return hashlib.sha256(data).hexdigest()
+
+
+def _save_atomic(path, write):
+    tmp = f"{path}.tmp"
+    with open(tmp, "wb") as f:
+        write(f)
+    os.replace(tmp, path)
+
+
+def build_index(faq_path=FAQ_PATH, index_dir=FAQ_INDEX_DIR):
+    """Bangun index dari `faq.json` dan simpan ke `index_dir`"""
+    with open(faq_path, "rb") as f:
+        raw = f.read()
+    entries = json.loads(raw)
+
+    questions, rows = [], []
+    for entry_id, entry in enumerate(entries):
+        for question in entry["questions"]:
+            questions.append(question)
+            rows.append(entry_id)
+
+    documents = [TermCounter(features(q)) for q in questions]
+    document_freq = TermCounter(term for doc in documents for term in doc)
+    vocabulary = {term: i for i, term in enumerate(sorted(document_freq))}
+    n = len(documents)
+    idf = np.zeros(len(vocabulary), dtype=np.float32)
+    for term, column in vocabulary.items():
+        idf[column] = math.log((1 + n) / (1 + document_freq[term])) + 1.0
+
+    vectors = np.vstack([_tfidf(q, vocabulary, idf) for q in questions]).astype(np.float32)
+
+    os.makedirs(index_dir, exist_ok=True)
+    _save_atomic(os.path.join(index_dir, "vectors.npy"), lambda f: np.save(f, vectors))
+    _save_atomic(os.path.join(index_dir, "idf.npy"), lambda f: np.save(f, idf))
+    _save_atomic(
+        os.path.join(index_dir, "rows.npy"), lambda f: np.save(f, np.array(rows, dtype=np.int32))
+    )
+    # meta.json ditulis terakhir: hash di dalamnya menandai index sudah lengkap
+    meta = {
+        "source_hash": _source_hash(raw),
+        "vocabulary": vocabulary,
+        "entries": [
+            {"question": entry["questions"][0], "answer": entry["answer"]} for entry in entries
+        ],
+    }
+    _save_atomic(
+        os.path.join(index_dir, "meta.json"),
+        lambda f: f.write(json.dumps(meta, ensure_ascii=False).encode("utf-8")),
+    )
+    return len(entries), len(questions)
+
+
+def _index_is_fresh(faq_path, index_dir):
+    try:
+        with open(os.path.join(index_dir, "meta.json"), "rb") as f:
+            meta = json.loads(f.read())
+        with open(faq_path, "rb") as f:
+            return meta.get("source_hash") == _source_hash(f.read())
+    except (OSError, ValueError):
+        return False
+
+
+class FAQIndex:
+    """Index FAQ yang sudah dimuat; `answer()` aman dipanggil dari banyak thread"""
+
+    def __init__(self, index_dir=FAQ_INDEX_DIR, threshold=FAQ_THRESHOLD):
+        self.threshold = threshold
+        with open(os.path.join(index_dir, "meta.json"), "rb") as f:
+            meta = json.loads(f.read())
+        self.vocabulary = meta["vocabulary"]
+        self.entries = meta["entries"]
+        self.vectors = np.load(os.path.join(index_dir, "vectors.npy"), mmap_mode="r")
+        self.idf = np.load(os.path.join(index_dir, "idf.npy"), mmap_mode="r")
+        self.rows = np.load(os.path.join(index_dir, "rows.npy"), mmap_mode="r")
+        self._lock = threading.Lock()
+        self.lookups = 0
+        self.hits = 0
+        self.total_ms = 0.0
+
+    def search(self, text):
+        """Entry dengan skor cosine tertinggi: (entry, skor)"""
+        query = _tfidf(text, self.vocabulary, self.idf)
+        if not self.vectors.shape[0] or not query.any():
+            return None, 0.0
+        scores = self.vectors @ query
+        best = int(np.argmax(scores))
+        return self.entries[int(self.rows[best])], float(scores[best])
+
+    def answer(self, text):
+        """Jawaban FAQ kalau cukup mirip, selain itu None (lanjut ke AI)"""
+        start = time.perf_counter()
+        entry, score = self.search(text)
+        elapsed = time.perf_counter() - start
+        hit = entry is not None and score >= self.threshold
+        FAQ_SECONDS.observe(elapsed)
+        FAQ_LOOKUPS.inc(outcome="hit" if hit else "miss")
+        with self._lock:
+            self.lookups += 1
+            self.hits += hit
+            self.total_ms += elapsed * 1000
+        return entry["answer"] if hit else None
+
+    def stats(self):
+        with self._lock:
+            return {
+                "entries": len(self.entries),
+                "questions": int(self.vectors.shape[0]),
+                "threshold": self.threshold,
+                "lookups": self.lookups,
+                "answered_locally": self.hits,
+                "deflection_rate": round(self.hits / self.lookups, 3) if self.lookups else None,
+                "avg_lookup_ms": round(self.total_ms / self.lookups, 3) if self.lookups else None,
+            }
+
+
+def load_faq_index(faq_path=FAQ_PATH, index_dir=FAQ_INDEX_DIR, threshold=FAQ_THRESHOLD):
+    """Muat index, membangunnya dulu kalau belum ada atau `faq.json` berubah"""
+    if not _index_is_fresh(faq_path, index_dir):
+        build_index(faq_path, index_dir)
+    return FAQIndex(index_dir, threshold)
+
+
+def main(argv):
+    if len(argv) >= 1 and argv[0] == "build":
+        entries, questions = build_index()
+        print(f"✅ Index FAQ dibangun: {entries} jawaban, {questions} pertanyaan di {FAQ_INDEX_DIR}")
+        return 0
+    if len(argv) >= 2 and argv[0] == "ask":
+        index = load_faq_index()
+        entry, score = index.search(" ".join(argv[1:]))
+        print(f"skor {score:.3f} (ambang {index.threshold})")
+        print(entry["answer"] if entry and score >= index.threshold else "→ diteruskan ke AI")
+        return 0
+    print("Pemakaian: python faq.py build | python faq.py ask <pertanyaan>")
+    return 2
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,16 @@
+"""Konfigurasi gunicorn untuk produksi di Linux: `gunicorn -c gunicorn.conf.py main:app`"""
+from serve import GRACEFUL_TIMEOUT, HOST, PORT, WORKERS
+
+bind = f"{HOST}:{PORT}"
+workers = WORKERS
+worker_class = "uvicorn.workers.UvicornWorker"
+
+# Jangan preload: pool MySQL dan task background dibuat per worker di lifespan
+preload_app = False
+graceful_timeout = GRACEFUL_TIMEOUT
+timeout = 120  # jawaban AI streaming bisa lama
+keepalive = 5
+
+# Daur ulang worker secara bertahap supaya kebocoran memori tidak menumpuk
+max_requests = 10000
+max_requests_jitter = 1000
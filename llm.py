@@ -0,0 +1,171 @@
+"""Pemanggilan OpenAI yang dipakai bersama oleh Streamlit dan backend FastAPI.
+
+Base URL mengikuti env `OPENAI_BASE_URL` dari SDK OpenAI, jadi semua fungsi
+di sini bisa diarahkan ke server palsu (`benchmarks/fake_openai.py`).
+"""
+import json
+import logging
+import os
+import time
+
+from metrics import REGISTRY
+
+AI_MODEL = os.getenv("OPENAI_MODEL", "gpt-4o-mini")
+
+logger = logging.getLogger(__name__)
+
+OPENAI_SECONDS = REGISTRY.histogram(
+    "openai_request_seconds", "Durasi panggilan OpenAI", ("mode", "outcome")
+)
+OPENAI_TTFT_SECONDS = REGISTRY.histogram(
+    "openai_ttft_seconds", "Time-to-first-token completion streaming"
+)
+OPENAI_TOKENS = REGISTRY.counter(
+    "openai_tokens_total", "Token yang dilaporkan OpenAI", ("kind",)
+)
+
+
+def build_messages(prompt, context="customer support"):
+    return [
+        {
+            "role": "system",
+            "content": f"Kamu adalah asisten {context}. Balas singkat dan jelas.",
+        },
+        {"role": "user", "content": prompt},
+    ]
+
+
+def record_usage(usage):
+    if usage is None:
+        return
+    OPENAI_TOKENS.inc(usage.prompt_tokens or 0, kind="prompt")
+    OPENAI_TOKENS.inc(usage.completion_tokens or 0, kind="completion")
+
+
+def complete(client, prompt, context="customer support", model=AI_MODEL,
+             messages=None):
+    """Jawaban lengkap; `messages` menggantikan prompt default bila diberikan"""
+    start = time.perf_counter()
+    outcome = "error"
+    try:
+        response = client.chat.completions.create(
+            model=model, messages=messages or build_messages(prompt, context)
+        )
+        outcome = "ok"
+    finally:
+        OPENAI_SECONDS.observe(time.perf_counter() - start, mode="complete", outcome=outcome)
+    record_usage(response.usage)
+    return response.choices[0].message.content
+
+
+async def acomplete(client, prompt, context="customer support", model=AI_MODEL,
+                    messages=None):
+    """Versi async dari `complete` untuk `AsyncOpenAI`"""
+    start = time.perf_counter()
+    outcome = "error"
+    try:
+        response = await client.chat.completions.create(
+            model=model, messages=messages or build_messages(prompt, context)
+        )
+        outcome = "ok"
+    finally:
+        OPENAI_SECONDS.observe(time.perf_counter() - start, mode="complete", outcome=outcome)
+    record_usage(response.usage)
+    return response.choices[0].message.content
+
+
+class StreamTimer:
+    """Catat time-to-first-token dan durasi total satu streaming completion"""
+
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.ttft = None
+        self.chunks = 0
+        self.metrics = None
+        self.outcome = "error"
+
+    def token(self):
+        if self.ttft is None:
+            self.ttft = time.perf_counter() - self.start
+        self.chunks += 1
+
+    def finish(self):
+        total = time.perf_counter() - self.start
+        metrics = {
+            "ttft_ms": round(self.ttft * 1000, 1) if self.ttft is not None else None,
+            "total_ms": round(total * 1000, 1),
+            "chunks": self.chunks,
+        }
+        logger.info(
+            "ai stream ttft_ms=%s total_ms=%s chunks=%s",
+            metrics["ttft_ms"], metrics["total_ms"], metrics["chunks"],
+        )
+        self.metrics = metrics
+        OPENAI_SECONDS.observe(total, mode="stream", outcome=self.outcome)
+        if self.ttft is not None:
+            OPENAI_TTFT_SECONDS.observe(self.ttft)
+        return metrics
+
+
+def _delta_text(chunk):
+    if not chunk.choices:
+        # Chunk terakhir dari `include_usage` hanya berisi jumlah token
+        record_usage(getattr(chunk, "usage", None))
+        return None
+    return chunk.choices[0].delta.content
+
+
+def stream_complete(client, prompt, context="customer support", model=AI_MODEL,
+                    timer=None, messages=None):
+    """Generator potongan teks jawaban dari OpenAI (client sinkron)"""
+    timer = timer or StreamTimer()
+    stream = client.chat.completions.create(
+        model=model, messages=messages or build_messages(prompt, context),
+        stream=True, stream_options={"include_usage": True},
+    )
+    try:
+        for chunk in stream:
+            text = _delta_text(chunk)
+            if text:
+                timer.token()
+                yield text
+        timer.outcome = "ok"
+    finally:
+        timer.finish()
+
+
+async def astream_complete(client, prompt, context="customer support",
+                           model=AI_MODEL, timer=None, messages=None):
+    """Versi async dari `stream_complete` untuk `AsyncOpenAI`"""
+    timer = timer or StreamTimer()
+    stream = await client.chat.completions.create(
+        model=model, messages=messages or build_messages(prompt, context),
+        stream=True, stream_options={"include_usage": True},
+    )
+    try:
+        async for chunk in stream:
+            text = _delta_text(chunk)
+            if text:
+                timer.token()
+                yield text
+        timer.outcome = "ok"
+    finally:
+        timer.finish()
+        # Lepas koneksi HTTP segera kalau stream dihentikan di tengah (timeout)
+        await stream.close()
+
+
+def iter_sse_events(lines):
+    """Uraikan baris Server-Sent Events menjadi pasangan (event, data JSON)"""
+    event, data = None, []
+    for line in lines:
+        if not line:
+            if data:
+                yield event or "message", json.loads("\n".join(data))
+            event, data = None, []
+        elif line.startswith("event:"):
+            event = line[len("event:"):].strip()
+        elif line.startswith("data:"):
+            data.append(line[len("data:"):].strip())
+    if data:
+        yield event or "message", json.loads("\n".join(data))
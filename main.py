@@ -1,22 +1,116 @@
-from fastapi import FastAPI, HTTPException
-from typing import List
-from pydantic import BaseModel
-import mysql.connector
-from mysql.connector import Error
-from dotenv import load_dotenv
+from contextlib import asynccontextmanager
+from datetime import date, datetime
+import asyncio
+import csv
+import io
+import json
+import logging
 import os
+import time
+import zlib
+
+from fastapi import Depends, FastAPI, HTTPException, Query, Request, Response, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import ORJSONResponse, PlainTextResponse, StreamingResponse
+from typing import List, Literal, Optional
+import orjson
+from pydantic import BaseModel, ValidationError
+from dotenv import load_dotenv
+from mysql.connector import Error
+from openai import (
+    APIConnectionError,
+    APITimeoutError,
+    AsyncOpenAI,
+    InternalServerError,
+    OpenAIError,
+    RateLimitError,
+)
 
+# Sebelum impor modul lokal: pengaturannya dibaca dari env saat diimpor
 load_dotenv()
 
-app = FastAPI()
+from ai_cache import AICache, MemoryCache  # noqa: E402
+from booking_queue import BookingQueue, drain_forever  # noqa: E402
+from chat_scheduler import ChatScheduler, QueueFullError  # noqa: E402
+from context_builder import build_context_messages  # noqa: E402
+from customer_archive import ArchiveMover  # noqa: E402
+from customer_purge import CustomerPurger, soft_delete_all, soft_delete_ids  # noqa: E402
+from llm import StreamTimer, acomplete, astream_complete  # noqa: E402
+from metrics import REGISTRY, RequestTimingMiddleware, render_gauges  # noqa: E402
+from parsing import normalize_phone, normalize_phones, parse_dates, phone_variants  # noqa: E402
+from slots import day_availability, release_slots, reserve_slot, slot_start, suggest_slots  # noqa: E402
+from storage import CUSTOMER_COLUMNS, create_repository  # noqa: E402
 
-DB_CONFIG = {
-    "host": os.getenv("DB_HOST"),
-    "user": os.getenv("DB_USER"),
-    "password": os.getenv("DB_PASSWORD"),
-    "database": os.getenv("DB_NAME"),
-    "port": os.getenv("DB_PORT"),
-}
+logger = logging.getLogger(__name__)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # STORAGE_BACKEND: mysql (default) atau file SQLite lokal
+    repo = create_repository()
+    try:
+        await run_in_threadpool(repo.open)
+    except Error as err:
+        # Pool akan dicoba dibuat lagi saat request pertama
+        logger.warning("Gagal membuat pool database saat startup: %s", err)
+    app.state.repo = repo
+    app.state.db_pool = repo.pool
+    app.state.readiness = None
+
+    try:
+        # Retry ditangani ChatScheduler, bukan SDK
+        app.state.llm_client = AsyncOpenAI(max_retries=0)
+    except OpenAIError as err:
+        logger.warning("OpenAI client tidak aktif: %s", err)
+        app.state.llm_client = None
+    app.state.chat_scheduler = ChatScheduler(
+        max_in_flight=int(os.getenv("AI_MAX_IN_FLIGHT", 4)),
+        max_queue=int(os.getenv("AI_MAX_QUEUE", 100)),
+        timeout=float(os.getenv("AI_REQUEST_TIMEOUT", 30)),
+        max_retries=int(os.getenv("AI_MAX_RETRIES", 3)),
+        retry_on=(RateLimitError, APITimeoutError, APIConnectionError, InternalServerError),
+    )
+
+    # Cache per proses; worker lain bisa melihat data lama sampai TTL habis
+    phone_cache = AICache(MemoryCache(PHONE_CACHE_SIZE, PHONE_CACHE_TTL))
+    app.state.phone_cache = phone_cache
+
+    def insert_queued(batch):
+        result = _insert_queued_batch(repo, batch)
+        _invalidate_phones(phone_cache, [data.phone for _, (data, _) in batch])
+        return result
+
+    app.state.booking_queue = BookingQueue()
+    booking_worker = asyncio.create_task(
+        drain_forever(
+            app.state.booking_queue, insert_queued, _queued_record,
+            lambda batch: _release_queued_slots(repo, batch),
+        )
+    )
+    app.state.customer_purger = CustomerPurger(repo)
+    workers = [booking_worker, asyncio.create_task(app.state.customer_purger.run_forever())]
+    app.state.archive_mover = ArchiveMover(repo)
+    if app.state.archive_mover.after_days > 0:
+        workers.append(asyncio.create_task(app.state.archive_mover.run_forever()))
+
+    yield
+
+    # Booking yang belum terkirim tetap aman di antrean untuk start berikutnya;
+    # purge/arsip yang terhenti dilanjutkan putaran berikutnya (setiap chunk sudah commit)
+    for worker in workers:
+        worker.cancel()
+        try:
+            await worker
+        except asyncio.CancelledError:
+            pass
+    app.state.booking_queue.close()
+    if app.state.llm_client is not None:
+        await app.state.llm_client.close()
+    await run_in_threadpool(repo.close)
+
+
+app = FastAPI(lifespan=lifespan, default_response_class=ORJSONResponse)
+app.add_middleware(RequestTimingMiddleware)
 
 
 class Customer(BaseModel):
@@ -26,44 +120,784 @@ class Customer(BaseModel):
     delivery_date: str
 
 
+class DeleteCustomersRequest(BaseModel):
+    ids: List[int] = []
+    all: bool = False
+
+
+class ChatMessage(BaseModel):
+    role: Literal["user", "assistant"]
+    content: str
+
+
+class ChatRequest(BaseModel):
+    prompt: str
+    context: str = "layanan pelanggan"
+    history: List[ChatMessage] = []
+    booking: Optional[dict] = None
+    session_id: Optional[str] = None
+
+
+PAGE_SIZE_DEFAULT = 100
+PAGE_SIZE_MAX = 1000
+DELETE_IDS_MAX = 10000
+
+PHONE_CACHE_SIZE = int(os.getenv("PHONE_CACHE_SIZE", 10000))
+PHONE_CACHE_TTL = int(os.getenv("PHONE_CACHE_TTL", 300))
+
+
+def customer_filters(
+    delivery_from: Optional[datetime] = None,
+    delivery_to: Optional[datetime] = None,
+    phone: Optional[str] = None,
+    created_from: Optional[datetime] = None,
+    created_to: Optional[datetime] = None,
+    include_archived: bool = False,
+):
+    """Filter query string yang dipakai bersama oleh endpoint list customer"""
+    phones = None
+    if phone is not None:
+        # Nomor disimpan E.164, data lama masih bisa 08.../628...
+        normalized = normalize_phone(phone)
+        if normalized is None:
+            raise HTTPException(status_code=422, detail="Nomor telepon tidak valid")
+        phones = phone_variants(normalized)
+    return {
+        "delivery_from": delivery_from,
+        "delivery_to": delivery_to,
+        "phones": phones,
+        "created_from": created_from,
+        "created_to": created_to,
+        "include_archived": include_archived,
+    }
+
+
+def _parse_fields(fields):
+    if not fields:
+        return list(CUSTOMER_COLUMNS)
+    columns = [f.strip() for f in fields.split(",") if f.strip()]
+    unknown = [c for c in columns if c not in CUSTOMER_COLUMNS]
+    if unknown:
+        raise HTTPException(
+            status_code=400, detail=f"Kolom tidak dikenal: {', '.join(unknown)}"
+        )
+    # id selalu ikut karena dipakai sebagai cursor halaman berikutnya
+    if "id" not in columns:
+        columns.insert(0, "id")
+    return columns
+
+
+def _invalidate_phones(cache, phones):
+    # Kunci cache selalu E.164, sedangkan baris lama bisa tersimpan sebagai 08...
+    for phone in {normalize_phone(phone) for phone in phones} - {None}:
+        cache.invalidate(phone)
+
+
+def _json_default(value):
+    if isinstance(value, datetime):
+        return value.isoformat(sep=" ")
+    return str(value)
+
+
+NDJSON_OPTIONS = orjson.OPT_APPEND_NEWLINE | orjson.OPT_PASSTHROUGH_DATETIME
+
+
+def _stream_ndjson(chunks):
+    for rows in chunks:
+        # Datetime lewat _json_default supaya formatnya sama dengan CSV
+        yield b"".join(
+            orjson.dumps(row, default=_json_default, option=NDJSON_OPTIONS)
+            for row in rows
+        )
+
+
+def _stream_csv(chunks, columns):
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=columns)
+    writer.writeheader()
+    for rows in chunks:
+        writer.writerows(rows)
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue()
+
+
+EXPORT_MEDIA_TYPES = {
+    "csv": "text/csv",
+    "ndjson": "application/x-ndjson",
+    "parquet": "application/vnd.apache.parquet",
+}
+
+
+def _gzip_stream(chunks):
+    """Kompres aliran str/bytes menjadi satu file gzip, chunk demi chunk"""
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31)  # wbits 31 = header gzip
+    for chunk in chunks:
+        if isinstance(chunk, str):
+            chunk = chunk.encode("utf-8")
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+def _load_parquet():
+    # pyarrow opsional; hanya dibutuhkan untuk export parquet
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError:
+        raise HTTPException(
+            status_code=501, detail="Export parquet butuh paket pyarrow di server"
+        )
+    return pyarrow, pyarrow.parquet
+
+
+class _ChunkSink(io.RawIOBase):
+    """File tulis-saja untuk ParquetWriter; isinya diambil per row group"""
+
+    def __init__(self):
+        self._parts = []
+        self._position = 0
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self._parts.append(bytes(data))
+        self._position += len(data)
+        return len(data)
+
+    def tell(self):
+        # Posisi total, bukan isi buffer: dipakai writer untuk offset di footer
+        return self._position
+
+    def drain(self):
+        data = b"".join(self._parts)
+        self._parts.clear()
+        return data
+
+
+def _stream_parquet(chunks, columns, compression):
+    pa, pq = _load_parquet()
+    types = {
+        "id": pa.int64(),
+        "name": pa.string(),
+        "phone": pa.string(),
+        "address": pa.string(),
+        "delivery_date": pa.timestamp("s"),
+        "created_at": pa.timestamp("s"),
+    }
+    schema = pa.schema([(column, types[column]) for column in columns])
+    sink = _ChunkSink()
+    # Satu row group per chunk, jadi memori tetap sebesar satu chunk
+    with pq.ParquetWriter(sink, schema, compression=compression) as writer:
+        for rows in chunks:
+            writer.write_table(pa.Table.from_pylist(rows, schema=schema))
+            yield sink.drain()
+    yield sink.drain()
+
+
+BULK_BATCH_DEFAULT = 500
+BULK_BATCH_MAX = 5000
+
+
+def _customer_values(data):
+    return (data.name, data.phone, data.address, data.delivery_date)
+
+
+def _insert_customer_batch(repo, batch, reserved=frozenset()):
+    """Simpan satu batch dalam satu transaksi (lihat `insert_customers` di storage.py).
+
+    Slot pengiriman baris yang index-nya tidak ada di `reserved` ikut dihitung
+    di transaksi yang sama. Mengembalikan (jumlah tersimpan, daftar error per baris).
+    """
+    rows = []
+    for index, data in batch:
+        slot = None if index in reserved else slot_start(data.delivery_date)
+        rows.append((index, _customer_values(data), slot))
+    return repo.insert_customers(rows)
+
+
+def _queued_record(payload):
+    """Payload antrean -> (Customer, apakah slot sudah dipesan saat diterima)"""
+    payload = dict(payload)
+    reserved = payload.pop("slot_reserved", False)
+    return Customer(**payload), reserved
+
+
+def _insert_queued_batch(repo, batch):
+    """`_insert_customer_batch` untuk worker antrean booking.
+
+    Booking yang slotnya sudah dipesan tidak dihitung ulang; kalau barisnya
+    ditolak database, kursinya dikembalikan.
+    """
+    reserved = {index for index, (_, is_reserved) in batch if is_reserved}
+    inserted, errors = _insert_customer_batch(
+        repo, [(index, data) for index, (data, _) in batch], reserved
+    )
+    failed = {e["index"] for e in errors}
+    _release_queued_slots(repo, [item for item in batch if item[0] in failed])
+    return inserted, errors
+
+
+def _release_queued_slots(repo, batch):
+    """Kembalikan kursi booking antrean yang tidak akan pernah tersimpan"""
+    release_slots(
+        repo, [slot_start(data.delivery_date) for _, (data, reserved) in batch if reserved]
+    )
+
+
+def _normalize_customer_batch(batch):
+    """Normalisasi telepon (E.164) dan tanggal kirim satu batch sekaligus.
+
+    Mengembalikan (baris valid, error per baris).
+    """
+    phones = normalize_phones([data.phone for _, data in batch])
+    dates = parse_dates([data.delivery_date for _, data in batch])
+    valid = []
+    errors = []
+    for (index, data), phone, delivery in zip(batch, phones, dates):
+        if phone is None:
+            errors.append({"index": index, "error": "Nomor telepon tidak valid"})
+        elif delivery is None:
+            errors.append({"index": index, "error": "Format tanggal/jam tidak dikenali"})
+        else:
+            data.phone = phone
+            data.delivery_date = delivery
+            valid.append((index, data))
+    return valid, errors
+
+
+async def _iter_ndjson_lines(stream):
+    pending = b""
+    async for chunk in stream:
+        pending += chunk
+        *lines, pending = pending.split(b"\n")
+        for line in lines:
+            if line.strip():
+                yield line
+    if pending.strip():
+        yield pending
+
+
+async def _iter_bulk_records(request):
+    """Hasilkan (index, objek JSON atau error) dari body array JSON / NDJSON"""
+    content_type = request.headers.get("content-type", "")
+    if "ndjson" in content_type or "jsonlines" in content_type:
+        index = 0
+        async for line in _iter_ndjson_lines(request.stream()):
+            try:
+                yield index, json.loads(line)
+            except ValueError as e:
+                yield index, e
+            index += 1
+        return
+
+    try:
+        body = await request.json()
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Body bukan JSON yang valid")
+    if not isinstance(body, list):
+        raise HTTPException(status_code=400, detail="Body harus berupa array JSON")
+    for index, item in enumerate(body):
+        yield index, item
+
+
+def _database_error(request, err):
+    """HTTP 500 dengan pesan error dari backend storage yang aktif"""
+    return HTTPException(
+        status_code=500, detail=f"{request.app.state.repo.label} Error: {err}"
+    )
+
+
+def _sse_event(data, event=None):
+    payload = json.dumps(data, ensure_ascii=False)
+    return (f"event: {event}\n" if event else "") + f"data: {payload}\n\n"
+
+
+def _chat_session_id(data, request):
+    return data.session_id or (request.client.host if request.client else "anonymous")
+
+
+def _context_messages(data):
+    history = [message.model_dump() for message in data.history]
+    return build_context_messages(data.prompt, data.context, history, data.booking)
+
+
+def _format_validation_error(err):
+    return "; ".join(
+        f"{'.'.join(str(part) for part in e['loc'])}: {e['msg']}" for e in err.errors()
+    )
+
+
 @app.get("/")
 def home():
     return {"message": "✅ Chatbot API aktif dan siap menerima data!"}
 
 
+READY_CHECK_TTL = 2.0  # detik; probe yang sering tidak menambah beban DB
+
+
+@app.get("/health")
+def health():
+    """Liveness: proses hidup dan event loop merespons (tanpa menyentuh DB)"""
+    return {"status": "ok", "pid": os.getpid()}
+
+
+@app.get("/ready")
+async def ready(request: Request):
+    """Readiness: database bisa dijangkau. Hasil cek di-cache `READY_CHECK_TTL` detik."""
+    state = request.app.state
+    now = time.monotonic()
+    if state.readiness is None or now - state.readiness[0] > READY_CHECK_TTL:
+        try:
+            await run_in_threadpool(state.repo.ping)
+            error = None
+        except Error as e:
+            error = str(e)
+        state.readiness = (now, error)
+
+    error = state.readiness[1]
+    if error:
+        return ORJSONResponse(
+            status_code=503, content={"status": "unavailable", "database": error}
+        )
+    return {"status": "ready", "pid": os.getpid()}
+
+
 @app.get("/customers/", response_model=List[dict])
-def get_all_customers():
-    """Endpoint untuk mengambil semua data customer"""
+async def get_all_customers(
+    request: Request,
+    cursor: Optional[int] = Query(None, description="ID terakhir dari halaman sebelumnya"),
+    limit: int = Query(PAGE_SIZE_DEFAULT, ge=1, le=PAGE_SIZE_MAX),
+    fields: Optional[str] = Query(None, description="Kolom dipisah koma, mis. id,name,phone"),
+    format: str = Query("json", pattern="^(json|ndjson|csv)$"),
+    filters: dict = Depends(customer_filters),
+):
+    """Endpoint untuk mengambil data customer per halaman (keyset pada id).
+
+    Format `ndjson` dan `csv` mengalirkan seluruh hasil filter per chunk
+    tanpa `limit`, sehingga memori tetap datar berapapun ukuran tabelnya.
+    """
+    repo = request.app.state.repo
+    columns = _parse_fields(fields)
+
+    if format == "ndjson":
+        return StreamingResponse(
+            _stream_ndjson(repo.iter_customers(columns, filters, cursor)),
+            media_type="application/x-ndjson",
+        )
+    if format == "csv":
+        return StreamingResponse(
+            _stream_csv(repo.iter_customers(columns, filters, cursor), columns),
+            media_type="text/csv",
+        )
+
     try:
-        conn = mysql.connector.connect(**DB_CONFIG)
-        cursor = conn.cursor(dictionary=True)
-        cursor.execute("SELECT * FROM customers ORDER BY id DESC")
-        rows = cursor.fetchall()
-        cursor.close()
-        conn.close()
-        return rows
-    except mysql.connector.Error as err:
+        rows = await run_in_threadpool(repo.customers_page, columns, filters, cursor, limit)
+    except Error as err:
         return {"error": str(err)}
+    headers = {"X-Next-Cursor": str(rows[-1]["id"])} if len(rows) == limit else None
+    # Langsung ke orjson tanpa jsonable_encoder (orjson paham datetime)
+    return ORJSONResponse(rows, headers=headers)
+
+
+@app.get("/customers/by_phone/{phone}")
+async def get_customer_by_phone(phone: str, request: Request):
+    """Data customer lama berdasarkan nomor telepon, untuk mengisi otomatis
+    chat booking. Hasil (termasuk "tidak ditemukan") di-cache LRU + TTL."""
+    normalized = normalize_phone(phone)
+    if normalized is None:
+        raise HTTPException(status_code=422, detail="Nomor telepon tidak valid")
+
+    repo = request.app.state.repo
+    try:
+        # {} = tidak ditemukan; ikut di-cache supaya customer baru tidak
+        # selalu menembus ke database
+        customer = await run_in_threadpool(
+            request.app.state.phone_cache.get_or_compute,
+            normalized,
+            lambda: repo.customer_by_phone(phone_variants(normalized)) or {},
+        )
+    except Error as e:
+        raise _database_error(request, e)
+    if not customer:
+        raise HTTPException(status_code=404, detail="Customer tidak ditemukan")
+    return customer
+
+
+@app.get("/customers/export")
+def export_customers(
+    request: Request,
+    format: str = Query("csv", pattern="^(csv|ndjson|parquet)$"),
+    gzip: bool = Query(False, description="Kompres hasil (parquet: kompresi kolom gzip)"),
+    fields: Optional[str] = Query(None, description="Kolom dipisah koma, mis. id,name,phone"),
+    filters: dict = Depends(customer_filters),
+):
+    """Unduh seluruh customer hasil filter sebagai file, dialirkan per chunk
+    dari cursor server-side tanpa membangun file utuh di memori."""
+    columns = _parse_fields(fields)
+    chunks = request.app.state.repo.iter_customers(columns, filters)
+    filename = f"customers_{datetime.now():%Y%m%d_%H%M%S}.{format}"
+    media_type = EXPORT_MEDIA_TYPES[format]
+
+    if format == "parquet":
+        _load_parquet()  # 501 sebelum header terkirim kalau pyarrow tidak ada
+        body = _stream_parquet(chunks, columns, "gzip" if gzip else "snappy")
+    elif format == "ndjson":
+        body = _stream_ndjson(chunks)
+    else:
+        body = _stream_csv(chunks, columns)
+    if gzip and format != "parquet":
+        body = _gzip_stream(body)
+        filename += ".gz"
+        media_type = "application/gzip"
+
+    return StreamingResponse(
+        body,
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
 
 
-@app.post("/save_customer/")
-def save_customer(data: Customer):
+@app.post("/save_customer/", status_code=status.HTTP_202_ACCEPTED)
+async def save_customer(data: Customer, request: Request):
+    """Terima booking ke antrean lokal dan balas 202 tanpa menunggu database.
+
+    Telepon dan tanggal dinormalisasi dulu supaya booking yang tidak valid
+    langsung ditolak, bukan gagal diam-diam di worker. Status pengiriman ke
+    database bisa dicek di `/bookings/{booking_id}`.
+    """
+    valid, invalid = _normalize_customer_batch([(0, data)])
+    if invalid:
+        raise HTTPException(status_code=422, detail=invalid[0]["error"])
+    customer = valid[0][1]
+    repo = request.app.state.repo
+    slot = slot_start(customer.delivery_date)
+
+    try:
+        reserved = await run_in_threadpool(reserve_slot, repo, slot)
+    except Error as e:
+        # Database tidak terjangkau: booking tetap diterima, slot dihitung saat
+        # antrean berhasil dikirim (kapasitas tidak dicek untuk booking ini)
+        logger.warning("Cek kapasitas slot dilewati: %s", e)
+        reserved = None
+    if reserved is False:
+        try:
+            alternatives = await run_in_threadpool(suggest_slots, repo, slot)
+        except Error:
+            alternatives = []
+        raise HTTPException(
+            status_code=409,
+            detail={
+                "message": f"❌ Slot pengiriman {slot:%Y-%m-%d %H:%M} sudah penuh.",
+                "alternatives": alternatives,
+            },
+        )
+
+    request.app.state.phone_cache.invalidate(customer.phone)
+    payload = customer.model_dump()
+    payload["slot_reserved"] = bool(reserved)
     try:
-        conn = mysql.connector.connect(**DB_CONFIG)
-        cursor = conn.cursor()
-        query = """
-            INSERT INTO customers (name, phone, address, delivery_date)
-            VALUES (%s, %s, %s, %s)
-        """
-        values = (data.name, data.phone, data.address, data.delivery_date)
-        cursor.execute(query, values)
-        conn.commit()
-        return {"message": "✅ Data berhasil disimpan ke database!"}
+        booking_id = await run_in_threadpool(
+            request.app.state.booking_queue.enqueue, payload
+        )
+    except Exception:
+        if reserved:
+            await run_in_threadpool(release_slots, repo, [slot])
+        raise
+    return {
+        "message": "✅ Data berhasil diterima dan sedang disimpan ke database!",
+        "booking_id": booking_id,
+        "status_url": f"/bookings/{booking_id}",
+    }
 
+
+@app.get("/slots")
+async def get_slots(
+    request: Request,
+    day: date = Query(..., alias="date", description="Tanggal pengiriman, mis. 2025-09-27"),
+):
+    """Sisa kapasitas setiap slot jam di satu tanggal, dibaca dari `delivery_slots`"""
+    try:
+        slots = await run_in_threadpool(day_availability, request.app.state.repo, day)
     except Error as e:
-        raise HTTPException(status_code=500, detail=f"MySQL Error: {str(e)}")
+        raise _database_error(request, e)
+    return {"date": day.isoformat(), "slots": slots}
+
+
+@app.get("/bookings/queue")
+async def get_booking_queue_stats(request: Request):
+    """Statistik antrean booking: jumlah tertunda, gagal, dan lag (detik)"""
+    return await run_in_threadpool(request.app.state.booking_queue.stats)
+
+
+@app.get("/bookings/{booking_id}")
+async def get_booking_status(booking_id: int, request: Request):
+    """Status satu booking di antrean: pending, processing, done, atau failed"""
+    booking = await run_in_threadpool(
+        request.app.state.booking_queue.status, booking_id
+    )
+    if booking is None:
+        raise HTTPException(status_code=404, detail="Booking tidak ditemukan")
+    return booking
+
+
+@app.post("/customers/bulk")
+async def bulk_save_customers(
+    request: Request,
+    batch_size: int = Query(BULK_BATCH_DEFAULT, ge=1, le=BULK_BATCH_MAX),
+):
+    """Simpan banyak customer sekaligus dari array JSON atau stream NDJSON.
+
+    Baris divalidasi dengan model `Customer`, telepon dinormalisasi ke E.164
+    dan tanggal kirim di-parse seperti di form, lalu ditulis per batch dalam
+    transaksi. Baris yang gagal validasi atau gagal disimpan dilaporkan di
+    `errors` berdasarkan posisinya (index mulai dari 0).
+    """
+    repo = request.app.state.repo
+    inserted = 0
+    errors = []
+    batch = []
+
+    async def flush():
+        nonlocal inserted, batch
+        valid, invalid = _normalize_customer_batch(batch)
+        errors.extend(invalid)
+        try:
+            count, batch_errors = await run_in_threadpool(
+                _insert_customer_batch, repo, valid
+            ) if valid else (0, [])
+        except Error as e:
+            count = 0
+            batch_errors = [
+                {"index": index, "error": f"{repo.label} Error: {e}"} for index, _ in valid
+            ]
+        inserted += count
+        errors.extend(batch_errors)
+        _invalidate_phones(request.app.state.phone_cache, [d.phone for _, d in valid])
+        batch = []
+
+    async for index, record in _iter_bulk_records(request):
+        if isinstance(record, ValueError):
+            errors.append({"index": index, "error": f"JSON tidak valid: {record}"})
+            continue
+        try:
+            data = Customer.model_validate(record)
+        except ValidationError as e:
+            errors.append({"index": index, "error": _format_validation_error(e)})
+            continue
+        batch.append((index, data))
+        if len(batch) >= batch_size:
+            await flush()
+
+    if batch:
+        await flush()
+
+    errors.sort(key=lambda e: e["index"])
+    return {
+        "message": f"✅ {inserted} data berhasil disimpan ke database!",
+        "inserted": inserted,
+        "failed": len(errors),
+        "errors": errors,
+    }
+
+
+@app.post("/customers/delete")
+async def delete_customers(data: DeleteCustomersRequest, request: Request):
+    """Soft delete customer berdasarkan `ids`, atau semua customer dengan `all=true`.
+
+    Baris hanya ditandai `deleted_at` per chunk transaksi kecil, sehingga
+    INSERT booking tidak tertahan; penghapusan fisik dikerjakan job purge
+    di background (progres di `/customers/purge`).
+    """
+    if not data.all and not data.ids:
+        raise HTTPException(status_code=422, detail="Isi `ids` atau kirim `all: true`")
+    if len(data.ids) > DELETE_IDS_MAX:
+        raise HTTPException(
+            status_code=422, detail=f"Maksimal {DELETE_IDS_MAX} id per request"
+        )
+
+    state = request.app.state
+    try:
+        if data.all:
+            deleted = await run_in_threadpool(soft_delete_all, state.repo)
+        else:
+            phones = await run_in_threadpool(soft_delete_ids, state.repo, data.ids)
+            deleted = len(phones)
+    except Error as e:
+        raise _database_error(request, e)
+
+    if data.all:
+        state.phone_cache.clear()
+    else:
+        _invalidate_phones(state.phone_cache, phones)
+    state.customer_purger.wake()
+    return {
+        "message": f"✅ {deleted} data customer berhasil dihapus!",
+        "deleted": deleted,
+        "purge": state.customer_purger.stats(),
+    }
+
+
+@app.get("/customers/purge")
+def get_purge_stats(request: Request):
+    """Progres job purge: sisa baris bertanda, jumlah terhapus, durasi chunk"""
+    return request.app.state.customer_purger.stats()
+
+
+@app.get("/customers/archive")
+def get_archive_stats(request: Request):
+    """Progres pemindahan arsip: sisa baris lama, jumlah dipindahkan, durasi chunk"""
+    return request.app.state.archive_mover.stats()
+
+
+@app.post("/customers/archive/run")
+async def run_archive(request: Request):
+    """Jalankan satu putaran pemindahan arsip sekarang dan tunggu sampai selesai"""
+    mover = request.app.state.archive_mover
+    if mover.after_days <= 0:
+        raise HTTPException(status_code=409, detail="Arsip nonaktif (ARCHIVE_AFTER_DAYS=0)")
+    if mover.running:
+        raise HTTPException(status_code=409, detail="Pemindahan arsip sedang berjalan")
+    try:
+        await mover.run_once()
+    except Error as e:
+        raise _database_error(request, e)
+    return mover.stats()
+
+
+@app.get("/stats")
+async def get_stats(
+    request: Request,
+    source: str = Query("summary", pattern="^(summary|live)$"),
+    include_archived: bool = False,
+):
+    """Statistik customer untuk tab Statistik di dashboard admin"""
+    try:
+        stats, used = await run_in_threadpool(
+            request.app.state.repo.customer_stats, source, include_archived
+        )
+    except Error as e:
+        raise _database_error(request, e)
+    stats["source"] = used
+    stats["include_archived"] = include_archived
+    return stats
+
+
+@app.post("/chat")
+async def chat(data: ChatRequest, request: Request, response: Response):
+    """Jawaban AI lengkap lewat penjadwal (batas in-flight, antrean adil, retry).
+
+    Selain `reply`, respons berisi posisi antrean saat request masuk
+    (`queue_depth`), lama menunggu slot (`wait_ms`) dan jumlah percobaan.
+    """
+    client = request.app.state.llm_client
+    if client is None:
+        raise HTTPException(status_code=503, detail="OpenAI client belum dikonfigurasi")
+
+    messages = _context_messages(data)
+    scheduler = request.app.state.chat_scheduler
+    try:
+        reply, ticket = await scheduler.run(
+            _chat_session_id(data, request),
+            lambda: acomplete(client, data.prompt, data.context, messages=messages),
+        )
+    except QueueFullError as e:
+        raise HTTPException(status_code=429, detail=str(e))
+    except asyncio.TimeoutError:
+        raise HTTPException(status_code=504, detail="AI tidak menjawab tepat waktu")
+    except OpenAIError as e:
+        raise HTTPException(status_code=502, detail=f"AI Error: {e}")
+
+    response.headers["X-Queue-Depth"] = str(ticket.queue_depth)
+    response.headers["X-Queue-Wait-Ms"] = str(round(ticket.wait * 1000, 1))
+    return {"reply": reply, **ticket.as_dict()}
+
+
+@app.post("/chat/stream")
+async def chat_stream(data: ChatRequest, request: Request):
+    """Jawaban AI sebagai Server-Sent Events.
+
+    Event `queued` pertama berisi info antrean, lalu setiap potongan teks
+    dikirim sebagai `data: {"delta": ...}`; event `done` terakhir berisi
+    time-to-first-token, durasi total dan jumlah percobaan. Streaming memakai
+    slot penjadwal, retry, dan batas waktu yang sama dengan `/chat`: rate limit
+    atau error sementara sebelum token pertama di-retry dengan backoff, setelah
+    token pertama tidak lagi. Kalau waktu habis di tengah jalan, stream ditutup
+    dengan event `error`.
+    """
+    client = request.app.state.llm_client
+    if client is None:
+        raise HTTPException(status_code=503, detail="OpenAI client belum dikonfigurasi")
+
+    messages = _context_messages(data)
+    scheduler = request.app.state.chat_scheduler
+
+    async def events():
+        # Batas waktu sama dengan `/chat`: antre + seluruh streaming
+        deadline = time.perf_counter() + scheduler.timeout
+        try:
+            async with scheduler.slot(_chat_session_id(data, request)) as ticket:
+                yield _sse_event(ticket.as_dict(), event="queued")
+                timers = []
+
+                def start():
+                    # Timer baru per percobaan supaya TTFT dihitung dari percobaan terakhir
+                    timers.append(StreamTimer())
+                    return astream_complete(
+                        client, data.prompt, data.context, timer=timers[-1],
+                        messages=messages,
+                    )
+
+                async for text in scheduler.stream(ticket, start, deadline):
+                    yield _sse_event({"delta": text})
+        except QueueFullError as e:
+            yield _sse_event({"error": str(e)}, event="error")
+            return
+        except asyncio.TimeoutError:
+            yield _sse_event({"error": "AI tidak menjawab tepat waktu"}, event="error")
+            return
+        except OpenAIError as e:
+            yield _sse_event({"error": f"AI Error: {e}"}, event="error")
+            return
+        yield _sse_event({**timers[-1].metrics, "attempts": ticket.attempts}, event="done")
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@app.get("/chat/scheduler")
+def get_chat_scheduler_stats(request: Request):
+    """Statistik penjadwal AI: in-flight, antrean, retry, dan timeout"""
+    return request.app.state.chat_scheduler.stats()
+
+
+@app.get("/db/pool")
+def get_pool_stats(request: Request):
+    """Statistik pool koneksi: koneksi terpakai, waktu tunggu, dan checkout gagal"""
+    return request.app.state.db_pool.stats()
+
 
-    finally:
-        if "conn" in locals() and conn.is_connected():
-            cursor.close()
-            conn.close()
+@app.get("/metrics", response_class=PlainTextResponse)
+def get_metrics(request: Request):
+    """Metrik format teks Prometheus: latensi per route, query DB, OpenAI,
+    ditambah gauge pool koneksi, penjadwal AI, antrean booking, cache telepon,
+    serta job purge dan arsip customer"""
+    state = request.app.state
+    body = (
+        REGISTRY.render()
+        + render_gauges("db_pool", state.db_pool.stats())
+        + render_gauges("chat_scheduler", state.chat_scheduler.stats())
+        + render_gauges("booking_queue", state.booking_queue.stats())
+        + render_gauges("phone_cache", state.phone_cache.stats())
+        + render_gauges("customer_purge", state.customer_purger.stats())
+        + render_gauges("customer_archive", state.archive_mover.stats())
+    )
+    return PlainTextResponse(body, media_type="text/plain; version=0.0.4")
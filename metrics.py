@@ -0,0 +1,246 @@
+"""Metrik performa ringan dalam format teks Prometheus, tanpa dependensi.
+
+Backend menyajikan `REGISTRY` di `GET /metrics`. Proses Streamlit tidak punya
+server HTTP sendiri, jadi metriknya ditulis ke file (`export_to_file`) yang
+bisa dibaca textfile collector node_exporter atau dibuka langsung.
+
+    @timed("customers_page")
+    def get_customers_page(...): ...
+"""
+import functools
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names, values, extra=()):
+    pairs = [f'{k}="{_escape(v)}"' for k, v in (*zip(names, values), *extra)]
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value):
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    def __init__(self, name, help, labels=()):
+        self.name = name
+        self.help = help
+        self.labels = tuple(labels)
+        self._lock = threading.Lock()
+        self._values = {}
+
+    def inc(self, amount=1, **labels):
+        key = tuple(str(labels[name]) for name in self.labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            for key, value in sorted(self._values.items()):
+                lines.append(f"{self.name}{_format_labels(self.labels, key)} {_format_value(value)}")
+        return lines
+
+
+class Histogram:
+    def __init__(self, name, help, labels=(), buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.help = help
+        self.labels = tuple(labels)
+        self.buckets = tuple(sorted(buckets)) + (float("inf"),)
+        self._lock = threading.Lock()
+        self._values = {}  # label -> [jumlah per bucket, sum, count]
+
+    def observe(self, value, **labels):
+        key = tuple(str(labels[name]) for name in self.labels)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = self._values[key] = [[0] * len(self.buckets), 0.0, 0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    state[0][i] += 1
+                    break
+            state[1] += value
+            state[2] += 1
+
+    @contextmanager
+    def time(self, **labels):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            for key, (counts, total, count) in sorted(self._values.items()):
+                cumulative = 0
+                for bound, n in zip(self.buckets, counts):
+                    cumulative += n
+                    labels = _format_labels(self.labels, key, (("le", _format_value(bound)),))
+                    lines.append(f"{self.name}_bucket{labels} {cumulative}")
+                labels = _format_labels(self.labels, key)
+                lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+                lines.append(f"{self.name}_count{labels} {count}")
+        return lines
+
+
+class Registry:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._metrics = {}
+
+    def _get_or_create(self, cls, name, *args, **kwargs):
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = cls(name, *args, **kwargs)
+            return metric
+
+    def counter(self, name, help, labels=()):
+        return self._get_or_create(Counter, name, help, labels)
+
+    def histogram(self, name, help, labels=(), buckets=DEFAULT_BUCKETS):
+        return self._get_or_create(Histogram, name, help, labels, buckets)
+
+    def render(self):
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+STAGE_SECONDS = REGISTRY.histogram(
+    "stage_seconds", "Durasi tahap kerja yang diukur dengan @timed", ("stage",)
+)
+
+
+def render_gauges(prefix, stats):
+    """Ubah dict statistik (mis. `pool.stats()`) menjadi gauge Prometheus"""
+    lines = []
+    for key, value in stats.items():
+        if isinstance(value, bool) or not isinstance(value, (int, float)):
+            continue
+        name = f"{prefix}_{key}"
+        lines.append(f"# TYPE {name} gauge")
+        lines.append(f"{name} {_format_value(value)}")
+    return "\n".join(lines) + "\n" if lines else ""
+
+
+class FileExporter:
+    """Tulis isi registry ke file paling sering setiap `interval` detik"""
+
+    def __init__(self, path, registry=REGISTRY, interval=5.0):
+        self.path = path
+        self.registry = registry
+        self.interval = interval
+        self._lock = threading.Lock()
+        self._last_flush = 0.0
+
+    def maybe_flush(self):
+        if time.monotonic() - self._last_flush >= self.interval:
+            self.flush()
+
+    def flush(self):
+        with self._lock:
+            self._last_flush = time.monotonic()
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                f.write(self.registry.render())
+            # Ganti atomik supaya pembaca tidak pernah melihat file setengah jadi
+            os.replace(tmp_path, self.path)
+
+
+_exporter = None
+
+
+def export_to_file(path, interval=5.0):
+    """Aktifkan ekspor file untuk proses ini; aman dipanggil di setiap rerun"""
+    global _exporter
+    if _exporter is None or _exporter.path != path:
+        _exporter = FileExporter(path, interval=interval)
+    return _exporter
+
+
+def record_stage(stage, seconds):
+    STAGE_SECONDS.observe(seconds, stage=stage)
+    if _exporter is not None:
+        try:
+            _exporter.maybe_flush()
+        except OSError:
+            pass  # metrik tidak boleh mengganggu aplikasi
+
+
+def timed(stage):
+    """Decorator pencatat durasi fungsi ke `stage_seconds{stage=...}`"""
+
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                record_stage(stage, time.perf_counter() - start)
+
+        return wrapper
+
+    return decorator
+
+
+class RequestTimingMiddleware:
+    """Middleware ASGI: histogram durasi request per route, method, dan status.
+
+    Durasi diukur sampai body selesai dikirim, jadi respons streaming
+    tercatat dengan durasi penuhnya.
+    """
+
+    def __init__(self, app, registry=REGISTRY):
+        self.app = app
+        self.histogram = registry.histogram(
+            "http_request_duration_seconds",
+            "Durasi request HTTP",
+            ("method", "route", "status"),
+        )
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        status = 500
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            # Template route (mis. /bookings/{booking_id}) supaya label tidak meledak
+            route = getattr(scope.get("route"), "path", "unmatched")
+            self.histogram.observe(
+                time.perf_counter() - start,
+                method=scope["method"],
+                route=route,
+                status=status,
+            )
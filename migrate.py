@@ -0,0 +1,134 @@
+"""Jalankan migrasi SQL berversi di folder `migrations/` secara berurutan.
+
+    python migrate.py            # terapkan semua migrasi yang belum jalan
+    python migrate.py --list     # tampilkan status setiap migrasi
+    python migrate.py --target 1 # terapkan sampai versi 001 saja
+
+Versi yang sudah diterapkan dicatat di tabel `schema_migrations`.
+"""
+import argparse
+import re
+from pathlib import Path
+
+import mysql.connector
+from mysql.connector import Error
+
+from db import DB_CONFIG
+
+MIGRATIONS_DIR = Path(__file__).resolve().parent / "migrations"
+MIGRATION_FILE = re.compile(r"^(\d{3})_(\w+)\.sql$")
+
+
+def load_migrations(directory=MIGRATIONS_DIR):
+    """Daftar (versi, nama, path) terurut berdasarkan versi"""
+    migrations = []
+    for path in sorted(directory.glob("*.sql")):
+        match = MIGRATION_FILE.match(path.name)
+        if match:
+            migrations.append((int(match.group(1)), match.group(2), path))
+    return migrations
+
+
+def split_statements(sql):
+    """Pisahkan isi file SQL per statement.
+
+    Statement diakhiri delimiter di akhir baris (default `;`). Seperti klien
+    `mysql`, baris `DELIMITER $$` mengganti delimiter supaya body trigger
+    `BEGIN ... END` yang berisi `;` tetap dianggap satu statement.
+    """
+    statements = []
+    current = []
+    delimiter = ";"
+    for line in sql.splitlines():
+        stripped = line.strip()
+        if not current and (not stripped or stripped.startswith("--")):
+            continue
+        if stripped.upper().startswith("DELIMITER "):
+            delimiter = stripped.split(None, 1)[1]
+            continue
+        current.append(line)
+        if stripped.endswith(delimiter):
+            statement = "\n".join(current).rstrip()
+            statements.append(statement[: -len(delimiter)].rstrip())
+            current = []
+    if current and "\n".join(current).strip():
+        statements.append("\n".join(current))
+    return statements
+
+
+def ensure_migrations_table(cursor):
+    cursor.execute(
+        """
+        CREATE TABLE IF NOT EXISTS schema_migrations (
+            version INT PRIMARY KEY,
+            name VARCHAR(255) NOT NULL,
+            applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+        """
+    )
+
+
+def applied_versions(cursor):
+    ensure_migrations_table(cursor)
+    cursor.execute("SELECT version FROM schema_migrations")
+    return {row[0] for row in cursor.fetchall()}
+
+
+def apply_migrations(conn, target=None, directory=MIGRATIONS_DIR):
+    """Terapkan migrasi yang belum jalan dan kembalikan daftar versinya.
+
+    DDL MySQL melakukan commit implisit, jadi setiap migrasi dicatat segera
+    setelah statement terakhirnya berhasil.
+    """
+    cursor = conn.cursor()
+    try:
+        done = applied_versions(cursor)
+        applied = []
+        for version, name, path in load_migrations(directory):
+            if version in done or (target is not None and version > target):
+                continue
+            for statement in split_statements(path.read_text(encoding="utf-8")):
+                cursor.execute(statement)
+            cursor.execute(
+                "INSERT INTO schema_migrations (version, name) VALUES (%s, %s)",
+                (version, name),
+            )
+            conn.commit()
+            applied.append(version)
+        return applied
+    finally:
+        cursor.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Migrasi schema database customer")
+    parser.add_argument("--list", action="store_true", help="Tampilkan status migrasi")
+    parser.add_argument("--target", type=int, help="Versi terakhir yang diterapkan")
+    args = parser.parse_args()
+
+    try:
+        conn = mysql.connector.connect(**DB_CONFIG)
+    except Error as err:
+        raise SystemExit(f"❌ Database Error: {err}")
+
+    try:
+        if args.list:
+            cursor = conn.cursor()
+            done = applied_versions(cursor)
+            cursor.close()
+            for version, name, _ in load_migrations():
+                status = "✅" if version in done else "⏳"
+                print(f"{status} {version:03d}_{name}")
+            return
+
+        applied = apply_migrations(conn, target=args.target)
+        if applied:
+            print("✅ Migrasi diterapkan: " + ", ".join(f"{v:03d}" for v in applied))
+        else:
+            print("✅ Schema sudah versi terbaru")
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,9 @@
+-- Index sekunder untuk pola query dashboard dan API:
+-- filter/statistik per tanggal kirim, hitung nomor unik, dan paging per created_at.
+-- InnoDB sudah menyertakan primary key (id) di setiap index sekunder,
+-- jadi ORDER BY created_at, id tetap bisa dilayani dari index.
+ALTER TABLE customers
+    ADD INDEX idx_customers_delivery_date (delivery_date),
+    ADD INDEX idx_customers_phone (phone),
+    ADD INDEX idx_customers_created_at (created_at),
+    ALGORITHM=INPLACE, LOCK=NONE;
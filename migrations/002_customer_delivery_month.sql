@@ -0,0 +1,9 @@
+-- Kolom bulan pengiriman untuk grafik "Pengiriman per Bulan".
+-- VIRTUAL supaya ADD COLUMN tidak menyalin tabel; nilainya tetap tersimpan di index.
+ALTER TABLE customers
+    ADD COLUMN delivery_month CHAR(7)
+        AS (DATE_FORMAT(delivery_date, '%Y-%m')) VIRTUAL;
+
+ALTER TABLE customers
+    ADD INDEX idx_customers_delivery_month (delivery_month),
+    ALGORITHM=INPLACE, LOCK=NONE;
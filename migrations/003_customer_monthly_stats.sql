@@ -0,0 +1,37 @@
+-- Ringkasan jumlah pengiriman per bulan yang dijaga trigger, supaya /stats
+-- tidak perlu memindai tabel customers untuk total dan grafik per bulan.
+CREATE TABLE customer_monthly_stats (
+    delivery_month CHAR(7) PRIMARY KEY,
+    total INT NOT NULL DEFAULT 0
+);
+
+CREATE TRIGGER customers_stats_after_insert AFTER INSERT ON customers
+FOR EACH ROW
+    INSERT INTO customer_monthly_stats (delivery_month, total)
+    VALUES (DATE_FORMAT(NEW.delivery_date, '%Y-%m'), 1)
+    ON DUPLICATE KEY UPDATE total = total + 1;
+
+CREATE TRIGGER customers_stats_after_delete AFTER DELETE ON customers
+FOR EACH ROW
+    UPDATE customer_monthly_stats SET total = total - 1
+    WHERE delivery_month = DATE_FORMAT(OLD.delivery_date, '%Y-%m');
+
+DELIMITER $$
+CREATE TRIGGER customers_stats_after_update AFTER UPDATE ON customers
+FOR EACH ROW
+BEGIN
+    IF DATE_FORMAT(OLD.delivery_date, '%Y-%m') <> DATE_FORMAT(NEW.delivery_date, '%Y-%m') THEN
+        UPDATE customer_monthly_stats SET total = total - 1
+        WHERE delivery_month = DATE_FORMAT(OLD.delivery_date, '%Y-%m');
+        INSERT INTO customer_monthly_stats (delivery_month, total)
+        VALUES (DATE_FORMAT(NEW.delivery_date, '%Y-%m'), 1)
+        ON DUPLICATE KEY UPDATE total = total + 1;
+    END IF;
+END$$
+DELIMITER ;
+
+-- Isi awal dijalankan setelah trigger aktif; nilai hasil hitung ulang
+-- menimpa hitungan trigger untuk baris yang masuk selama migrasi.
+INSERT INTO customer_monthly_stats (delivery_month, total)
+SELECT delivery_month, COUNT(*) FROM customers GROUP BY delivery_month
+ON DUPLICATE KEY UPDATE total = VALUES(total);
@@ -0,0 +1,34 @@
+-- Kapasitas slot pengiriman per jam (lihat slots.py). `booked` dinaikkan oleh
+-- aplikasi saat booking diterima; trigger di bawah hanya menyesuaikan hitungan
+-- saat customer dihapus atau jadwalnya diubah. `capacity` NULL = SLOT_CAPACITY.
+CREATE TABLE delivery_slots (
+    slot_start DATETIME PRIMARY KEY,
+    booked INT NOT NULL DEFAULT 0,
+    capacity INT NULL
+);
+
+CREATE TRIGGER customers_slots_after_delete AFTER DELETE ON customers
+FOR EACH ROW
+    UPDATE delivery_slots SET booked = booked - 1
+    WHERE slot_start = DATE_FORMAT(OLD.delivery_date, '%Y-%m-%d %H:00:00') AND booked > 0;
+
+DELIMITER $$
+CREATE TRIGGER customers_slots_after_update AFTER UPDATE ON customers
+FOR EACH ROW
+BEGIN
+    IF DATE_FORMAT(OLD.delivery_date, '%Y-%m-%d %H') <> DATE_FORMAT(NEW.delivery_date, '%Y-%m-%d %H') THEN
+        UPDATE delivery_slots SET booked = booked - 1
+        WHERE slot_start = DATE_FORMAT(OLD.delivery_date, '%Y-%m-%d %H:00:00') AND booked > 0;
+        INSERT INTO delivery_slots (slot_start, booked)
+        VALUES (DATE_FORMAT(NEW.delivery_date, '%Y-%m-%d %H:00:00'), 1)
+        ON DUPLICATE KEY UPDATE booked = booked + 1;
+    END IF;
+END$$
+DELIMITER ;
+
+-- Isi awal dari data yang sudah ada. Jalankan sebelum versi aplikasi yang
+-- memesan slot di-deploy, supaya tidak ada hitungan reservasi yang tertimpa.
+INSERT INTO delivery_slots (slot_start, booked)
+SELECT DATE_FORMAT(delivery_date, '%Y-%m-%d %H:00:00'), COUNT(*) FROM customers
+GROUP BY DATE_FORMAT(delivery_date, '%Y-%m-%d %H:00:00')
+ON DUPLICATE KEY UPDATE booked = VALUES(booked);
@@ -0,0 +1,79 @@
+-- Soft delete: baris ditandai `deleted_at` lalu dihapus fisik per chunk oleh
+-- job purge di backend (customer_purge.py). Baris bertanda tidak lagi muncul di
+-- list, export, lookup telepon, maupun statistik.
+ALTER TABLE customers
+    ADD COLUMN deleted_at DATETIME NULL DEFAULT NULL,
+    ALGORITHM=INSTANT;
+
+-- deleted_at ikut di index telepon dan tanggal kirim supaya query yang hanya
+-- membaca baris aktif tetap dilayani dari index (tanpa lookup ke baris);
+-- idx_customers_deleted_at dipakai job purge untuk mencari baris bertanda.
+ALTER TABLE customers
+    ADD INDEX idx_customers_phone_live (phone, deleted_at),
+    ADD INDEX idx_customers_delivery_date_live (delivery_date, deleted_at),
+    ADD INDEX idx_customers_deleted_at (deleted_at),
+    DROP INDEX idx_customers_phone,
+    DROP INDEX idx_customers_delivery_date,
+    ALGORITHM=INPLACE, LOCK=NONE;
+
+-- Trigger statistik dan slot dibuat ulang: soft delete (dan pemulihan dengan
+-- mengosongkan deleted_at) menyesuaikan hitungan, sedangkan DELETE fisik oleh
+-- purge tidak mengurangi lagi baris yang sudah bertanda.
+DROP TRIGGER customers_stats_after_delete;
+DROP TRIGGER customers_stats_after_update;
+DROP TRIGGER customers_slots_after_delete;
+DROP TRIGGER customers_slots_after_update;
+
+DELIMITER $$
+CREATE TRIGGER customers_stats_after_delete AFTER DELETE ON customers
+FOR EACH ROW
+BEGIN
+    IF OLD.deleted_at IS NULL THEN
+        UPDATE customer_monthly_stats SET total = total - 1
+        WHERE delivery_month = DATE_FORMAT(OLD.delivery_date, '%Y-%m');
+    END IF;
+END$$
+
+CREATE TRIGGER customers_stats_after_update AFTER UPDATE ON customers
+FOR EACH ROW
+BEGIN
+    IF (OLD.deleted_at IS NULL) <> (NEW.deleted_at IS NULL)
+        OR DATE_FORMAT(OLD.delivery_date, '%Y-%m') <> DATE_FORMAT(NEW.delivery_date, '%Y-%m') THEN
+        IF OLD.deleted_at IS NULL THEN
+            UPDATE customer_monthly_stats SET total = total - 1
+            WHERE delivery_month = DATE_FORMAT(OLD.delivery_date, '%Y-%m');
+        END IF;
+        IF NEW.deleted_at IS NULL THEN
+            INSERT INTO customer_monthly_stats (delivery_month, total)
+            VALUES (DATE_FORMAT(NEW.delivery_date, '%Y-%m'), 1)
+            ON DUPLICATE KEY UPDATE total = total + 1;
+        END IF;
+    END IF;
+END$$
+
+CREATE TRIGGER customers_slots_after_delete AFTER DELETE ON customers
+FOR EACH ROW
+BEGIN
+    IF OLD.deleted_at IS NULL THEN
+        UPDATE delivery_slots SET booked = booked - 1
+        WHERE slot_start = DATE_FORMAT(OLD.delivery_date, '%Y-%m-%d %H:00:00') AND booked > 0;
+    END IF;
+END$$
+
+CREATE TRIGGER customers_slots_after_update AFTER UPDATE ON customers
+FOR EACH ROW
+BEGIN
+    IF (OLD.deleted_at IS NULL) <> (NEW.deleted_at IS NULL)
+        OR DATE_FORMAT(OLD.delivery_date, '%Y-%m-%d %H') <> DATE_FORMAT(NEW.delivery_date, '%Y-%m-%d %H') THEN
+        IF OLD.deleted_at IS NULL THEN
+            UPDATE delivery_slots SET booked = booked - 1
+            WHERE slot_start = DATE_FORMAT(OLD.delivery_date, '%Y-%m-%d %H:00:00') AND booked > 0;
+        END IF;
+        IF NEW.deleted_at IS NULL THEN
+            INSERT INTO delivery_slots (slot_start, booked)
+            VALUES (DATE_FORMAT(NEW.delivery_date, '%Y-%m-%d %H:00:00'), 1)
+            ON DUPLICATE KEY UPDATE booked = booked + 1;
+        END IF;
+    END IF;
+END$$
+DELIMITER ;
@@ -0,0 +1,31 @@
+-- Arsip booking yang pengirimannya sudah lewat lebih dari ARCHIVE_AFTER_DAYS
+-- hari. Baris dipindahkan per chunk oleh customer_archive.py (INSERT ke sini
+-- lalu DELETE dari customers dalam satu transaksi), sehingga tabel customers
+-- dan index-nya tetap kecil. List dan statistik hanya membaca arsip kalau
+-- diminta (`include_archived=true`). `id` dipertahankan dari tabel customers.
+CREATE TABLE customers_archive (
+    id INT PRIMARY KEY,
+    name VARCHAR(255) NOT NULL,
+    phone VARCHAR(50) NOT NULL,
+    address TEXT NOT NULL,
+    delivery_date DATETIME NOT NULL,
+    created_at TIMESTAMP NULL,
+    archived_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    delivery_month CHAR(7) AS (DATE_FORMAT(delivery_date, '%Y-%m')) VIRTUAL,
+    INDEX idx_customers_archive_phone (phone),
+    INDEX idx_customers_archive_delivery_date (delivery_date),
+    INDEX idx_customers_archive_delivery_month (delivery_month)
+);
+
+-- Ringkasan per bulan untuk arsip. customer_monthly_stats tetap menghitung
+-- tabel customers saja (trigger DELETE menguranginya saat baris diarsipkan).
+CREATE TABLE customer_archive_monthly_stats (
+    delivery_month CHAR(7) PRIMARY KEY,
+    total INT NOT NULL DEFAULT 0
+);
+
+CREATE TRIGGER customers_archive_stats_after_insert AFTER INSERT ON customers_archive
+FOR EACH ROW
+    INSERT INTO customer_archive_monthly_stats (delivery_month, total)
+    VALUES (DATE_FORMAT(NEW.delivery_date, '%Y-%m'), 1)
+    ON DUPLICATE KEY UPDATE total = total + 1;
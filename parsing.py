@@ -0,0 +1,203 @@
+"""Parser tanggal pengiriman dan nomor telepon dari teks bebas.
+
+Semua pola dikompilasi sekali saat modul di-import, dan format dicoba dari
+yang paling murah:
+
+1. ISO `2025-09-27 17:00` / `2025-09-27` (format yang dikirim form dan API).
+2. Angka `27/09/2025 17.00`, `27-09-2025`.
+3. Nama bulan (lengkap atau singkat) `27 Sep 2025 jam 17.00 WITA`.
+4. Relatif `besok jam 10`, `lusa pukul 14.30`, `hari ini jam 3 sore`.
+
+Jam yang ditulis dengan WITA/WIT dikonversi ke WIB, zona waktu yang dipakai
+di database. Jam default 10:00 kalau tidak disebut. Nomor telepon
+dinormalisasi ke E.164 (`+628123456789`) dengan asumsi nomor lokal Indonesia.
+"""
+import re
+from datetime import datetime, timedelta
+
+DATE_FORMAT = "%Y-%m-%d %H:%M"
+DEFAULT_HOUR = 10
+MIN_YEAR, MAX_YEAR = 2000, 2100
+DEFAULT_COUNTRY_CODE = "62"
+
+MONTHS = {
+    "januari": 1, "jan": 1, "january": 1,
+    "februari": 2, "feb": 2, "pebruari": 2, "february": 2,
+    "maret": 3, "mar": 3, "march": 3,
+    "april": 4, "apr": 4,
+    "mei": 5, "may": 5,
+    "juni": 6, "jun": 6, "june": 6,
+    "juli": 7, "jul": 7, "july": 7,
+    "agustus": 8, "agu": 8, "agt": 8, "ags": 8, "agust": 8, "aug": 8, "august": 8,
+    "september": 9, "sep": 9, "sept": 9,
+    "oktober": 10, "okt": 10, "oct": 10, "october": 10,
+    "november": 11, "nov": 11, "nop": 11,
+    "desember": 12, "des": 12, "dec": 12, "december": 12,
+}
+
+# Selisih jam terhadap WIB (UTC+7)
+TIMEZONE_OFFSETS = {"wib": 0, "wita": 1, "wit": 2}
+
+RELATIVE_DAYS = {"hari ini": 0, "besok": 1, "lusa": 2}
+
+_TIME = r"(?:\s*,?\s*(?:jam|pukul|pkl\.?)?\s*(\d{1,2})(?:[.:](\d{2}))?\s*(pagi|siang|sore|malam)?)?"
+_TZ = r"(?:\s*(wib|wita|wit)\b)?"
+
+_ISO = re.compile(
+    r"(?<!\d)(\d{4})-(\d{1,2})-(\d{1,2})(?:[ t](\d{1,2})[.:](\d{2})(?::\d{2})?)?(?!\d)"
+)
+_NUMERIC = re.compile(r"\b(\d{1,2})[/\-.](\d{1,2})[/\-.](\d{4})\b" + _TIME + _TZ)
+_MONTH_NAME = re.compile(
+    r"\b(\d{1,2})\s+("
+    + "|".join(sorted(MONTHS, key=len, reverse=True))
+    + r")\.?(?:\s+(\d{4}))?\b"
+    + _TIME
+    + _TZ
+)
+_RELATIVE = re.compile(r"\b(hari ini|besok|lusa)\b" + _TIME + _TZ)
+
+_PHONE_CANDIDATE = re.compile(r"\+?\d[\d\s\-.()]{5,22}\d")
+# Tanggal seperti `27.09.2025` atau `05/10/25` juga cocok dengan pola nomor
+_DATE_LIKE = re.compile(r"(?<!\d)\d{1,2}[/\-.]\d{1,2}[/\-.]\d{2,4}(?!\d)")
+_NON_DIGIT = re.compile(r"\D")
+
+
+def _hour(hour, minute, period):
+    hour = int(hour) if hour else DEFAULT_HOUR
+    minute = int(minute) if minute else 0
+    if period == "malam" and (hour == 12 or hour < 6):
+        # "jam 12 malam" = 00:00, "jam 1 malam" = 01:00 (dini hari)
+        hour %= 12
+    elif period in ("siang", "sore", "malam") and hour < 12:
+        # "jam 1 siang" = 13:00, tapi "jam 11 siang" tetap 11:00
+        if period != "siang" or hour < 6:
+            hour += 12
+    return hour, minute
+
+
+def _build(year, month, day, hour, minute, period=None, tz=None):
+    if not MIN_YEAR <= int(year) <= MAX_YEAR:
+        return None
+    hour, minute = _hour(hour, minute, period)
+    try:
+        value = datetime(int(year), int(month), int(day), hour, minute)
+    except (TypeError, ValueError):
+        return None
+    if tz:
+        value -= timedelta(hours=TIMEZONE_OFFSETS[tz])
+    return value.strftime(DATE_FORMAT)
+
+
+def _year_for(day, month, now):
+    """Tahun terdekat ke depan untuk tanggal tanpa tahun"""
+    try:
+        candidate = datetime(now.year, month, int(day))
+    except ValueError:
+        return now.year
+    return now.year if candidate.date() >= now.date() else now.year + 1
+
+
+def extract_date(text, now=None):
+    """Ambil tanggal & jam pengiriman sebagai string `YYYY-MM-DD HH:MM` (WIB)"""
+    if not text:
+        return None
+    lowered = text.strip().lower()
+
+    match = _ISO.fullmatch(lowered)
+    if match:
+        year, month, day, hour, minute = match.groups()
+        return _build(year, month, day, hour, minute)
+
+    match = _NUMERIC.search(lowered)
+    if match:
+        day, month, year, hour, minute, period, tz = match.groups()
+        return _build(year, month, day, hour, minute, period, tz)
+
+    match = _MONTH_NAME.search(lowered)
+    if match:
+        day, month_name, year, hour, minute, period, tz = match.groups()
+        month = MONTHS[month_name]
+        if year is None:
+            year = _year_for(day, month, now or datetime.now())
+        return _build(year, month, day, hour, minute, period, tz)
+
+    match = _RELATIVE.search(lowered)
+    if match:
+        word, hour, minute, period, tz = match.groups()
+        day = (now or datetime.now()) + timedelta(days=RELATIVE_DAYS[word])
+        return _build(day.year, day.month, day.day, hour, minute, period, tz)
+
+    match = _ISO.search(lowered)
+    if match:
+        year, month, day, hour, minute = match.groups()
+        return _build(year, month, day, hour, minute)
+    return None
+
+
+def normalize_phone(text, country_code=DEFAULT_COUNTRY_CODE):
+    """Normalisasi satu nomor ke E.164, atau None kalau tidak valid"""
+    if not text:
+        return None
+    raw = text.strip()
+    if _DATE_LIKE.search(raw):
+        return None
+    digits = _NON_DIGIT.sub("", raw)
+    if raw.startswith("+"):
+        pass
+    elif raw.startswith("00"):
+        digits = digits[2:]
+    elif digits.startswith(country_code):
+        pass
+    elif digits.startswith("0"):
+        digits = country_code + digits[1:]
+    elif digits.startswith("8"):
+        digits = country_code + digits
+    else:
+        # Tanpa `+`/`0` nomor harus diawali kode negara atau awalan seluler
+        return None
+    if not 8 <= len(digits) <= 15:
+        return None
+    return "+" + digits
+
+
+def phone_variants(phone, country_code=DEFAULT_COUNTRY_CODE):
+    """Bentuk E.164 + bentuk lokal lama (`08...`, `628...`) untuk mencari data
+    yang tersimpan sebelum nomor dinormalisasi"""
+    variants = [phone, phone.lstrip("+")]
+    prefix = "+" + country_code
+    if phone.startswith(prefix):
+        variants.append("0" + phone[len(prefix):])
+    return variants
+
+
+def extract_phone(text, country_code=DEFAULT_COUNTRY_CODE):
+    """Cari nomor telepon pertama di dalam teks dan kembalikan dalam E.164"""
+    if not text:
+        return None
+    for match in _PHONE_CANDIDATE.finditer(_DATE_LIKE.sub(" ", text)):
+        phone = normalize_phone(match.group(0), country_code)
+        if phone:
+            return phone
+    return None
+
+
+def _batch(func, texts, *args):
+    # Bukan vektorisasi: tiap nilai tetap di-parse satu per satu, tetapi nilai
+    # yang sama (umum di impor partner) cukup di-parse sekali
+    seen = {}
+    results = []
+    for text in texts:
+        if text not in seen:
+            seen[text] = func(text, *args)
+        results.append(seen[text])
+    return results
+
+
+def parse_dates(texts, now=None):
+    """Mode batch `extract_date` untuk impor massal; urutan hasil = urutan input"""
+    return _batch(extract_date, texts, now or datetime.now())
+
+
+def normalize_phones(texts, country_code=DEFAULT_COUNTRY_CODE):
+    """Mode batch `extract_phone` untuk impor massal"""
+    return _batch(extract_phone, texts, country_code)
@@ -9,3 +9,6 @@ CREATE TABLE IF NOT EXISTS customers (
     delivery_date DATETIME NOT NULL,
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
 );
+
+-- Index dan kolom tambahan dikelola sebagai migrasi berversi di folder
+-- migrations/. Jalankan `python migrate.py` setelah membuat tabel ini.
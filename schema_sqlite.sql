@@ -0,0 +1,105 @@
+-- Schema SQLite untuk STORAGE_BACKEND=sqlite (lihat sqlite_db.py), setara
+-- schema.sql ditambah migrasi 001-006. Dijalankan setiap pool dibuka, jadi
+-- semua statement harus idempoten. Tanggal disimpan sebagai teks
+-- `YYYY-MM-DD HH:MM:SS` sehingga perbandingan dan substr() tetap benar.
+CREATE TABLE IF NOT EXISTS customers (
+    -- AUTOINCREMENT: id tidak dipakai ulang, karena arsip menyimpan id lama
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    name TEXT NOT NULL,
+    phone TEXT NOT NULL,
+    address TEXT NOT NULL,
+    delivery_date DATETIME NOT NULL,
+    created_at TIMESTAMP DEFAULT (datetime('now', 'localtime')),
+    deleted_at DATETIME NULL DEFAULT NULL,
+    delivery_month TEXT GENERATED ALWAYS AS (substr(delivery_date, 1, 7)) VIRTUAL
+);
+
+CREATE INDEX IF NOT EXISTS idx_customers_phone_live ON customers (phone, deleted_at);
+CREATE INDEX IF NOT EXISTS idx_customers_delivery_date_live ON customers (delivery_date, deleted_at);
+CREATE INDEX IF NOT EXISTS idx_customers_deleted_at ON customers (deleted_at);
+CREATE INDEX IF NOT EXISTS idx_customers_created_at ON customers (created_at);
+CREATE INDEX IF NOT EXISTS idx_customers_delivery_month ON customers (delivery_month);
+
+CREATE TABLE IF NOT EXISTS customer_monthly_stats (
+    delivery_month TEXT PRIMARY KEY,
+    total INTEGER NOT NULL DEFAULT 0
+);
+
+CREATE TABLE IF NOT EXISTS delivery_slots (
+    slot_start DATETIME PRIMARY KEY,
+    booked INTEGER NOT NULL DEFAULT 0,
+    capacity INTEGER NULL
+);
+
+CREATE TABLE IF NOT EXISTS customers_archive (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL,
+    phone TEXT NOT NULL,
+    address TEXT NOT NULL,
+    delivery_date DATETIME NOT NULL,
+    created_at TIMESTAMP NULL,
+    archived_at TIMESTAMP NOT NULL DEFAULT (datetime('now', 'localtime')),
+    delivery_month TEXT GENERATED ALWAYS AS (substr(delivery_date, 1, 7)) VIRTUAL
+);
+
+CREATE INDEX IF NOT EXISTS idx_customers_archive_phone ON customers_archive (phone);
+CREATE INDEX IF NOT EXISTS idx_customers_archive_delivery_date ON customers_archive (delivery_date);
+CREATE INDEX IF NOT EXISTS idx_customers_archive_delivery_month ON customers_archive (delivery_month);
+
+CREATE TABLE IF NOT EXISTS customer_archive_monthly_stats (
+    delivery_month TEXT PRIMARY KEY,
+    total INTEGER NOT NULL DEFAULT 0
+);
+
+-- Trigger statistik dan slot sama dengan migrasi 003-006: soft delete dan
+-- pemulihan menyesuaikan hitungan, DELETE fisik baris bertanda tidak.
+CREATE TRIGGER IF NOT EXISTS customers_stats_after_insert AFTER INSERT ON customers
+BEGIN
+    INSERT INTO customer_monthly_stats (delivery_month, total)
+    VALUES (substr(NEW.delivery_date, 1, 7), 1)
+    ON CONFLICT (delivery_month) DO UPDATE SET total = total + 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS customers_stats_after_delete AFTER DELETE ON customers
+WHEN OLD.deleted_at IS NULL
+BEGIN
+    UPDATE customer_monthly_stats SET total = total - 1
+    WHERE delivery_month = substr(OLD.delivery_date, 1, 7);
+END;
+
+CREATE TRIGGER IF NOT EXISTS customers_stats_after_update AFTER UPDATE ON customers
+WHEN (OLD.deleted_at IS NULL) <> (NEW.deleted_at IS NULL)
+    OR substr(OLD.delivery_date, 1, 7) <> substr(NEW.delivery_date, 1, 7)
+BEGIN
+    UPDATE customer_monthly_stats SET total = total - 1
+    WHERE delivery_month = substr(OLD.delivery_date, 1, 7) AND OLD.deleted_at IS NULL;
+    INSERT INTO customer_monthly_stats (delivery_month, total)
+    SELECT substr(NEW.delivery_date, 1, 7), 1 WHERE NEW.deleted_at IS NULL
+    ON CONFLICT (delivery_month) DO UPDATE SET total = total + 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS customers_slots_after_delete AFTER DELETE ON customers
+WHEN OLD.deleted_at IS NULL
+BEGIN
+    UPDATE delivery_slots SET booked = booked - 1
+    WHERE slot_start = strftime('%Y-%m-%d %H:00:00', OLD.delivery_date) AND booked > 0;
+END;
+
+CREATE TRIGGER IF NOT EXISTS customers_slots_after_update AFTER UPDATE ON customers
+WHEN (OLD.deleted_at IS NULL) <> (NEW.deleted_at IS NULL)
+    OR strftime('%Y-%m-%d %H', OLD.delivery_date) <> strftime('%Y-%m-%d %H', NEW.delivery_date)
+BEGIN
+    UPDATE delivery_slots SET booked = booked - 1
+    WHERE slot_start = strftime('%Y-%m-%d %H:00:00', OLD.delivery_date) AND booked > 0
+        AND OLD.deleted_at IS NULL;
+    INSERT INTO delivery_slots (slot_start, booked)
+    SELECT strftime('%Y-%m-%d %H:00:00', NEW.delivery_date), 1 WHERE NEW.deleted_at IS NULL
+    ON CONFLICT (slot_start) DO UPDATE SET booked = booked + 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS customers_archive_stats_after_insert AFTER INSERT ON customers_archive
+BEGIN
+    INSERT INTO customer_archive_monthly_stats (delivery_month, total)
+    VALUES (substr(NEW.delivery_date, 1, 7), 1)
+    ON CONFLICT (delivery_month) DO UPDATE SET total = total + 1;
+END;
@@ -0,0 +1,44 @@
+"""Entry point produksi untuk backend: beberapa proses worker uvicorn.
+
+    python serve.py                          # semua OS, worker = jumlah core
+    python serve.py --workers 4 --port 8000
+    gunicorn -c gunicorn.conf.py main:app    # Linux, worker dikelola gunicorn
+
+Setiap worker menjalankan lifespan `main.py` sendiri, jadi punya pool MySQL,
+penjadwal AI, dan worker antrean booking masing-masing. Total koneksi MySQL
+= jumlah worker x `DB_POOL_SIZE`; sesuaikan dengan `max_connections` server.
+"""
+import argparse
+import os
+
+HOST = os.getenv("HOST", "0.0.0.0")
+PORT = int(os.getenv("PORT", 8000))
+# Aplikasi async: satu worker per core sudah cukup untuk memakai semua CPU
+WORKERS = int(os.getenv("WEB_CONCURRENCY", os.cpu_count() or 1))
+# Detik menunggu request yang sedang berjalan (termasuk stream AI) saat shutdown
+GRACEFUL_TIMEOUT = int(os.getenv("GRACEFUL_TIMEOUT", 30))
+
+
+def main():
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description="Jalankan backend dengan beberapa worker")
+    parser.add_argument("--host", default=HOST)
+    parser.add_argument("--port", type=int, default=PORT)
+    parser.add_argument("--workers", type=int, default=WORKERS)
+    parser.add_argument("--access-log", action="store_true", help="Aktifkan access log uvicorn")
+    args = parser.parse_args()
+
+    uvicorn.run(
+        "main:app",
+        host=args.host,
+        port=args.port,
+        workers=args.workers,
+        timeout_graceful_shutdown=GRACEFUL_TIMEOUT,
+        access_log=args.access_log,
+        proxy_headers=True,
+    )
+
+
+if __name__ == "__main__":
+    main()
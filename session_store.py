@@ -0,0 +1,215 @@
+"""Penyimpanan state percakapan chat di luar proses Streamlit.
+
+State satu sesi (mode, step, data pesanan, riwayat pesan) disimpan sebagai
+satu record JSON ringkas yang dikunci dengan session id dari URL (`?sid=`).
+Setelah reconnect atau saat request jatuh ke replika lain, state dimuat ulang
+dari store pada rerun pertama saja, bukan disalin dari proses lain.
+
+Backend `memory` hanya bertahan selama proses hidup; `sqlite` bisa dipakai
+bersama oleh beberapa proses/replika yang memakai file yang sama.
+"""
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+import orjson
+
+MAX_MESSAGES = int(os.getenv("SESSION_MAX_MESSAGES", 50))
+MAX_SESSIONS = int(os.getenv("SESSION_MAX_SESSIONS", 10000))
+SESSION_TTL = int(os.getenv("SESSION_TTL", 7 * 86400))
+
+# Pesan disimpan sebagai [kode role, isi] supaya record tetap kecil
+_ROLE_CODES = {"user": "u", "assistant": "a", "system": "s"}
+_ROLE_NAMES = {code: role for role, code in _ROLE_CODES.items()}
+
+
+def trim_messages(messages, limit=MAX_MESSAGES):
+    """Buang pesan tertua; ringkasan konteks AI menangani giliran yang hilang"""
+    return messages[-limit:] if len(messages) > limit else messages
+
+
+def encode_state(state):
+    record = dict(state)
+    record["messages"] = [
+        [_ROLE_CODES.get(m["role"], m["role"]), m["content"]]
+        for m in trim_messages(state.get("messages") or [])
+    ]
+    return orjson.dumps(record)
+
+
+def decode_state(data):
+    record = orjson.loads(data)
+    record["messages"] = [
+        {"role": _ROLE_NAMES.get(role, role), "content": content}
+        for role, content in record.get("messages") or []
+    ]
+    return record
+
+
+class MemorySessionStore:
+    """Store LRU di memori proses, dengan TTL sejak terakhir dipakai"""
+
+    def __init__(self, max_sessions=MAX_SESSIONS, ttl=SESSION_TTL):
+        self.max_sessions = max_sessions
+        self.ttl = ttl
+        self._sessions = OrderedDict()
+        self._lock = threading.Lock()
+
+    def load(self, session_id):
+        with self._lock:
+            entry = self._sessions.get(session_id)
+            if entry is None:
+                return None
+            data, updated_at = entry
+            if updated_at + self.ttl <= time.time():
+                del self._sessions[session_id]
+                return None
+            self._sessions.move_to_end(session_id)
+            return data
+
+    def save(self, session_id, data):
+        with self._lock:
+            self._sessions[session_id] = (data, time.time())
+            self._sessions.move_to_end(session_id)
+            while len(self._sessions) > self.max_sessions:
+                self._sessions.popitem(last=False)
+
+    def delete(self, session_id):
+        with self._lock:
+            self._sessions.pop(session_id, None)
+
+    def __len__(self):
+        return len(self._sessions)
+
+
+class SQLiteSessionStore:
+    """Store di file SQLite (WAL) yang bisa dibaca beberapa proses sekaligus"""
+
+    PURGE_EVERY = 500  # jalankan pembersihan setiap N kali simpan
+
+    def __init__(self, path="sessions.sqlite3", max_sessions=MAX_SESSIONS, ttl=SESSION_TTL):
+        self.path = path
+        self.max_sessions = max_sessions
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._saves = 0
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS chat_sessions (
+                id TEXT PRIMARY KEY,
+                data BLOB NOT NULL,
+                updated_at REAL NOT NULL
+            )
+            """
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_chat_sessions_updated_at"
+            " ON chat_sessions (updated_at)"
+        )
+
+    def load(self, session_id):
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT data FROM chat_sessions WHERE id = ? AND updated_at > ?",
+                (session_id, time.time() - self.ttl),
+            ).fetchone()
+        return row[0] if row else None
+
+    def save(self, session_id, data):
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO chat_sessions (id, data, updated_at) VALUES (?, ?, ?)"
+                " ON CONFLICT(id) DO UPDATE SET data = excluded.data,"
+                " updated_at = excluded.updated_at",
+                (session_id, data, time.time()),
+            )
+            self._saves += 1
+            if self._saves % self.PURGE_EVERY == 0:
+                self._purge()
+
+    def _purge(self):
+        self._conn.execute(
+            "DELETE FROM chat_sessions WHERE updated_at <= ?", (time.time() - self.ttl,)
+        )
+        self._conn.execute(
+            "DELETE FROM chat_sessions WHERE id IN ("
+            " SELECT id FROM chat_sessions ORDER BY updated_at DESC LIMIT -1 OFFSET ?)",
+            (self.max_sessions,),
+        )
+
+    def delete(self, session_id):
+        with self._lock:
+            self._conn.execute("DELETE FROM chat_sessions WHERE id = ?", (session_id,))
+
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM chat_sessions").fetchone()[0]
+
+
+class SessionStore:
+    """Simpan/muat state sesi lewat backend; tulis hanya kalau isinya berubah"""
+
+    def __init__(self, backend, max_snapshots=MAX_SESSIONS):
+        self.backend = backend
+        self.max_snapshots = max_snapshots
+        self._last_saved = OrderedDict()  # snapshot terakhir per sesi, untuk cek perubahan
+        self._lock = threading.Lock()
+        self.loads = 0
+        self.saves = 0
+        self.skipped = 0
+
+    def load(self, session_id):
+        data = self.backend.load(session_id)
+        with self._lock:
+            self.loads += 1
+            if data is not None:
+                self._remember(session_id, data)
+        return decode_state(data) if data is not None else None
+
+    def save(self, session_id, state):
+        data = encode_state(state)
+        with self._lock:
+            if self._last_saved.get(session_id) == data:
+                self.skipped += 1
+                return False
+            self._remember(session_id, data)
+            self.saves += 1
+        self.backend.save(session_id, data)
+        return True
+
+    def _remember(self, session_id, data):
+        self._last_saved[session_id] = data
+        self._last_saved.move_to_end(session_id)
+        while len(self._last_saved) > self.max_snapshots:
+            self._last_saved.popitem(last=False)
+
+    def delete(self, session_id):
+        with self._lock:
+            self._last_saved.pop(session_id, None)
+        self.backend.delete(session_id)
+
+    def stats(self):
+        with self._lock:
+            return {
+                "backend": type(self.backend).__name__,
+                "sessions": len(self.backend),
+                "loads": self.loads,
+                "saves": self.saves,
+                "skipped_unchanged": self.skipped,
+            }
+
+
+def create_session_store(backend=None, path=None):
+    """Buat store dari argumen atau env `SESSION_STORE_BACKEND`/`SESSION_STORE_PATH`"""
+    backend = backend or os.getenv("SESSION_STORE_BACKEND", "memory")
+    if backend == "sqlite":
+        path = path or os.getenv("SESSION_STORE_PATH", "sessions.sqlite3")
+        return SessionStore(SQLiteSessionStore(path))
+    if backend == "memory":
+        return SessionStore(MemorySessionStore())
+    raise ValueError(f"SESSION_STORE_BACKEND tidak dikenal: {backend}")
@@ -0,0 +1,84 @@
+"""Kapasitas slot pengiriman per jam, dijaga di tabel `delivery_slots`.
+
+`booked` menghitung booking yang memegang slot: baris di `customers` plus
+booking yang sudah diterima tetapi masih di antrean lokal. Slot dipesan saat
+`/save_customer/` dengan satu UPDATE bersyarat, jadi dua request bersamaan
+tidak bisa sama-sama mengambil kursi terakhir (row lock InnoDB; di SQLite
+transaksi tulis memang berjalan satu per satu). Hapus dan ubah jadwal di
+`customers` disesuaikan oleh trigger (migrasi 004). SQL-nya ada di storage.py.
+"""
+import os
+from datetime import datetime, timedelta
+
+SLOT_CAPACITY = int(os.getenv("SLOT_CAPACITY", 10))  # pengiriman per jam
+SLOT_FIRST_HOUR = int(os.getenv("SLOT_FIRST_HOUR", 8))
+SLOT_LAST_HOUR = int(os.getenv("SLOT_LAST_HOUR", 20))  # slot terakhir 20:00-21:00
+SUGGESTION_COUNT = 3
+SUGGESTION_DAYS = 7
+
+SLOT_FORMAT = "%Y-%m-%d %H:%M"
+
+
+def slot_start(delivery_date):
+    """Awal slot (jam penuh) untuk string `YYYY-MM-DD HH:MM`"""
+    value = datetime.strptime(delivery_date[:16], SLOT_FORMAT)
+    return value.replace(minute=0)
+
+
+def reserve_slot(repo, slot):
+    """Ambil satu kursi di slot; False kalau slot sudah penuh"""
+    return repo.reserve_slot(slot, SLOT_CAPACITY)
+
+
+def release_slots(repo, slots):
+    """Kembalikan kursi milik booking yang akhirnya tidak tersimpan"""
+    repo.release_slots(slots)
+
+
+def _fetch_slots(repo, start, end):
+    return repo.slot_counts(start, end, SLOT_CAPACITY)
+
+
+def _service_hours(day):
+    for hour in range(SLOT_FIRST_HOUR, SLOT_LAST_HOUR + 1):
+        yield day.replace(hour=hour, minute=0, second=0, microsecond=0)
+
+
+def day_availability(repo, day):
+    """Ketersediaan setiap slot jam layanan di satu tanggal (satu range scan PK)"""
+    start = datetime(day.year, day.month, day.day)
+    rows = _fetch_slots(repo, start, start + timedelta(days=1))
+    slots = []
+    for slot in _service_hours(start):
+        booked, capacity = rows.pop(slot, (0, SLOT_CAPACITY))
+        slots.append(_slot_info(slot, booked, capacity))
+    # Booking di luar jam layanan (mis. impor) tetap ditampilkan
+    for slot, (booked, capacity) in sorted(rows.items()):
+        slots.append(_slot_info(slot, booked, capacity))
+    return slots
+
+
+def _slot_info(slot, booked, capacity):
+    return {
+        "start": slot.strftime(SLOT_FORMAT),
+        "booked": booked,
+        "capacity": capacity,
+        "available": max(capacity - booked, 0),
+    }
+
+
+def suggest_slots(repo, slot, count=SUGGESTION_COUNT):
+    """Slot terdekat setelah `slot` yang masih punya kursi (jam layanan saja)"""
+    day = datetime(slot.year, slot.month, slot.day)
+    rows = _fetch_slots(repo, slot, day + timedelta(days=SUGGESTION_DAYS))
+    suggestions = []
+    for offset in range(SUGGESTION_DAYS):
+        for candidate in _service_hours(day + timedelta(days=offset)):
+            if candidate <= slot:
+                continue
+            booked, capacity = rows.get(candidate, (0, SLOT_CAPACITY))
+            if booked < capacity:
+                suggestions.append(_slot_info(candidate, booked, capacity))
+                if len(suggestions) >= count:
+                    return suggestions
+    return suggestions
@@ -0,0 +1,217 @@
+"""Pool koneksi SQLite (mode WAL) untuk `STORAGE_BACKEND=sqlite`.
+
+Koneksi meniru bagian antarmuka mysql-connector yang dipakai repository
+(`storage.py`), supaya SQL dan penanganan error di atasnya sama untuk kedua
+backend:
+
+* placeholder `%s` ditulis ulang menjadi `?`
+* `cursor(dictionary=True)` menghasilkan dict per baris
+* kolom `DATETIME`/`TIMESTAMP` dibaca sebagai `datetime`
+* statement tulis pertama membuka `BEGIN IMMEDIATE`, dan `SELECT ... FOR UPDATE`
+  menjadi kunci tulis yang sama (SQLite hanya punya satu penulis per file);
+  baca di luar transaksi berjalan autocommit
+* `sqlite3.Error` diterjemahkan ke kelas error mysql-connector
+
+Schema (`schema_sqlite.sql`) dibuat saat koneksi pertama dibuka, jadi tidak
+perlu `migrate.py`. Mode WAL membuat pembaca tidak menunggu penulis, dan file
+yang sama bisa dipakai beberapa worker di satu host.
+"""
+import os
+import re
+import sqlite3
+import threading
+from datetime import date, datetime
+from functools import lru_cache
+from pathlib import Path
+
+from mysql.connector import errorcode, errors
+
+from db import DB_CONNECT_SECONDS, POOL_SIZE, POOL_TIMEOUT, ConnectionPool
+
+SQLITE_PATH = os.getenv("SQLITE_DB_PATH", "cs_chatbot.sqlite3")
+# FULL: setiap commit di-fsync seperti InnoDB default; NORMAL lebih cepat tetapi
+# transaksi terakhir bisa hilang saat listrik mati (file tetap utuh)
+SQLITE_SYNCHRONOUS = os.getenv("SQLITE_SYNCHRONOUS", "FULL")
+SCHEMA_PATH = Path(__file__).resolve().parent / "schema_sqlite.sql"
+
+WRITE_STATEMENTS = ("INSERT", "UPDATE", "DELETE", "REPLACE")
+FOR_UPDATE = re.compile(r"\s+FOR\s+UPDATE\s*$", re.IGNORECASE)
+
+# Tanggal disimpan sebagai teks `YYYY-MM-DD HH:MM:SS` yang urut secara leksikal
+sqlite3.register_adapter(datetime, lambda value: value.isoformat(" "))
+sqlite3.register_adapter(date, lambda value: value.isoformat())
+sqlite3.register_converter("DATETIME", lambda value: datetime.fromisoformat(value.decode()))
+sqlite3.register_converter("TIMESTAMP", lambda value: datetime.fromisoformat(value.decode()))
+
+
+@lru_cache(maxsize=256)
+def _translate(query):
+    """SQL gaya mysql-connector -> (SQL SQLite, apakah butuh kunci tulis)"""
+    query, locks = FOR_UPDATE.subn("", query.strip())
+    write = bool(locks) or query.split(None, 1)[0].upper() in WRITE_STATEMENTS
+    return query.replace("%s", "?"), write
+
+
+def _database_error(err):
+    """Padanan mysql-connector untuk `sqlite3.Error`"""
+    message = str(err)
+    if isinstance(err, sqlite3.IntegrityError):
+        return errors.IntegrityError(msg=message)
+    if isinstance(err, sqlite3.OperationalError):
+        if message.startswith("no such table"):
+            return errors.ProgrammingError(msg=message, errno=errorcode.ER_NO_SUCH_TABLE)
+        if "locked" in message or "busy" in message:
+            return errors.OperationalError(msg=message, errno=errorcode.ER_LOCK_WAIT_TIMEOUT)
+        return errors.OperationalError(msg=message)
+    if isinstance(err, sqlite3.DataError):
+        return errors.DataError(msg=message)
+    if isinstance(err, (sqlite3.ProgrammingError, sqlite3.InterfaceError)):
+        return errors.ProgrammingError(msg=message)
+    return errors.DatabaseError(msg=message)
+
+
+def _dict_row(cursor, row):
+    return dict(zip([column[0] for column in cursor.description], row))
+
+
+class SQLiteCursor:
+    def __init__(self, conn, dictionary=False):
+        self._conn = conn
+        self._cursor = conn.raw.cursor()
+        if dictionary:
+            self._cursor.row_factory = _dict_row
+
+    @property
+    def rowcount(self):
+        return self._cursor.rowcount
+
+    @property
+    def description(self):
+        return self._cursor.description
+
+    def execute(self, query, params=()):
+        query, write = _translate(query)
+        try:
+            if write:
+                self._conn.begin()
+            self._cursor.execute(query, params)
+        except sqlite3.Error as err:
+            raise _database_error(err) from err
+
+    def executemany(self, query, seq_params):
+        query, write = _translate(query)
+        try:
+            if write:
+                self._conn.begin()
+            self._cursor.executemany(query, seq_params)
+        except sqlite3.Error as err:
+            raise _database_error(err) from err
+
+    def fetchone(self):
+        return self._cursor.fetchone()
+
+    def fetchmany(self, size):
+        return self._cursor.fetchmany(size)
+
+    def fetchall(self):
+        return self._cursor.fetchall()
+
+    def close(self):
+        self._cursor.close()
+
+
+class SQLiteConnection:
+    """Koneksi pinjaman dari `SQLitePool`; `close()` mengembalikannya ke pool"""
+
+    def __init__(self, pool, raw):
+        self._pool = pool
+        self.raw = raw
+
+    def cursor(self, dictionary=False):
+        return SQLiteCursor(self, dictionary)
+
+    def begin(self):
+        if not self.raw.in_transaction:
+            # IMMEDIATE: kunci tulis diambil di awal, bukan saat upgrade dari baca
+            # (yang langsung gagal kalau snapshot sudah basi)
+            self.raw.execute("BEGIN IMMEDIATE")
+
+    def commit(self):
+        try:
+            self.raw.commit()
+        except sqlite3.Error as err:
+            raise _database_error(err) from err
+
+    def rollback(self):
+        self.raw.rollback()
+
+    def close(self):
+        if self.raw.in_transaction:
+            self.raw.rollback()
+        self._pool.release(self.raw)
+
+
+class SQLitePool:
+    """Koneksi SQLite yang dipakai ulang antar thread; jumlah peminjam dibatasi
+    semaphore `ConnectionPool`, jadi pool ini cukup menyimpan koneksi menganggur"""
+
+    def __init__(self, path, busy_timeout):
+        self.path = path
+        self.busy_timeout = busy_timeout
+        self._lock = threading.Lock()
+        self._idle = []
+        self.release(self._connect(create_schema=True))
+
+    def _connect(self, create_schema=False):
+        try:
+            raw = sqlite3.connect(
+                self.path,
+                timeout=self.busy_timeout,
+                detect_types=sqlite3.PARSE_DECLTYPES,
+                isolation_level=None,  # transaksi dibuka sendiri oleh SQLiteConnection
+                check_same_thread=False,
+            )
+            raw.execute("PRAGMA journal_mode=WAL")
+            raw.execute(f"PRAGMA synchronous={SQLITE_SYNCHRONOUS}")
+            if create_schema:
+                raw.executescript(SCHEMA_PATH.read_text(encoding="utf-8"))
+        except sqlite3.Error as err:
+            raise _database_error(err) from err
+        return raw
+
+    def get_connection(self):
+        with self._lock:
+            raw = self._idle.pop() if self._idle else None
+        return SQLiteConnection(self, raw or self._connect())
+
+    def release(self, raw):
+        with self._lock:
+            self._idle.append(raw)
+
+    def close(self):
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for raw in idle:
+            raw.close()
+
+
+class SQLiteConnectionPool(ConnectionPool):
+    """`ConnectionPool` dengan file SQLite (statistik checkout dan batas koneksi sama)"""
+
+    def __init__(self, path=SQLITE_PATH, size=POOL_SIZE, timeout=POOL_TIMEOUT,
+                 name="cs_chatbot_sqlite"):
+        super().__init__(size=size, timeout=timeout, name=name)
+        self.path = path
+
+    def open(self):
+        with self._pool_lock:
+            if self._pool is None:
+                with DB_CONNECT_SECONDS.time():
+                    self._pool = SQLitePool(self.path, self.timeout)
+        return self._pool
+
+    def close(self):
+        with self._pool_lock:
+            if self._pool is not None:
+                self._pool.close()
+                self._pool = None
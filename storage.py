@@ -0,0 +1,523 @@
+"""Repository data customer, slot pengiriman, purge dan arsip.
+
+Semua SQL yang dipakai main.py, chatbot_app.py, slots.py dan job background
+ada di sini, di atas pool dengan antarmuka `db.ConnectionPool`.
+`STORAGE_BACKEND` memilih implementasinya:
+
+* `mysql` (default): server MySQL lewat pool mysql-connector (`db.py`)
+* `sqlite`: satu file SQLite mode WAL (`sqlite_db.py`), untuk deployment kecil
+  atau menjalankan seluruh stack tanpa server MySQL
+
+Kedua backend melempar kelas error mysql-connector (`mysql.connector.Error`),
+jadi pemanggil tidak perlu tahu backend mana yang aktif.
+"""
+import os
+
+from mysql.connector import Error, errorcode
+
+from metrics import REGISTRY
+
+STORAGE_BACKEND = os.getenv("STORAGE_BACKEND", "mysql")
+
+CUSTOMER_COLUMNS = ("id", "name", "phone", "address", "delivery_date", "created_at")
+STREAM_CHUNK_SIZE = 500
+
+DB_QUERY_SECONDS = REGISTRY.histogram(
+    "db_query_seconds", "Durasi query database per jenis query", ("query",)
+)
+
+PHONE_LOOKUP_QUERIES = (
+    ("customers", "AND deleted_at IS NULL"),  # idx_customers_phone_live
+    ("customers_archive", ""),  # customer lama yang semua bookingnya sudah diarsipkan
+)
+
+
+def _customer_tables(filters):
+    """Tabel yang dibaca: data aktif saja, atau ditambah arsip kalau diminta"""
+    if filters.get("include_archived"):
+        return ("customers", "customers_archive")
+    return ("customers",)
+
+
+def _build_customer_query(columns, filters, cursor=None, limit=None, table="customers"):
+    # Tabel arsip tidak punya soft delete; barisnya selalu aktif
+    clauses = ["deleted_at IS NULL"] if table == "customers" else []
+    params = []
+    conditions = (
+        ("delivery_date >= %s", filters.get("delivery_from")),
+        ("delivery_date <= %s", filters.get("delivery_to")),
+        ("created_at >= %s", filters.get("created_from")),
+        ("created_at <= %s", filters.get("created_to")),
+        ("id < %s", cursor),
+    )
+    for clause, value in conditions:
+        if value is not None:
+            clauses.append(clause)
+            params.append(value)
+    phones = filters.get("phones")
+    if phones:
+        clauses.append(f"phone IN ({_placeholders(phones)})")
+        params.extend(phones)
+
+    query = f"SELECT {', '.join(columns)} FROM {table}"
+    if clauses:
+        query += " WHERE " + " AND ".join(clauses)
+    query += " ORDER BY id DESC"
+    if limit is not None:
+        query += " LIMIT %s"
+        params.append(limit)
+    return query, tuple(params)
+
+
+def _placeholders(values):
+    return ", ".join(["%s"] * len(values))
+
+
+class CustomerRepository:
+    """SQL yang sama di kedua backend; subclass mengisi bagian yang beda dialek"""
+
+    label = None  # nama backend di pesan error
+    NOW = None
+    TODAY = None
+    INSERT_CUSTOMER = None
+    INSERT_EMPTY_SLOT = None  # baris slot baru (booked 0); abaikan kalau sudah ada
+    ADD_SLOT_BOOKINGS = None  # tambah `booked` per slot, buat barisnya kalau belum ada
+    PURGE_DELETED = None  # hapus fisik paling banyak N baris bertanda, urut deleted_at
+
+    def __init__(self, pool):
+        self.pool = pool
+
+    def open(self):
+        return self.pool.open()
+
+    def close(self):
+        self.pool.close()
+
+    def _transaction(self, func):
+        with self.pool.connection() as conn:
+            cursor = conn.cursor()
+            try:
+                result = func(cursor)
+                conn.commit()
+                return result
+            except BaseException:
+                conn.rollback()
+                raise
+            finally:
+                cursor.close()
+
+    def _discard_unread(self, conn):
+        """Buang sisa hasil query sebelum koneksi dikembalikan ke pool"""
+
+    def ping(self):
+        with self.pool.connection() as conn:
+            cursor = conn.cursor()
+            try:
+                cursor.execute("SELECT 1")
+                cursor.fetchall()
+            finally:
+                cursor.close()
+
+    # CUSTOMERS
+    def customers_page(self, columns, filters, cursor, limit):
+        """Satu halaman keyset; dengan arsip, kedua tabel diambil `limit` baris lalu
+        digabung berdasarkan id (id arsip sama dengan id aslinya)"""
+        tables = _customer_tables(filters)
+        rows = []
+        with self.pool.connection() as conn:
+            cur = conn.cursor(dictionary=True)
+            try:
+                with DB_QUERY_SECONDS.time(query="customers_page"):
+                    for table in tables:
+                        query, params = _build_customer_query(columns, filters, cursor, limit, table)
+                        cur.execute(query, params)
+                        rows.extend(cur.fetchall())
+            finally:
+                cur.close()
+        if len(tables) > 1:
+            rows.sort(key=lambda row: row["id"], reverse=True)
+            del rows[limit:]
+        return rows
+
+    def iter_customers(self, columns, filters, cursor=None, chunk_size=STREAM_CHUNK_SIZE):
+        """Baca baris per chunk tanpa memuat seluruh hasil ke memori.
+
+        Dengan arsip, baris aktif dialirkan dulu lalu baris arsip (tanpa sort
+        gabungan di server).
+        """
+        with self.pool.connection() as conn:
+            cur = conn.cursor(dictionary=True)
+            try:
+                for table in _customer_tables(filters):
+                    query, params = _build_customer_query(columns, filters, cursor, table=table)
+                    # Hanya sampai baris pertama siap; pembacaan chunk ikut laju klien
+                    with DB_QUERY_SECONDS.time(query="customers_stream"):
+                        cur.execute(query, params)
+                    while True:
+                        rows = cur.fetchmany(chunk_size)
+                        if not rows:
+                            break
+                        yield rows
+            finally:
+                # Klien bisa putus di tengah jalan
+                self._discard_unread(conn)
+                cur.close()
+
+    def customer_by_phone(self, variants):
+        """Data terakhir customer dengan salah satu nomor ini; arsip hanya dibaca
+        kalau tidak ada booking aktif"""
+        with self.pool.connection() as conn:
+            cur = conn.cursor(dictionary=True)
+            try:
+                with DB_QUERY_SECONDS.time(query="customer_by_phone"):
+                    for table, extra in PHONE_LOOKUP_QUERIES:
+                        cur.execute(
+                            "SELECT id, name, phone, address, delivery_date AS last_delivery_date"
+                            f" FROM {table} WHERE phone IN ({_placeholders(variants)}) {extra}"
+                            " ORDER BY id DESC LIMIT 1",
+                            tuple(variants),
+                        )
+                        row = cur.fetchone()
+                        if row:
+                            return row
+                    return None
+            finally:
+                cur.close()
+
+    def insert_customers(self, rows):
+        """Simpan baris `(index, (name, phone, address, delivery_date), slot)` dalam
+        satu transaksi.
+
+        Slot yang tidak None ikut dihitung di transaksi yang sama. Kalau batch
+        gagal, transaksi di-rollback lalu baris disimpan satu per satu supaya
+        baris yang bermasalah bisa dilaporkan. Mengembalikan (jumlah tersimpan,
+        daftar error per baris).
+        """
+        with self.pool.connection() as conn, DB_QUERY_SECONDS.time(query="insert_batch"):
+            cursor = conn.cursor()
+            try:
+                try:
+                    cursor.executemany(self.INSERT_CUSTOMER, [values for _, values, _ in rows])
+                    self._count_slots(cursor, [slot for _, _, slot in rows if slot is not None])
+                    conn.commit()
+                    return len(rows), []
+                except Error:
+                    conn.rollback()
+
+                inserted = 0
+                errors = []
+                new_slots = []
+                for index, values, slot in rows:
+                    try:
+                        cursor.execute(self.INSERT_CUSTOMER, values)
+                        inserted += 1
+                        if slot is not None:
+                            new_slots.append(slot)
+                    except Error as e:
+                        errors.append({"index": index, "error": f"{self.label} Error: {e}"})
+                self._count_slots(cursor, new_slots)
+                conn.commit()
+                return inserted, errors
+            finally:
+                cursor.close()
+
+    # STATISTIK
+    def _fetch_monthly(self, cursor, source, table, summary_table, extra=""):
+        """Jumlah per bulan dari tabel ringkasan (trigger) atau agregat langsung.
+
+        Mengembalikan (baris, sumber yang dipakai); tabel ringkasan yang belum
+        dimigrasikan membuat sumber jatuh ke `live`.
+        """
+        if source == "summary":
+            try:
+                cursor.execute(
+                    f"SELECT delivery_month, total FROM {summary_table}"
+                    " WHERE total > 0 ORDER BY delivery_month"
+                )
+                return cursor.fetchall(), source
+            except Error as e:
+                if e.errno != errorcode.ER_NO_SUCH_TABLE:
+                    raise
+        cursor.execute(
+            f"SELECT delivery_month, COUNT(*) FROM {table} {extra}"
+            " GROUP BY delivery_month ORDER BY delivery_month"
+        )
+        return cursor.fetchall(), "live"
+
+    def customer_stats(self, source, include_archived=False):
+        """Hitung statistik dashboard dengan agregat SQL.
+
+        `summary` membaca total dan jumlah per bulan dari tabel
+        `customer_monthly_stats` (dijaga trigger); `live` menghitung ulang dari
+        tabel customers. Arsip hanya ikut dihitung dengan `include_archived`.
+        Mengembalikan (statistik, sumber yang dipakai).
+        """
+        with self.pool.connection() as conn, DB_QUERY_SECONDS.time(query=f"stats_{source}"):
+            cursor = conn.cursor()
+            try:
+                monthly, used = self._fetch_monthly(
+                    cursor, source, "customers", "customer_monthly_stats",
+                    "WHERE deleted_at IS NULL",
+                )
+                totals = {month: int(count) for month, count in monthly}
+                if include_archived:
+                    archived, _ = self._fetch_monthly(
+                        cursor, used, "customers_archive", "customer_archive_monthly_stats"
+                    )
+                    for month, count in archived:
+                        totals[month] = totals.get(month, 0) + int(count)
+
+                # Arsip hanya berisi pengiriman yang sudah lewat
+                cursor.execute(
+                    "SELECT COUNT(*) FROM customers"
+                    f" WHERE delivery_date >= {self.TODAY} AND deleted_at IS NULL"
+                )
+                upcoming = cursor.fetchone()[0]
+                if include_archived:
+                    cursor.execute(
+                        "SELECT COUNT(*) FROM ("
+                        " SELECT phone FROM customers WHERE deleted_at IS NULL"
+                        " UNION SELECT phone FROM customers_archive) AS phones"
+                    )
+                else:
+                    cursor.execute(
+                        "SELECT COUNT(DISTINCT phone) FROM customers WHERE deleted_at IS NULL"
+                    )
+                unique_phones = cursor.fetchone()[0]
+            finally:
+                cursor.close()
+
+        stats = {
+            "total_customers": sum(totals.values()),
+            "upcoming_deliveries": upcoming,
+            "unique_phones": unique_phones,
+            "monthly": [{"month": month, "count": count} for month, count in sorted(totals.items())],
+        }
+        return stats, used
+
+    # SLOT PENGIRIMAN
+    def reserve_slot(self, slot, default_capacity):
+        """Ambil satu kursi di slot dengan satu UPDATE bersyarat; False kalau penuh"""
+
+        def reserve(cursor):
+            cursor.execute(self.INSERT_EMPTY_SLOT, (slot,))
+            cursor.execute(
+                "UPDATE delivery_slots SET booked = booked + 1"
+                " WHERE slot_start = %s AND booked < COALESCE(capacity, %s)",
+                (slot, default_capacity),
+            )
+            return cursor.rowcount == 1
+
+        return self._transaction(reserve)
+
+    def release_slots(self, slots):
+        """Kembalikan kursi milik booking yang akhirnya tidak tersimpan"""
+        if not slots:
+            return
+
+        def release(cursor):
+            cursor.executemany(
+                "UPDATE delivery_slots SET booked = booked - 1"
+                " WHERE slot_start = %s AND booked > 0",
+                [(slot,) for slot in slots],
+            )
+
+        self._transaction(release)
+
+    def _count_slots(self, cursor, slots):
+        """Tambah hitungan slot tanpa cek kapasitas (impor bulk, booking saat DB mati)"""
+        totals = {}
+        for slot in slots:
+            totals[slot] = totals.get(slot, 0) + 1
+        if totals:
+            cursor.executemany(self.ADD_SLOT_BOOKINGS, list(totals.items()))
+
+    def slot_counts(self, start, end, default_capacity):
+        """{slot_start: (booked, capacity)} untuk slot di rentang [start, end)"""
+
+        def fetch(cursor):
+            cursor.execute(
+                "SELECT slot_start, booked, COALESCE(capacity, %s) FROM delivery_slots"
+                " WHERE slot_start >= %s AND slot_start < %s",
+                (default_capacity, start, end),
+            )
+            return {row[0]: (int(row[1]), int(row[2])) for row in cursor.fetchall()}
+
+        return self._transaction(fetch)
+
+    # SOFT DELETE DAN PURGE
+    def soft_delete_chunk(self, ids):
+        """Tandai satu chunk id dalam satu transaksi; kembalikan nomor telepon baris
+        yang baru ditandai (untuk invalidasi cache)"""
+        placeholders = _placeholders(ids)
+
+        def mark(cursor):
+            cursor.execute(
+                f"SELECT phone FROM customers WHERE id IN ({placeholders})"
+                " AND deleted_at IS NULL FOR UPDATE",
+                tuple(ids),
+            )
+            phones = [row[0] for row in cursor.fetchall()]
+            cursor.execute(
+                f"UPDATE customers SET deleted_at = {self.NOW} WHERE id IN ({placeholders})"
+                " AND deleted_at IS NULL",
+                tuple(ids),
+            )
+            return phones
+
+        return self._transaction(mark)
+
+    def max_customer_id(self):
+        with self.pool.connection() as conn:
+            cursor = conn.cursor()
+            try:
+                cursor.execute("SELECT COALESCE(MAX(id), 0) FROM customers")
+                return cursor.fetchone()[0]
+            finally:
+                cursor.close()
+
+    def live_ids(self, after_id, max_id, limit):
+        """Id baris aktif di rentang (after_id, max_id], paling banyak `limit`"""
+        with self.pool.connection() as conn:
+            cursor = conn.cursor()
+            try:
+                cursor.execute(
+                    "SELECT id FROM customers WHERE id > %s AND id <= %s"
+                    " AND deleted_at IS NULL ORDER BY id LIMIT %s",
+                    (after_id, max_id, limit),
+                )
+                return [row[0] for row in cursor.fetchall()]
+            finally:
+                cursor.close()
+
+    def count_deleted(self, cutoff):
+        """Baris bertanda yang sudah melewati masa retensi"""
+        with self.pool.connection() as conn:
+            cursor = conn.cursor()
+            try:
+                cursor.execute(
+                    "SELECT COUNT(*) FROM customers WHERE deleted_at IS NOT NULL"
+                    " AND deleted_at <= %s",
+                    (cutoff,),
+                )
+                return cursor.fetchone()[0]
+            finally:
+                cursor.close()
+
+    def purge_deleted(self, cutoff, limit):
+        """Hapus fisik paling banyak `limit` baris bertanda; kembalikan jumlahnya"""
+
+        def purge(cursor):
+            # Urut deleted_at lewat idx_customers_deleted_at: setiap chunk
+            # hanya mengunci baris yang memang akan dihapus
+            cursor.execute(self.PURGE_DELETED, (cutoff, limit))
+            return cursor.rowcount
+
+        return self._transaction(purge)
+
+    # ARSIP
+    def count_archivable(self, cutoff):
+        with self.pool.connection() as conn:
+            cursor = conn.cursor()
+            try:
+                cursor.execute(
+                    "SELECT COUNT(*) FROM customers"
+                    " WHERE delivery_date < %s AND deleted_at IS NULL",
+                    (cutoff,),
+                )
+                return cursor.fetchone()[0]
+            finally:
+                cursor.close()
+
+    def archive_chunk(self, cutoff, limit):
+        """Pindahkan paling banyak `limit` booking dengan pengiriman sebelum `cutoff`
+        ke `customers_archive` dalam satu transaksi; kembalikan jumlahnya"""
+        columns = ", ".join(CUSTOMER_COLUMNS)
+
+        def move(cursor):
+            # Range scan idx_customers_delivery_date_live; FOR UPDATE supaya
+            # worker lain tidak memindahkan baris yang sama
+            cursor.execute(
+                "SELECT id FROM customers WHERE delivery_date < %s AND deleted_at IS NULL"
+                " ORDER BY delivery_date LIMIT %s FOR UPDATE",
+                (cutoff, limit),
+            )
+            ids = tuple(row[0] for row in cursor.fetchall())
+            if not ids:
+                return 0
+            placeholders = _placeholders(ids)
+            cursor.execute(
+                f"INSERT INTO customers_archive ({columns})"
+                f" SELECT {columns} FROM customers WHERE id IN ({placeholders})",
+                ids,
+            )
+            cursor.execute(f"DELETE FROM customers WHERE id IN ({placeholders})", ids)
+            return len(ids)
+
+        return self._transaction(move)
+
+
+class MySQLRepository(CustomerRepository):
+    label = "MySQL"
+    NOW = "NOW()"
+    TODAY = "CURDATE()"
+    # executemany ditulis ulang mysql-connector menjadi satu INSERT multi-baris
+    INSERT_CUSTOMER = (
+        "INSERT INTO customers (name, phone, address, delivery_date) VALUES (%s, %s, %s, %s)"
+    )
+    INSERT_EMPTY_SLOT = "INSERT IGNORE INTO delivery_slots (slot_start) VALUES (%s)"
+    ADD_SLOT_BOOKINGS = (
+        "INSERT INTO delivery_slots (slot_start, booked) VALUES (%s, %s)"
+        " ON DUPLICATE KEY UPDATE booked = booked + VALUES(booked)"
+    )
+    PURGE_DELETED = (
+        "DELETE FROM customers WHERE deleted_at IS NOT NULL AND deleted_at <= %s"
+        " ORDER BY deleted_at LIMIT %s"
+    )
+
+    def _discard_unread(self, conn):
+        # Cursor default mysql-connector unbuffered (server-side); sisa hasil
+        # harus dibaca habis sebelum koneksi dipakai lagi
+        if conn.unread_result:
+            conn.consume_results()
+
+
+class SQLiteRepository(CustomerRepository):
+    label = "SQLite"
+    NOW = "datetime('now', 'localtime')"
+    TODAY = "date('now', 'localtime')"
+    # datetime() menyeragamkan `YYYY-MM-DD HH:MM` menjadi teks dengan detik,
+    # supaya perbandingan dengan filter tanggal tetap benar
+    INSERT_CUSTOMER = (
+        "INSERT INTO customers (name, phone, address, delivery_date)"
+        " VALUES (%s, %s, %s, datetime(%s))"
+    )
+    INSERT_EMPTY_SLOT = "INSERT OR IGNORE INTO delivery_slots (slot_start) VALUES (%s)"
+    ADD_SLOT_BOOKINGS = (
+        "INSERT INTO delivery_slots (slot_start, booked) VALUES (%s, %s)"
+        " ON CONFLICT (slot_start) DO UPDATE SET booked = booked + excluded.booked"
+    )
+    # DELETE ... ORDER BY ... LIMIT butuh build SQLite khusus
+    PURGE_DELETED = (
+        "DELETE FROM customers WHERE id IN ("
+        " SELECT id FROM customers WHERE deleted_at IS NOT NULL AND deleted_at <= %s"
+        " ORDER BY deleted_at LIMIT %s)"
+    )
+
+
+def create_repository(backend=None, **pool_options):
+    """Buat repository dari argumen atau env `STORAGE_BACKEND` (mysql/sqlite).
+
+    `pool_options` diteruskan ke pool, mis. `size` atau `path` (SQLite).
+    Pool baru membuka koneksi saat `open()` atau query pertama.
+    """
+    backend = backend or STORAGE_BACKEND
+    if backend == "sqlite":
+        from sqlite_db import SQLiteConnectionPool
+
+        return SQLiteRepository(SQLiteConnectionPool(**pool_options))
+    if backend == "mysql":
+        from db import ConnectionPool
+
+        return MySQLRepository(ConnectionPool(**pool_options))
+    raise ValueError(f"STORAGE_BACKEND tidak dikenal: {backend}")
@@ -0,0 +1,258 @@
+"""Tes cache jawaban AI dengan stub pengganti client OpenAI (tanpa jaringan)"""
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+
+import pytest
+
+import ai_cache
+from ai_cache import AICache, MemoryCache, SQLiteCache, cache_key, normalize_prompt
+from llm import stream_complete
+
+
+class StubOpenAI:
+    """Meniru `client.chat.completions.create` dan menghitung panggilannya"""
+
+    def __init__(self, gate=None):
+        self.calls = 0
+        self.gate = gate
+        self._lock = threading.Lock()
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self.create))
+
+    def create(self, model, messages, **kwargs):
+        with self._lock:
+            self.calls += 1
+        if self.gate is not None:
+            self.gate.wait(5)
+        message = SimpleNamespace(content=f"jawaban: {messages[-1]['content']}")
+        return SimpleNamespace(
+            choices=[SimpleNamespace(message=message)],
+            usage=SimpleNamespace(prompt_tokens=3, completion_tokens=2),
+        )
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1_000_000.0
+
+    def time(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(ai_cache, "time", clock)
+    return clock
+
+
+def complete(client, prompt, context, model):
+    messages = [
+        {"role": "system", "content": context},
+        {"role": "user", "content": prompt},
+    ]
+    response = client.chat.completions.create(model=model, messages=messages)
+    return response.choices[0].message.content
+
+
+def ask(cache, client, prompt, context="customer support", model="gpt-4o-mini"):
+    key = cache_key(prompt, context, model)
+    return cache.get_or_compute(key, lambda: complete(client, prompt, context, model))
+
+
+def test_normalize_prompt_ignores_case_spacing_and_trailing_punctuation():
+    assert normalize_prompt("  Jam   BUKA toko?? ") == "jam buka toko"
+    assert cache_key("Jam buka toko?", "cs", "m") == cache_key("jam  buka toko", "cs", "m")
+
+
+def test_cache_key_separates_context_and_model():
+    key = cache_key("jam buka", "cs", "m1")
+    assert key != cache_key("jam buka", "admin", "m1")
+    assert key != cache_key("jam buka", "cs", "m2")
+
+
+def test_normalized_prompts_share_one_upstream_call():
+    client = StubOpenAI()
+    cache = AICache(MemoryCache())
+    first = ask(cache, client, "Jam buka toko?")
+    assert ask(cache, client, "jam  BUKA toko") == first
+    assert client.calls == 1
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+
+def test_memory_cache_evicts_least_recently_used():
+    cache = MemoryCache(max_entries=2)
+    cache.set("a", "1")
+    cache.set("b", "2")
+    assert cache.get("a") == "1"  # "b" sekarang paling lama tidak dipakai
+    cache.set("c", "3")
+    assert cache.get("b") is None
+    assert cache.get("a") == "1"
+    assert cache.get("c") == "3"
+    assert len(cache) == 2
+
+
+def test_memory_cache_expires_after_ttl(clock):
+    cache = MemoryCache(ttl=10)
+    cache.set("a", "1")
+    clock.now += 9
+    assert cache.get("a") == "1"
+    clock.now += 2
+    assert cache.get("a") is None
+
+
+def test_sqlite_cache_expires_after_ttl(tmp_path, clock):
+    cache = SQLiteCache(str(tmp_path / "ai_cache.sqlite3"), ttl=10)
+    cache.set("a", "1")
+    clock.now += 9
+    assert cache.get("a") == "1"
+    clock.now += 2
+    assert cache.get("a") is None
+    assert len(cache) == 0
+
+
+def test_sqlite_cache_survives_reopen_and_refetches_after_expiry(tmp_path, clock):
+    path = str(tmp_path / "ai_cache.sqlite3")
+    client = StubOpenAI()
+    ask(AICache(SQLiteCache(path, ttl=60)), client, "ongkir ke bandung")
+
+    cache = AICache(SQLiteCache(path, ttl=60))
+    ask(cache, client, "Ongkir ke Bandung?")
+    assert client.calls == 1
+
+    clock.now += 61
+    ask(cache, client, "ongkir ke bandung")
+    assert client.calls == 2
+
+
+def test_sqlite_cache_evicts_least_recently_used(tmp_path, clock):
+    cache = SQLiteCache(str(tmp_path / "ai_cache.sqlite3"), max_entries=2)
+    cache.set("a", "1")
+    clock.now += 1
+    cache.set("b", "2")
+    clock.now += 1
+    assert cache.get("a") == "1"
+    clock.now += 1
+    cache.set("c", "3")
+    assert cache.get("b") is None
+    assert cache.get("a") == "1"
+    assert cache.get("c") == "3"
+
+
+def test_concurrent_identical_prompts_are_coalesced():
+    gate = threading.Event()
+    client = StubOpenAI(gate)
+    cache = AICache(MemoryCache())
+    callers = 8
+
+    with ThreadPoolExecutor(max_workers=callers) as executor:
+        futures = [
+            executor.submit(ask, cache, client, "Apakah bisa COD?") for _ in range(callers)
+        ]
+        deadline = time.monotonic() + 5
+        while cache.coalesced < callers - 1 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        gate.set()
+        answers = {future.result(timeout=5) for future in futures}
+
+    assert client.calls == 1
+    assert answers == {"jawaban: Apakah bisa COD?"}
+    assert cache.stats()["coalesced"] == callers - 1
+
+
+def test_errors_reach_every_waiter_and_are_not_cached():
+    gate = threading.Event()
+    cache = AICache(MemoryCache())
+    calls = []
+
+    def failing():
+        calls.append(1)
+        gate.wait(5)
+        raise RuntimeError("429 rate limit")
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        futures = [executor.submit(cache.get_or_compute, "k", failing) for _ in range(4)]
+        deadline = time.monotonic() + 5
+        while cache.coalesced < 3 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        gate.set()
+        for future in futures:
+            with pytest.raises(RuntimeError, match="429"):
+                future.result(timeout=5)
+
+    assert len(calls) == 1
+    assert cache.get_or_compute("k", lambda: "ok") == "ok"
+
+
+class StubStreamingOpenAI(StubOpenAI):
+    """Stub untuk `stream=True`: potongan jawaban seperti chunk streaming OpenAI"""
+
+    def create(self, model, messages, stream=False, **kwargs):
+        if not stream:
+            return super().create(model, messages, **kwargs)
+        with self._lock:
+            self.calls += 1
+        return self._chunks(f"jawaban: {messages[-1]['content']}".split(" "))
+
+    def _chunks(self, words):
+        if self.gate is not None:
+            self.gate.wait(5)
+        for i, word in enumerate(words):
+            delta = SimpleNamespace(content=word if i == 0 else " " + word)
+            yield SimpleNamespace(choices=[SimpleNamespace(delta=delta)])
+
+
+def ask_stream(cache, client, prompt, context="customer support", model="gpt-4o-mini"):
+    """Jalur yang dipakai `ai_assist_stream` di chatbot_app.py"""
+    key = cache_key(prompt, context, model)
+    return list(
+        cache.stream_or_compute(
+            key, lambda: stream_complete(client, prompt, context, model=model)
+        )
+    )
+
+
+def test_streamed_answer_is_cached_whole():
+    client = StubStreamingOpenAI()
+    cache = AICache(MemoryCache())
+    chunks = ask_stream(cache, client, "Apakah bisa COD?")
+    assert chunks == ["jawaban:", " Apakah", " bisa", " COD?"]
+    assert ask_stream(cache, client, "apakah bisa cod") == ["jawaban: Apakah bisa COD?"]
+    assert client.calls == 1
+
+
+def test_concurrent_identical_streamed_prompts_are_coalesced():
+    gate = threading.Event()
+    client = StubStreamingOpenAI(gate)
+    cache = AICache(MemoryCache())
+    callers = 8
+
+    with ThreadPoolExecutor(max_workers=callers) as executor:
+        futures = [
+            executor.submit(ask_stream, cache, client, "Jam buka toko?") for _ in range(callers)
+        ]
+        deadline = time.monotonic() + 5
+        while cache.coalesced < callers - 1 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        gate.set()
+        answers = ["".join(future.result(timeout=5)) for future in futures]
+
+    assert client.calls == 1
+    assert set(answers) == {"jawaban: Jam buka toko?"}
+    assert cache.stats()["coalesced"] == callers - 1
+
+
+def test_abandoned_stream_releases_waiters_without_caching():
+    client = StubStreamingOpenAI()
+    cache = AICache(MemoryCache())
+    key = cache_key("ongkir", "cs", "m")
+    stream = cache.stream_or_compute(
+        key, lambda: stream_complete(client, "ongkir", "cs", model="m")
+    )
+    assert next(stream) == "jawaban:"
+    stream.close()
+
+    assert cache.backend.get(key) is None
+    assert cache.get_or_compute(key, lambda: "ok") == "ok"